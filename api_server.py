@@ -0,0 +1,392 @@
+"""
+Local HTTP/JSON API over the academic data layer.
+
+Lets campus integrations (LMS sync, reporting) read transcripts, rosters
+and reports and register or drop students without opening the database
+file themselves. Requests are served by asyncio; database work runs on a
+thread pool over a fixed pool of read-only connections, while
+registrations and drops go through AcademicService exactly as they do
+from the advisor dashboard.
+
+GET responses carry an ETag, and a request whose If-None-Match matches
+gets 304 Not Modified without a body. GET /metrics reports request
+counts and latency percentiles per endpoint.
+
+Endpoints:
+    GET    /students/<student_id>/transcript
+    GET    /sections/<prefix>/<number>/<semester>/<year>/roster
+    POST   /registrations  {"student_id", "course_prefix", "course_number", "semester", "year"}
+    DELETE /registrations/<student_id>/<prefix>/<number>/<semester>/<year>
+    GET    /reports/<name>
+    GET    /metrics
+
+There is no authentication, so the server listens on localhost only
+unless --host says otherwise.
+
+Usage: python api_server.py [--host HOST] [--port PORT] [--pool-size N] [--max-concurrency N] [--db PATH]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import queue
+import re
+import sqlite3
+import statistics
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http import HTTPStatus
+from typing import Optional, Dict, Any, List, Tuple
+
+from ui.common.academic_service import (AcademicService, BUSY_TIMEOUT, calculate_gpa, fetch_student_record,
+                                        fetch_section_roster)
+from ui.common.admin_reports import REPORTS
+from ui.common.db import get_db_path
+from ui.common.section_enrollment import ensure_section_enrollment_table
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Read connections kept open (and database worker threads)
+DEFAULT_POOL_SIZE = 4
+# Requests handled at once; further requests wait for a slot
+DEFAULT_MAX_CONCURRENCY = 32
+# Requests allowed to wait for a slot before new ones get 503 Service Unavailable
+MAX_QUEUED_REQUESTS = 256
+
+# Seconds an idle keep-alive connection stays open
+KEEPALIVE_TIMEOUT = 15
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 1024 * 1024
+
+# Latency samples kept per endpoint for the percentiles in /metrics
+METRIC_SAMPLES = 1000
+
+# Registration violations meaning the request names something that does not exist
+NOT_FOUND_RULES = {"unknown_student", "unknown_course"}
+
+
+class HttpError(Exception):
+    """An error answered with its status code and message."""
+
+    def __init__(self, status: HTTPStatus, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.status = status
+        self.details = details or {}
+
+
+class ConnectionPool:
+    """
+    Fixed set of read-only connections shared by the database worker threads.
+
+    A connection is only used by one thread at a time: connection() takes
+    it out of the pool and puts it back afterwards.
+    """
+
+    def __init__(self, db_path: str, size: int):
+        self.size = size
+        self._idle: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(size):
+            self._idle.put(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True,
+                                           timeout=BUSY_TIMEOUT, check_same_thread=False))
+
+    @contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        for _ in range(self.size):
+            self._idle.get().close()
+
+
+class EndpointMetrics:
+    """Request counts, server errors and latency samples per endpoint."""
+
+    def __init__(self):
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, endpoint: str, status: int, seconds: float) -> None:
+        self._samples.setdefault(endpoint, deque(maxlen=METRIC_SAMPLES)).append(seconds * 1000)
+        counts = self._counts.setdefault(endpoint, {"requests": 0, "not_modified": 0, "errors": 0})
+        counts["requests"] += 1
+        if status == HTTPStatus.NOT_MODIFIED:
+            counts["not_modified"] += 1
+        elif status >= 500:
+            counts["errors"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return each endpoint's counts and mean, median, 95th percentile and max latency in ms."""
+        result = {}
+        for endpoint, samples in sorted(self._samples.items()):
+            latencies = sorted(samples)
+            result[endpoint] = dict(self._counts[endpoint],
+                                    mean_ms=round(statistics.fmean(latencies), 3),
+                                    p50_ms=round(statistics.median(latencies), 3),
+                                    p95_ms=round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+                                    max_ms=round(latencies[-1], 3))
+        return result
+
+
+def _path_year(value: str) -> int:
+    if not value.isdigit():
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"Invalid year '{value}'")
+    return int(value)
+
+
+class ApiServer:
+    """The HTTP server: routing, concurrency limit, ETags and metrics."""
+
+    # (method, path pattern, handler name, endpoint name used in the metrics)
+    ROUTES = [
+        ("GET", r"/students/([^/]+)/transcript", "get_transcript", "GET /students/{id}/transcript"),
+        ("GET", r"/sections/([^/]+)/([^/]+)/([^/]+)/([^/]+)/roster", "get_roster",
+         "GET /sections/{prefix}/{number}/{semester}/{year}/roster"),
+        ("POST", r"/registrations", "post_registration", "POST /registrations"),
+        ("DELETE", r"/registrations/([^/]+)/([^/]+)/([^/]+)/([^/]+)/([^/]+)", "delete_registration",
+         "DELETE /registrations/{student_id}/{prefix}/{number}/{semester}/{year}"),
+        ("GET", r"/reports/([^/]+)", "get_report", "GET /reports/{name}"),
+        ("GET", r"/metrics", "get_metrics", "GET /metrics"),
+    ]
+
+    def __init__(self, db_path: Optional[str] = None, pool_size: int = DEFAULT_POOL_SIZE,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.db_path = db_path or get_db_path()
+        self.service = AcademicService(self.db_path)
+        # Tables the reports create on first use cannot be created over read-only connections
+        conn = self.service.connect()
+        try:
+            ensure_section_enrollment_table(conn)
+        finally:
+            conn.close()
+        self.pool = ConnectionPool(self.db_path, pool_size)
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="api-db")
+        self.max_concurrency = max_concurrency
+        self.metrics = EndpointMetrics()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        self._routes = [(method, re.compile(pattern + r"/?$"), getattr(self, name), endpoint)
+                        for method, pattern, name, endpoint in self.ROUTES]
+
+    async def run_db(self, function, *args):
+        """Run a blocking database call on a worker thread."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    def read(self, function, *args):
+        """Run function(conn, *args) with a pooled read connection."""
+        with self.pool.connection() as conn:
+            return function(conn, *args)
+
+    # Handlers return (status, JSON-serializable body)
+
+    async def get_transcript(self, body, student_id):
+        record = await self.run_db(self.read, fetch_student_record, student_id)
+        if record["info"] is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Student {student_id} not found")
+        _, gender, major = record["info"]
+        courses = [{"semester": semester, "year": year, "course_prefix": prefix, "course_number": number,
+                    "credits": credits, "grade": grade}
+                   for semester, year, prefix, number, credits, grade in record["courses"]]
+        gpa = calculate_gpa((course["credits"], course["grade"]) for course in courses)
+        return HTTPStatus.OK, {"student_id": student_id, "gender": gender, "major": major,
+                               "gpa": round(gpa, 2), "courses": courses}
+
+    async def get_roster(self, body, prefix, number, semester, year):
+        roster = await self.run_db(self.read, fetch_section_roster, prefix, number, semester, _path_year(year))
+        return HTTPStatus.OK, {"course_prefix": prefix, "course_number": number, "semester": semester,
+                               "year": int(year), "students": roster}
+
+    async def post_registration(self, body):
+        try:
+            request = json.loads(body or b"{}")
+            section = (str(request["student_id"]), str(request["course_prefix"]), str(request["course_number"]),
+                       str(request["semester"]), int(request["year"]))
+        except (ValueError, KeyError, TypeError):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Expected JSON with student_id, course_prefix, "
+                                                    "course_number, semester and year")
+        violations = await self.run_db(self.service.register_course, *section)
+        if violations:
+            # A missing student or course is 404; an unoffered section or a rule violation is 409
+            status = (HTTPStatus.NOT_FOUND if any(v["rule"] in NOT_FOUND_RULES for v in violations)
+                      else HTTPStatus.CONFLICT)
+            raise HttpError(status, "Registration rejected", {"violations": violations})
+        return HTTPStatus.CREATED, {"registered": True}
+
+    async def delete_registration(self, body, student_id, prefix, number, semester, year):
+        violations = await self.run_db(self.service.drop_course, student_id, prefix, number, semester,
+                                       _path_year(year))
+        if violations:
+            raise HttpError(HTTPStatus.CONFLICT, "Drop rejected", {"violations": violations})
+        return HTTPStatus.OK, {"dropped": True}
+
+    async def get_report(self, body, name):
+        if name not in REPORTS:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Unknown report '{name}'", {"reports": list(REPORTS)})
+        # Reads the reporting snapshot when there is a fresh one, so report scans do not hold up registrations
+        rows = await self.run_db(self.service.report, name)
+        return HTTPStatus.OK, {"report": name, "rows": rows}
+
+    async def get_metrics(self, body):
+        return HTTPStatus.OK, {"endpoints": self.metrics.snapshot(), "pool_size": self.pool.size,
+                               "max_concurrency": self.max_concurrency, "pending": self._pending}
+
+    def route(self, method: str, path: str):
+        allowed = False
+        for route_method, pattern, handler, endpoint in self._routes:
+            match = pattern.match(path)
+            if match:
+                if route_method == method:
+                    return handler, match.groups(), endpoint
+                allowed = True
+        if allowed:
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not supported for {path}")
+        raise HttpError(HTTPStatus.NOT_FOUND, f"No endpoint {path}")
+
+    async def dispatch(self, method: str, path: str, headers: Dict[str, str],
+                       body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        """Handle one request, returning its status, extra headers and body."""
+        started = time.perf_counter()
+        endpoint = "unmatched"
+        extra_headers: Dict[str, str] = {}
+        try:
+            handler, args, endpoint = self.route(method, path.split("?", 1)[0])
+            if self._pending >= self.max_concurrency + MAX_QUEUED_REQUESTS:
+                raise HttpError(HTTPStatus.SERVICE_UNAVAILABLE, "Too many requests in progress")
+            self._pending += 1
+            try:
+                async with self._slots:
+                    status, payload = await handler(body, *args)
+            finally:
+                self._pending -= 1
+        except HttpError as e:
+            status, payload = e.status, dict(e.details, error=str(e))
+        except sqlite3.Error as e:
+            print(f"Database error while handling {method} {path}: {e}")
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Database error"}
+        except Exception as e:
+            print(f"Error while handling {method} {path}: {e!r}")
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+
+        data = json.dumps(payload, default=str).encode()
+        if method == "GET" and status == HTTPStatus.OK:
+            etag = f'"{hashlib.sha1(data).hexdigest()}"'
+            extra_headers["ETag"] = etag
+            if_none_match = headers.get("if-none-match", "")
+            if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+                status, data = HTTPStatus.NOT_MODIFIED, b""
+        self.metrics.record(endpoint, status, time.perf_counter() - started)
+        return status, extra_headers, data
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve the requests of one (keep-alive) connection."""
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    await self.write_response(writer, HTTPStatus.BAD_REQUEST, {},
+                                              b'{"error": "Malformed request line"}', keep_alive=False)
+                    break
+                method, path, version = parts
+
+                headers = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", "0") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self.write_response(writer, HTTPStatus.BAD_REQUEST, {},
+                                              b'{"error": "Invalid Content-Length"}', keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.write_response(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {},
+                                              b'{"error": "Request body too large"}', keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and (version == "HTTP/1.1" or headers.get("connection", "").lower() == "keep-alive"))
+                status, extra_headers, data = await self.dispatch(method.upper(), path, headers, body)
+                await self.write_response(writer, status, extra_headers, data, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def write_response(self, writer: asyncio.StreamWriter, status: int, extra_headers: Dict[str, str],
+                             data: bytes, keep_alive: bool) -> None:
+        status = HTTPStatus(status)
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}",
+                 "Content-Type: application/json",
+                 f"Content-Length: {len(data)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines += [f"{name}: {value}" for name, value in extra_headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + data)
+        await writer.drain()
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, ready=None) -> None:
+        """
+        Serve until cancelled.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on, 0 for any free port
+            ready: Optional callback receiving the bound (host, port) once listening
+        """
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        address = server.sockets[0].getsockname()[:2]
+        print(f"Academic API listening on http://{address[0]}:{address[1]}")
+        if ready:
+            ready(address)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        self.pool.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the academic data over a local HTTP/JSON API.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE)
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument("--db", default=None, help="database path, defaults to data/academic_management.db")
+    args = parser.parse_args(argv)
+
+    server = ApiServer(args.db, args.pool_size, args.max_concurrency)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("Academic API stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,8 @@ from datetime import datetime
 from db_operations import (
     create_connection, create_tables, create_user, create_student,
     create_instructor, create_staff, create_course, get_course_id,
-    create_instructor_course, create_student_course,
+    create_instructor_course, create_student_course, create_course_prerequisite,
+    rebuild_section_enrollment, rebuild_instructor_loads,
     create_advisor, create_department, add_advisor_department,
     create_major, add_major_to_department, verify_departments, verify_majors
 )
@@ -173,6 +174,21 @@ def main():
 
                 create_student_course(conn, row['StudentID'], prefix, number, semester, year, grade)
 
+    # Section counters and instructor loads are maintained incrementally by the application;
+    # rebuild them after an import
+    rebuild_section_enrollment(conn)
+    rebuild_instructor_loads(conn)
+
+    # Create course prerequisites from CSV (optional file)
+    prerequisites_path = os.path.join('csvfiles', 'CoursePrerequisites.csv')
+    if os.path.exists(prerequisites_path):
+        with open(prerequisites_path, 'r') as file:
+            csv_reader = csv.DictReader(file)
+            for row in csv_reader:
+                if row.get('CoursePrefix') and row.get('PrereqPrefix'):
+                    create_course_prerequisite(conn, row['CoursePrefix'], row.get('CourseNumber', ''),
+                                               row['PrereqPrefix'], row.get('PrereqNumber', ''))
+
     print("Database setup and population completed successfully.")
 
     # # Verify departments and their majors
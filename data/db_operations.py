@@ -1,5 +1,5 @@
 import sqlite3
-from werkzeug.security import generate_password_hash
+from hash_policy import ensure_hash_policy_table, get_hash_method, hash_password
 
 # Database setup
 DB_NAME = 'academic_management.db'
@@ -176,6 +176,106 @@ def create_tables(conn):
     )
     ''')
 
+    # Create course_prerequisites table (edges of the prerequisite graph)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS course_prerequisites (
+        course_prefix TEXT NOT NULL,
+        course_number TEXT NOT NULL,
+        prereq_prefix TEXT NOT NULL,
+        prereq_number TEXT NOT NULL,
+        PRIMARY KEY (course_prefix, course_number, prereq_prefix, prereq_number)
+    )
+    ''')
+
+    # Create degree requirement tables (requirement groups per major and their courses)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS requirement_groups (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        major_name TEXT NOT NULL,
+        group_name TEXT NOT NULL,
+        group_type TEXT CHECK (group_type IN ('core', 'elective', 'credits')) NOT NULL,
+        min_credits INTEGER DEFAULT 0,
+        sort_order INTEGER DEFAULT 0,
+        FOREIGN KEY (major_name) REFERENCES majors (major_name)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS requirement_courses (
+        group_id INTEGER NOT NULL,
+        course_prefix TEXT NOT NULL,
+        course_number TEXT,
+        FOREIGN KEY (group_id) REFERENCES requirement_groups (id)
+    )
+    ''')
+
+    # Create section_enrollment table (per-section counters maintained on register/drop)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS section_enrollment (
+        course_prefix TEXT NOT NULL,
+        course_number TEXT NOT NULL,
+        semester TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        enrolled INTEGER NOT NULL DEFAULT 0,
+        graded INTEGER NOT NULL DEFAULT 0,
+        grade_points INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (course_prefix, course_number, semester, year)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_student_courses_section
+    ON student_courses (course_prefix, course_number, semester, year_taken)
+    ''')
+
+    # Index instructor_courses by course so course renames and section lookups avoid table scans
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_instructor_courses_course_prefix_course_number
+    ON instructor_courses (course_prefix, course_number)
+    ''')
+
+    # Index students by major so the staff student directory pages without scanning
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_students_major_student_id
+    ON students (major, student_id)
+    ''')
+
+    # Create section_meetings table (meeting patterns of scheduled sections, times in minutes after midnight)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS section_meetings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        course_prefix TEXT NOT NULL,
+        course_number TEXT NOT NULL,
+        semester TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        days TEXT NOT NULL,
+        start_time INTEGER NOT NULL,
+        end_time INTEGER NOT NULL,
+        room TEXT,
+        CHECK (start_time < end_time)
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_section_meetings_term
+    ON section_meetings (semester, year)
+    ''')
+
+    # Create instructor_load table (per-instructor term credit loads maintained on assignment changes)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS instructor_load (
+        instructor_id TEXT NOT NULL,
+        semester TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        credits INTEGER NOT NULL DEFAULT 0,
+        sections INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (instructor_id, semester, year)
+    )
+    ''')
+
+    # Create hash_policy table (the hash method new and upgraded password hashes use)
+    ensure_hash_policy_table(conn)
+
     conn.commit()
 
 
@@ -200,7 +300,7 @@ def create_user(conn, username, role):
         return get_user_id(conn, username)
 
     cursor = conn.cursor()
-    password_hash = generate_password_hash('password')
+    password_hash = hash_password('password', get_hash_method(conn))
     cursor.execute('INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)',
                    (username, password_hash, role))
     conn.commit()
@@ -282,6 +382,49 @@ def create_student_course(conn, student_id, course_prefix, course_number, semest
     conn.commit()
 
 
+def create_course_prerequisite(conn, course_prefix, course_number, prereq_prefix, prereq_number):
+    """Record that a course requires another course to be completed first."""
+    cursor = conn.cursor()
+    cursor.execute('''
+    INSERT OR IGNORE INTO course_prerequisites (course_prefix, course_number, prereq_prefix, prereq_number)
+    VALUES (?, ?, ?, ?)
+    ''', (course_prefix, course_number, prereq_prefix, prereq_number))
+    conn.commit()
+
+
+def rebuild_section_enrollment(conn):
+    """Recompute the section_enrollment counters from student_courses."""
+    cursor = conn.cursor()
+    cursor.execute('DELETE FROM section_enrollment')
+    cursor.execute('''
+    INSERT INTO section_enrollment (course_prefix, course_number, semester, year, enrolled, graded, grade_points)
+    SELECT course_prefix, course_number, semester, year_taken,
+           COUNT(DISTINCT student_id),
+           COUNT(CASE WHEN grade IN ('A', 'S', 'B', 'C', 'D', 'F', 'U', 'I') THEN 1 END),
+           COALESCE(SUM(CASE WHEN grade IN ('A', 'S') THEN 4 WHEN grade = 'B' THEN 3
+                             WHEN grade = 'C' THEN 2 WHEN grade = 'D' THEN 1
+                             WHEN grade IN ('F', 'U', 'I') THEN 0 END), 0)
+    FROM student_courses
+    GROUP BY course_prefix, course_number, semester, year_taken
+    ''')
+    conn.commit()
+
+
+def rebuild_instructor_loads(conn):
+    """Recompute the instructor_load table from instructor_courses."""
+    cursor = conn.cursor()
+    cursor.execute('DELETE FROM instructor_load')
+    cursor.execute('''
+    INSERT INTO instructor_load (instructor_id, semester, year, credits, sections)
+    SELECT ic.instructor_id, ic.semester, ic.year_taught, COALESCE(SUM(c.credits), 0), COUNT(*)
+    FROM instructor_courses ic
+    JOIN courses c ON ic.course_prefix = c.course_prefix AND ic.course_number = c.course_number
+    WHERE ic.instructor_id IS NOT NULL AND ic.semester IS NOT NULL
+    GROUP BY ic.instructor_id, ic.semester, ic.year_taught
+    ''')
+    conn.commit()
+
+
 def create_staff(conn, user_id, staff_id, department_id, phone):
     """Create a new staff record or update an existing one."""
     cursor = conn.cursor()
@@ -0,0 +1,197 @@
+import argparse
+import os
+import sqlite3
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+
+# werkzeug is imported inside the functions that hash: importing it loads
+# its whole package (development server included), which would otherwise
+# delay the login screen
+
+# Werkzeug hash method (algorithm and cost) new hashes use unless the
+# database's hash_policy table says otherwise
+DEFAULT_HASH_METHOD = "scrypt:32768:8:1"
+
+
+def hash_method_of(password_hash: str) -> str:
+    """
+    Return the method (algorithm and cost) a stored hash was made with.
+
+    Werkzeug stores it as the prefix of the hash, e.g. 'scrypt:32768:8:1'
+    in 'scrypt:32768:8:1$salt$digest', so every user's algorithm and cost
+    is recorded with their hash.
+    """
+    return password_hash.split("$", 1)[0]
+
+
+def ensure_hash_policy_table(conn: sqlite3.Connection) -> None:
+    """
+    Create the single-row hash_policy table if it does not exist yet,
+    holding the method new and upgraded hashes use.
+
+    Args:
+        conn: Open connection to the academic management database
+    """
+    in_transaction = conn.in_transaction
+    cursor = conn.cursor()
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS hash_policy (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        method TEXT NOT NULL,
+        updated_at DATETIME NOT NULL
+    )
+    ''')
+    cursor.execute('''
+    INSERT OR IGNORE INTO hash_policy (id, method, updated_at) VALUES (1, ?, datetime('now'))
+    ''', (DEFAULT_HASH_METHOD,))
+    if not in_transaction:
+        conn.commit()
+
+
+def get_hash_method(conn: sqlite3.Connection) -> str:
+    """Return the method of the current hash policy."""
+    ensure_hash_policy_table(conn)
+    return conn.execute("SELECT method FROM hash_policy WHERE id = 1").fetchone()[0]
+
+
+def set_hash_method(conn: sqlite3.Connection, method: str) -> None:
+    """
+    Change the hash policy. Existing hashes are upgraded as their users
+    log in (see verify_and_upgrade()).
+
+    Raises:
+        ValueError: If werkzeug does not support the method
+    """
+    hash_password("", method)
+    ensure_hash_policy_table(conn)
+    conn.execute("UPDATE hash_policy SET method = ?, updated_at = datetime('now') WHERE id = 1", (method,))
+    conn.commit()
+
+
+def hash_password(password: str, method: str = DEFAULT_HASH_METHOD) -> str:
+    """Hash a password with a werkzeug method."""
+    from werkzeug.security import generate_password_hash
+    return generate_password_hash(password, method=method)
+
+
+def check_password(password_hash: str, password: str) -> bool:
+    """Check a password against a stored werkzeug hash."""
+    from werkzeug.security import check_password_hash
+    return check_password_hash(password_hash, password)
+
+
+def needs_rehash(password_hash: str, method: str) -> bool:
+    """Return True if a stored hash was not made with the policy's method."""
+    return hash_method_of(password_hash) != method
+
+
+def verify_and_upgrade(conn: sqlite3.Connection, user_id: int, password_hash: str,
+                       password: str, method: str) -> bool:
+    """
+    Check a password and, when it matches a hash made under an older
+    policy, store a new hash made with the current one.
+
+    The plaintext password is only available at login, so this is the
+    one place a hash can be upgraded. The UPDATE only replaces the hash
+    that was verified, so a concurrent password change is never undone.
+
+    Args:
+        conn: Open connection to the academic management database
+        user_id: users.id of the account
+        password_hash: Hash read for the account
+        password: Password as typed
+        method: Method of the current policy
+
+    Returns:
+        bool: True if the password matches
+    """
+    if not check_password(password_hash, password):
+        return False
+    if needs_rehash(password_hash, method):
+        conn.execute("UPDATE users SET password_hash = ? WHERE id = ? AND password_hash = ?",
+                      (hash_password(password, method), user_id, password_hash))
+        conn.commit()
+    return True
+
+
+def policy_summary(conn: sqlite3.Connection) -> List[Tuple[str, int]]:
+    """Return (method, user count) pairs, showing how many hashes are still to be upgraded."""
+    counts: Dict[str, int] = {}
+    for (password_hash,) in conn.execute("SELECT password_hash FROM users"):
+        method = hash_method_of(password_hash)
+        counts[method] = counts.get(method, 0) + 1
+    return sorted(counts.items(), key=lambda item: -item[1])
+
+
+def benchmark(methods: Iterable[str], logins: int = 20, concurrency: int = 1,
+              password: str = "password") -> List[Dict[str, Any]]:
+    """
+    Measure login verification latency for hash methods.
+
+    Each method's hash is verified `logins` times by `concurrency`
+    workers at once, approximating a burst of simultaneous logins.
+
+    Args:
+        methods: Werkzeug hash methods to compare
+        logins: Verifications per method
+        concurrency: Verifications running at the same time
+        password: Password to hash and verify
+
+    Returns:
+        List[Dict[str, Any]]: Per method, the median and 95th percentile
+        latency in milliseconds and the logins per second
+    """
+    results = []
+    for method in methods:
+        password_hash = hash_password(password, method)
+
+        def verify(_):
+            started = time.perf_counter()
+            check_password(password_hash, password)
+            return (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = sorted(executor.map(verify, range(logins)))
+        elapsed = time.perf_counter() - started
+        results.append({
+            "method": method,
+            "median_ms": statistics.median(latencies),
+            "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            "logins_per_second": logins / elapsed,
+        })
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Inspect, change or benchmark the password hash policy.")
+    parser.add_argument("--db", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                     "academic_management.db"))
+    parser.add_argument("--set", metavar="METHOD", help="change the policy, e.g. scrypt:65536:8:1")
+    parser.add_argument("--benchmark", nargs="+", metavar="METHOD", help="methods to benchmark")
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        print(f"{'method':<28}{'median ms':>12}{'p95 ms':>12}{'logins/s':>12}")
+        for result in benchmark(args.benchmark, args.logins, args.concurrency):
+            print(f"{result['method']:<28}{result['median_ms']:>12.1f}{result['p95_ms']:>12.1f}"
+                  f"{result['logins_per_second']:>12.1f}")
+        return
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.set:
+            set_hash_method(conn, args.set)
+        print(f"Current policy: {get_hash_method(conn)}")
+        for method, count in policy_summary(conn):
+            print(f"  {method}: {count} users")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,32 @@
+import time
+
+STARTED = time.perf_counter()
+
 import sys
 import os
-from PySide6.QtWidgets import QMessageBox
+import importlib
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QSize
+from PySide6.QtCore import QSize, QTimer
 from ui.login_screen import LoginScreen
-from ui.student_dashboard import StudentDashboard
-from ui.instructor_dashboard import InstructorDashboard
-from ui.advisor_dashboard import AdvisorDashboard
-from ui.staff_dashboard import StaffDashboard
-from ui.admin_dashboard import AdminDashboard
+
+# Dashboard module and class for each role. Only the dashboard of the role
+# that logs in is imported, after authentication, so the login screen does
+# not wait for the other four (and their dependencies, e.g. numpy).
+DASHBOARDS = {
+    'student': ('ui.student_dashboard', 'StudentDashboard'),
+    'instructor': ('ui.instructor_dashboard', 'InstructorDashboard'),
+    'advisor': ('ui.advisor_dashboard', 'AdvisorDashboard'),
+    'staff': ('ui.staff_dashboard', 'StaffDashboard'),
+    'admin': ('ui.admin_dashboard', 'AdminDashboard'),
+}
+
+
+def load_dashboard_class(role):
+    """Import and return the dashboard class of a role, or None for an unknown role"""
+    if role not in DASHBOARDS:
+        return None
+    module_name, class_name = DASHBOARDS[role]
+    return getattr(importlib.import_module(module_name), class_name)
 
 
 class AcademicManagementSystem:
@@ -22,21 +40,22 @@ class AcademicManagementSystem:
         default_size = QSize(800, 600)
         self.login_screen.resize(default_size)
 
-    def show_dashboard(self, user_id, role):
-        print(f"Showing dashboard for user_id: {user_id}, role: {role}")
-        if role == 'student':
-            self.dashboard = StudentDashboard(user_id)
-        elif role == 'instructor':
-            self.dashboard = InstructorDashboard(user_id)
-        elif role == 'advisor':
-            self.dashboard = AdvisorDashboard(user_id)
-        elif role == 'staff':
-            self.dashboard = StaffDashboard(user_id)
-        elif role == 'admin':
-            self.dashboard = AdminDashboard(user_id)
-        else:
+    def show_dashboard(self, session):
+        role = session.role
+        print(f"Showing dashboard for user_id: {session.user_id}, role: {role}")
+        # Imported here, like the dashboards, so the login screen does not wait for it
+        from ui.common.dashboard_prewarm import DashboardPrewarm
+
+        # Start the role's data fetches first, so they run while the dashboard
+        # module is imported and its widgets are built
+        prewarm = DashboardPrewarm(session)
+        prewarm.start()
+        dashboard_class = load_dashboard_class(role)
+        if dashboard_class is None:
             print(f"Unknown role: {role}")
             return
+        self.dashboard = dashboard_class(session, prewarm)
+        self.session = session
 
         self.dashboard.logout_signal.connect(self.handle_logout)
         self.dashboard.show()
@@ -44,6 +63,7 @@ class AcademicManagementSystem:
 
     def handle_logout(self):
         self.dashboard.close()
+        self.login_screen.sessions.revoke(self.session.token)
         self.login_screen.show()
         self.login_screen.username_input.clear()
         self.login_screen.password_input.clear()
@@ -53,6 +73,18 @@ class AcademicManagementSystem:
         self.login_screen.show()
         return self.app.exec()
 
+    def run_startup_benchmark(self):
+        """Show the login screen, report how long it took to appear, then quit"""
+        self.login_screen.show()
+
+        def report():
+            print(f"Login screen shown after {(time.perf_counter() - STARTED) * 1000:.1f} ms")
+            self.app.quit()
+
+        # Runs once the event loop has processed the first paint
+        QTimer.singleShot(0, report)
+        return self.app.exec()
+
 
 if __name__ == "__main__":
     # Add the project root directory to Python path
@@ -63,4 +95,6 @@ if __name__ == "__main__":
     print(f"Current working directory: {os.getcwd()}")  # Debug print
 
     ams = AcademicManagementSystem()
-    sys.exit(ams.run())
\ No newline at end of file
+    if "--startup-benchmark" in sys.argv:
+        sys.exit(ams.run_startup_benchmark())
+    sys.exit(ams.run())
@@ -0,0 +1,88 @@
+"""
+Startup profile and benchmark for the login screen.
+
+Runs `python -X importtime -c "import main"` to list the slowest imports
+and check the total against IMPORT_BUDGET_MS, then starts the application
+with --startup-benchmark several times and reports how long the login
+screen took to appear. Exits with status 1 if the import budget is
+exceeded, so it can guard against a dashboard import creeping back in.
+
+Usage: python startup_benchmark.py [--runs N] [--top N] [--budget MS]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+# Import time allowed before the login screen can be built
+IMPORT_BUDGET_MS = 400
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that should only be imported after login
+DEFERRED_MODULES = ("ui.student_dashboard", "ui.instructor_dashboard", "ui.advisor_dashboard",
+                    "ui.staff_dashboard", "ui.admin_dashboard", "numpy", "werkzeug")
+
+
+def import_profile(module="main"):
+    """
+    Profile the imports of a module in a fresh interpreter.
+
+    Returns:
+        list: (self_us, cumulative_us, module) per imported module, in import order
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True)
+    profile = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)", line)
+        if match:
+            profile.append((int(match.group(1)), int(match.group(2)), match.group(4)))
+    return profile
+
+
+def startup_times(runs):
+    """Start the application `runs` times and return the wall-clock ms until the login screen showed."""
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "main.py", "--startup-benchmark"],
+                       cwd=PROJECT_ROOT, env=env, capture_output=True, check=True)
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile imports and time the login screen startup.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS, help="import budget in ms")
+    args = parser.parse_args(argv)
+
+    profile = import_profile()
+    total_ms = sum(self_us for self_us, _, _ in profile) / 1000
+    print(f"Slowest imports (cumulative ms) of {len(profile)} modules:")
+    for _, cumulative_us, module in sorted(profile, key=lambda entry: -entry[1])[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f}  {module}")
+
+    imported = {module for _, _, module in profile}
+    deferred = [module for module in DEFERRED_MODULES if module in imported]
+    if deferred:
+        print(f"Imported before login but should be deferred: {', '.join(deferred)}")
+    print(f"Total import time: {total_ms:.1f} ms (budget {args.budget:.0f} ms)")
+
+    if args.runs > 0:
+        times = startup_times(args.runs)
+        print(f"Login screen startup over {args.runs} runs: median {statistics.median(times):.1f} ms, "
+              f"min {min(times):.1f} ms, max {max(times):.1f} ms")
+
+    return 1 if total_ms > args.budget or deferred else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,45 +6,61 @@ from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                                QLabel, QPushButton, QTableWidget, QTableWidgetItem,
                                QComboBox, QMessageBox, QDateEdit, QHeaderView, QTabWidget)
 from PySide6.QtCore import Qt, Signal
-from ui.common.system_logger import SystemLogger, UserRole, OperationType
+from ui.common.system_logger import SystemLogger, OperationType
+from ui.common.admin_reports import (fetch_logs, fetch_academic_performance, fetch_departmental_rankings,
+                                     fetch_course_performance, fetch_instructor_demographics,
+                                     fetch_student_rankings, REPORT_QUERIES, ENROLLMENT_HISTORY_QUERY,
+                                     ENROLLMENT_HISTORY_HEADERS)
+from ui.common.dashboard_prewarm import show_loading
+from ui.common.reporting_snapshot import SnapshotRefresher, connect_reporting
+from ui.common.section_enrollment import ensure_section_enrollment_table
+from ui.common.export_job import export_table, export_query_results
 
 
 class AdminDashboard(QMainWindow):
     logout_signal = Signal()
+    # Emitted from the snapshot refresher's thread; delivered on the GUI thread
+    snapshot_taken = Signal(object)
 
-    def __init__(self, user_id):
+    def __init__(self, session, prewarm=None):
         super().__init__()
-        self.user_id = user_id
+        self.session = session
+        # Started at login; the logs and reports arrive through it
+        self.prewarm = prewarm
+        self.user_id = session.user_id
         print(f"Initializing AdminDashboard with user_id: {self.user_id}")
         self.setWindowTitle("System Administrator Dashboard")
         self.setGeometry(100, 100, 1000, 800)  # Made window larger for reports
 
         # Initialize the universal logger
-        self.logger = SystemLogger(self.user_id, UserRole.ADMIN)
+        self.logger = SystemLogger(session)
+        # The running or last export, kept so it can be cancelled on exit
+        self.export_job = None
 
         self.setup_ui()
+
+        # Reports read a periodic copy of the database so their scans never
+        # hold locks that registrations wait on; the logs stay live
+        self.snapshot_taken.connect(self.on_snapshot_taken)
+        self.snapshot_refresher = SnapshotRefresher(on_snapshot=self.snapshot_taken.emit)
+        self.snapshot_refresher.start()
+
         self.logger.log_session(OperationType.LOGIN)
 
-    def load_logs(self):
+    def load_logs(self, logs=None):
         """Load system logs into the logs table"""
+        conn = None
         try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                              '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-
             # Log the data access
             self.logger.log_data_access(
                 "logs",
                 "viewed all system logs"
             )
 
-            cursor.execute("""
-                SELECT timestamp, user_id, operation_type, details
-                FROM operation_logs
-                ORDER BY timestamp DESC
-            """)
-
-            logs = cursor.fetchall()
+            if logs is None:
+                conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                    '..', 'data', 'academic_management.db'))
+                logs = fetch_logs(conn)
             self.logs_table.setRowCount(len(logs))
 
             for row, log in enumerate(logs):
@@ -162,6 +178,19 @@ class AdminDashboard(QMainWindow):
         header_layout.addWidget(self.admin_label)
         header_layout.addStretch()
 
+        # When the reports' snapshot was taken
+        self.snapshot_label = QLabel("Reports: live data")
+        header_layout.addWidget(self.snapshot_label)
+
+        # Export buttons; exports run in the background with a progress dialog
+        self.export_tab_button = QPushButton("Export Tab...")
+        self.export_tab_button.clicked.connect(self.export_current_tab)
+        header_layout.addWidget(self.export_tab_button)
+
+        self.export_history_button = QPushButton("Export Enrollment History...")
+        self.export_history_button.clicked.connect(self.export_enrollment_history)
+        header_layout.addWidget(self.export_history_button)
+
         # Clear Logs Button
         self.clear_logs_button = QPushButton("Clear Logs")
         self.clear_logs_button.clicked.connect(self.confirm_clear_logs)
@@ -203,12 +232,22 @@ class AdminDashboard(QMainWindow):
         main_layout.addWidget(self.tab_widget)
 
         # Load initial data for all tabs
-        self.load_logs()
-        self.load_academic_performance()
-        self.load_departmental_rankings()
-        self.load_course_performance()
-        self.load_instructor_demographics()
-        self.load_student_rankings()
+        initial_loads = [
+            ("logs", self.logs_table, self.load_logs),
+            ("academic_performance", self.performance_table, self.load_academic_performance),
+            ("departmental_rankings", self.rankings_table, self.load_departmental_rankings),
+            ("course_performance", self.trends_table, self.load_course_performance),
+            ("instructor_demographics", self.demographics_table, self.load_instructor_demographics),
+            ("student_rankings", self.student_rankings_table, self.load_student_rankings),
+        ]
+        # Tabs were added in this order, so a tab's index finds its report
+        self.tab_reports = [(name, table) for name, table, load in initial_loads]
+        for name, table, load in initial_loads:
+            if self.prewarm:
+                show_loading(table)
+                self.prewarm.on_ready(name, load)
+            else:
+                load()
 
     def setup_system_logs_tab(self):
         """Setup the system logs tab"""
@@ -344,58 +383,13 @@ class AdminDashboard(QMainWindow):
             header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(table.columnCount() - 1, QHeaderView.Stretch)
 
-    def load_academic_performance(self):
+    def load_academic_performance(self, results=None):
         """Load academic performance analysis data"""
+        conn = None
         try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                WITH student_gpas AS (
-                    SELECT 
-                        s.student_id,
-                        s.major,
-                        CASE 
-                            WHEN SUM(CASE 
-                                WHEN sc.grade IN ('A', 'S') THEN 4 * c.credits
-                                WHEN sc.grade = 'B' THEN 3 * c.credits
-                                WHEN sc.grade = 'C' THEN 2 * c.credits
-                                WHEN sc.grade = 'D' THEN 1 * c.credits
-                                WHEN sc.grade IN ('F', 'U', 'I') THEN 0
-                                ELSE 0
-                            END) = 0 THEN 0
-                            ELSE ROUND(
-                                SUM(CASE 
-                                    WHEN sc.grade IN ('A', 'S') THEN 4 * c.credits
-                                    WHEN sc.grade = 'B' THEN 3 * c.credits
-                                    WHEN sc.grade = 'C' THEN 2 * c.credits
-                                    WHEN sc.grade = 'D' THEN 1 * c.credits
-                                    WHEN sc.grade IN ('F', 'U', 'I') THEN 0
-                                    ELSE 0
-                                END) * 1.0 / 
-                                SUM(CASE WHEN sc.grade IN ('A', 'B', 'C', 'D', 'F', 'S', 'U', 'I') 
-                                    THEN c.credits ELSE 0 END),
-                                2
-                            )
-                        END as gpa
-                    FROM students s
-                    LEFT JOIN student_courses sc ON s.student_id = sc.student_id
-                    LEFT JOIN courses c ON sc.course_prefix = c.course_prefix 
-                        AND sc.course_number = c.course_number
-                    GROUP BY s.student_id, s.major
-                )
-                SELECT 
-                    major,
-                    MAX(gpa) as highest_gpa,
-                    MIN(gpa) as lowest_gpa,
-                    ROUND(AVG(gpa), 2) as average_gpa
-                FROM student_gpas
-                GROUP BY major
-                ORDER BY average_gpa DESC
-            """)
-
-            results = cursor.fetchall()
+            if results is None:
+                conn = connect_reporting()
+                results = fetch_academic_performance(conn)
             self.performance_table.setRowCount(len(results))
 
             for row, data in enumerate(results):
@@ -414,57 +408,13 @@ class AdminDashboard(QMainWindow):
             if conn:
                 conn.close()
 
-    def load_departmental_rankings(self):
+    def load_departmental_rankings(self, results=None):
         """Load departmental GPA rankings data"""
+        conn = None
         try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                WITH department_gpas AS (
-                    SELECT 
-                        d.department_id,
-                        CASE 
-                            WHEN SUM(CASE 
-                                WHEN sc.grade IN ('A', 'S') THEN 4 * c.credits
-                                WHEN sc.grade = 'B' THEN 3 * c.credits
-                                WHEN sc.grade = 'C' THEN 2 * c.credits
-                                WHEN sc.grade = 'D' THEN 1 * c.credits
-                                WHEN sc.grade IN ('F', 'U', 'I') THEN 0
-                                ELSE 0
-                            END) = 0 THEN 0
-                            ELSE ROUND(
-                                SUM(CASE 
-                                    WHEN sc.grade IN ('A', 'S') THEN 4 * c.credits
-                                    WHEN sc.grade = 'B' THEN 3 * c.credits
-                                    WHEN sc.grade = 'C' THEN 2 * c.credits
-                                    WHEN sc.grade = 'D' THEN 1 * c.credits
-                                    WHEN sc.grade IN ('F', 'U', 'I') THEN 0
-                                    ELSE 0
-                                END) * 1.0 / 
-                                SUM(CASE WHEN sc.grade IN ('A', 'B', 'C', 'D', 'F', 'S', 'U', 'I') 
-                                    THEN c.credits ELSE 0 END),
-                                2
-                            )
-                        END as dept_gpa
-                    FROM departments d
-                    JOIN department_majors dm ON d.department_id = dm.department_id
-                    JOIN students s ON dm.major_name = s.major
-                    LEFT JOIN student_courses sc ON s.student_id = sc.student_id
-                    LEFT JOIN courses c ON sc.course_prefix = c.course_prefix 
-                        AND sc.course_number = c.course_number
-                    GROUP BY d.department_id
-                )
-                SELECT 
-                    ROW_NUMBER() OVER (ORDER BY dept_gpa DESC) as rank,
-                    department_id,
-                    dept_gpa
-                FROM department_gpas
-                ORDER BY dept_gpa DESC
-            """)
-
-            results = cursor.fetchall()
+            if results is None:
+                conn = connect_reporting()
+                results = fetch_departmental_rankings(conn)
             self.rankings_table.setRowCount(len(results))
 
             for row, data in enumerate(results):
@@ -483,55 +433,13 @@ class AdminDashboard(QMainWindow):
             if conn:
                 conn.close()
 
-    def load_course_performance(self):
+    def load_course_performance(self, results=None):
         """Load course performance trends data"""
+        conn = None
         try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                WITH course_stats AS (
-                    SELECT 
-                        c.course_prefix || ' ' || c.course_number as course,
-                        sc.semester,
-                        sc.year_taken,
-                        COUNT(sc.student_id) as total_enrollments,
-                        ROUND(AVG(CASE 
-                            WHEN sc.grade IN ('A', 'S') THEN 4.0
-                            WHEN sc.grade = 'B' THEN 3.0
-                            WHEN sc.grade = 'C' THEN 2.0
-                            WHEN sc.grade = 'D' THEN 1.0
-                            WHEN sc.grade IN ('F', 'U', 'I') THEN 0.0
-                            ELSE NULL
-                        END), 2) as avg_grade
-                    FROM student_courses sc
-                    JOIN courses c ON sc.course_prefix = c.course_prefix 
-                        AND sc.course_number = c.course_number
-                    GROUP BY 
-                        c.course_prefix,
-                        c.course_number,
-                        sc.semester,
-                        sc.year_taken
-                )
-                SELECT 
-                    course,
-                    semester,
-                    year_taken,
-                    total_enrollments,
-                    COALESCE(avg_grade, 'N/A') as avg_grade
-                FROM course_stats
-                ORDER BY 
-                    year_taken DESC,
-                    CASE semester
-                        WHEN 'F' THEN 1
-                        WHEN 'S' THEN 2
-                        WHEN 'U' THEN 3
-                    END,
-                    course
-            """)
-
-            results = cursor.fetchall()
+            if results is None:
+                conn = connect_reporting()
+                results = fetch_course_performance(conn)
             self.trends_table.setRowCount(len(results))
 
             for row, data in enumerate(results):
@@ -553,60 +461,13 @@ class AdminDashboard(QMainWindow):
             if conn:
                 conn.close()
 
-    def load_instructor_demographics(self):
+    def load_instructor_demographics(self, results=None):
         """Load instructor course demographics data including semester/year information"""
+        conn = None
         try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                WITH student_majors AS (
-                    SELECT 
-                        ic.instructor_id,
-                        c.course_prefix || ' ' || c.course_number as course,
-                        ic.semester,
-                        ic.year_taught,
-                        s.major,
-                        COUNT(DISTINCT s.student_id) as student_count
-                    FROM instructor_courses ic
-                    JOIN student_courses sc ON ic.course_prefix = sc.course_prefix 
-                        AND ic.course_number = sc.course_number
-                        AND ic.semester = sc.semester
-                        AND ic.year_taught = sc.year_taken
-                    JOIN students s ON sc.student_id = s.student_id
-                    JOIN courses c ON ic.course_prefix = c.course_prefix 
-                        AND ic.course_number = c.course_number
-                    WHERE ic.instructor_id IS NOT NULL
-                    GROUP BY 
-                        ic.instructor_id,
-                        c.course_prefix,
-                        c.course_number,
-                        ic.semester,
-                        ic.year_taught,
-                        s.major
-                )
-                SELECT 
-                    instructor_id,
-                    course,
-                    CASE semester
-                        WHEN 'F' THEN 'Fall'
-                        WHEN 'S' THEN 'Spring'
-                        WHEN 'U' THEN 'Summer'
-                    END || ' ' || year_taught as term,
-                    GROUP_CONCAT(major || ': ' || student_count) as major_distribution
-                FROM student_majors
-                GROUP BY instructor_id, course, semester, year_taught
-                ORDER BY instructor_id, year_taught DESC, 
-                    CASE semester
-                        WHEN 'F' THEN 1
-                        WHEN 'S' THEN 2
-                        WHEN 'U' THEN 3
-                    END DESC,
-                    course
-            """)
-
-            results = cursor.fetchall()
+            if results is None:
+                conn = connect_reporting()
+                results = fetch_instructor_demographics(conn)
 
             # Update table structure to include the new term column
             self.demographics_table.setColumnCount(4)
@@ -642,45 +503,13 @@ class AdminDashboard(QMainWindow):
             if conn:
                 conn.close()
 
-    def load_student_rankings(self):
+    def load_student_rankings(self, results=None):
         """Load student rankings by credits within majors"""
+        conn = None
         try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                WITH student_credits AS (
-                    SELECT 
-                        s.major,
-                        s.student_id,
-                        COALESCE(SUM(c.credits), 0) as total_credits
-                    FROM students s
-                    LEFT JOIN student_courses sc ON s.student_id = sc.student_id
-                    LEFT JOIN courses c ON sc.course_prefix = c.course_prefix 
-                        AND sc.course_number = c.course_number
-                    GROUP BY s.major, s.student_id
-                ),
-                ranked_students AS (
-                    SELECT 
-                        major,
-                        student_id,
-                        total_credits,
-                        ROW_NUMBER() OVER (
-                            PARTITION BY major 
-                            ORDER BY total_credits DESC, student_id
-                        ) as rank_in_major
-                    FROM student_credits
-                )
-                SELECT 
-                    major,
-                    student_id,
-                    total_credits
-                FROM ranked_students
-                ORDER BY major, rank_in_major
-            """)
-
-            results = cursor.fetchall()
+            if results is None:
+                conn = connect_reporting()
+                results = fetch_student_rankings(conn)
             self.student_rankings_table.setRowCount(len(results))
 
             current_major = None
@@ -719,6 +548,32 @@ class AdminDashboard(QMainWindow):
             if conn:
                 conn.close()
 
+    def export_current_tab(self):
+        """Export the current tab: reports are streamed from their query, the logs as filtered on screen"""
+        name, table = self.tab_reports[self.tab_widget.currentIndex()]
+        title = f"Export {self.tab_widget.tabText(self.tab_widget.currentIndex())}"
+        headers = [table.horizontalHeaderItem(col).text() for col in range(table.columnCount())]
+
+        if name in REPORT_QUERIES:
+            # Same source as the report tabs; course_performance's counter table is ensured as its fetch does
+            job = export_query_results(self, title, f"{name}.csv", connect_reporting, REPORT_QUERIES[name],
+                                       headers=headers, prepare=ensure_section_enrollment_table)
+        else:
+            job = export_table(self, table, title, f"{name}.csv")
+
+        if job:
+            self.logger.log_data_access(name, f"exported to {job.path}")
+            self.export_job = job
+
+    def export_enrollment_history(self):
+        """Stream every enrollment ever recorded to a file, without loading it into a table"""
+        job = export_query_results(self, "Export Enrollment History", "enrollment_history.csv",
+                                   connect_reporting, ENROLLMENT_HISTORY_QUERY,
+                                   headers=ENROLLMENT_HISTORY_HEADERS)
+        if job:
+            self.logger.log_data_access("student_courses", f"exported enrollment history to {job.path}")
+            self.export_job = job
+
     def refresh_all_reports(self):
         """Refresh all report data"""
         self.load_logs()
@@ -790,10 +645,24 @@ class AdminDashboard(QMainWindow):
         self.logout_signal.emit()
         self.close()
 
+    def on_snapshot_taken(self, taken):
+        """Reload the reports from a new snapshot and show when it was taken"""
+        self.load_academic_performance()
+        self.load_departmental_rankings()
+        self.load_course_performance()
+        self.load_instructor_demographics()
+        self.load_student_rankings()
+        self.snapshot_label.setText(f"Reports as of {taken.strftime('%H:%M:%S')}")
+
     def closeEvent(self, event):
         """Override closeEvent to log when admin exits the system"""
         self.logger.log_operation(
             "exit",
             "Administrator exited the system"
         )
+        self.snapshot_refresher.stop()
+        if self.export_job:
+            # Lets an unfinished export remove its partial file before exit
+            self.export_job.cancel()
+            self.export_job.wait(5)
         event.accept()
\ No newline at end of file
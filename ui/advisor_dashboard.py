@@ -9,104 +9,48 @@ from PySide6.QtCore import Qt, Signal
 import sqlite3
 from datetime import datetime
 from ui.common.what_if_analysis import AdvisorWhatIfAnalysis
-from ui.common.system_logger import SystemLogger, UserRole, OperationType
+from ui.common.system_logger import SystemLogger, OperationType
+from ui.common.registration_rules import format_violations
+from ui.common.prerequisite_graph import get_prerequisite_graph
+from ui.common.degree_audit import DegreeAuditor
+from ui.common.dashboard_prewarm import LOADING_TEXT
+from ui.common.academic_service import AcademicService, fetch_advisor_data
+from ui.common.export_job import export_table
 
 
 class AdvisorDashboard(QMainWindow):
     logout_signal = Signal()
 
-    def __init__(self, user_id):
+    def __init__(self, session, prewarm=None):
         super().__init__()
-        self.user_id = user_id
-
-        # Initialize the logger first
-        self.logger = SystemLogger(self.user_id, UserRole.ADVISOR)
-
-        # Then get advisor_id and departments
-        self.advisor_id = self.get_advisor_id()
-        self.departments = self.get_advisor_departments()
+        # Identity was resolved at login
+        self.session = session
+        # Started at login; advisees and courses arrive through it
+        self.prewarm = prewarm
+        self.user_id = session.user_id
+        self.advisor_id = session.role_id
+        self.departments = session.departments
+
+        self.logger = SystemLogger(session)
+        self.service = AcademicService()
+        # Created on the first progress view; keeps its compiled requirement trees for the session
+        self.auditor = None
 
         print(f"Initializing AdvisorDashboard with user_id: {self.user_id}, advisor_id: {self.advisor_id}")
 
         self.setWindowTitle("Advisor Dashboard")
         self.setGeometry(100, 100, 800, 600)
         self.setup_ui()
-        self.load_advisor_data()
+        if self.prewarm:
+            for combo in (self.student_combo, self.progress_student_combo, self.course_combo):
+                combo.addItem(LOADING_TEXT, None)
+            self.prewarm.on_ready("advisor_data", self.load_advisor_data)
+        else:
+            self.load_advisor_data()
 
         # Log the login session
         self.logger.log_session(OperationType.LOGIN)
 
-    def get_advisor_id(self):
-        """Get the advisor_id from the database based on user_id"""
-        try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT advisor_id 
-                FROM advisors 
-                WHERE user_id = ?
-            """, (self.user_id,))
-            result = cursor.fetchone()
-
-            # Log the database access
-            if result:
-                self.logger.log_data_access(
-                    "advisors",
-                    "retrieved advisor ID",
-                    {"user_id": self.user_id, "advisor_id": result[0]}
-                )
-            return result[0] if result else None
-
-        except sqlite3.Error as e:
-            self.logger.log_operation(
-                OperationType.ERROR,
-                f"Failed to get advisor ID: {str(e)}"
-            )
-            print(f"Database error: {e}")
-            return None
-        finally:
-            if conn:
-                conn.close()
-
-    def get_advisor_departments(self):
-        """Get the departments associated with this advisor"""
-        if not self.advisor_id:
-            return []
-
-        try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT DISTINCT department_id 
-                FROM advisor_departments 
-                WHERE advisor_id = ?
-            """, (self.advisor_id,))
-            departments = [dept[0] for dept in cursor.fetchall()]
-
-            # Log the data access
-            self.logger.log_data_access(
-                "advisor_departments",
-                "retrieved department list",
-                {
-                    "advisor_id": self.advisor_id,
-                    "departments": departments
-                }
-            )
-            return departments
-
-        except sqlite3.Error as e:
-            self.logger.log_operation(
-                OperationType.ERROR,
-                f"Failed to get advisor departments: {str(e)}"
-            )
-            print(f"Database error: {e}")
-            return []
-        finally:
-            if conn:
-                conn.close()
-
     def setup_ui(self):
         """Initialize the user interface"""
         central_widget = QWidget()
@@ -210,6 +154,11 @@ class AdvisorDashboard(QMainWindow):
         course_layout.addWidget(self.course_combo)
         reg_layout.addLayout(course_layout)
 
+        # Courses the selected student unlocks by passing this term
+        self.unlocked_label = QLabel()
+        self.unlocked_label.setWordWrap(True)
+        reg_layout.addWidget(self.unlocked_label)
+
         # Buttons
         button_layout = QHBoxLayout()
         register_button = QPushButton("Register Course")
@@ -271,6 +220,13 @@ class AdvisorDashboard(QMainWindow):
         header.setSectionResizeMode(QHeaderView.Stretch)
         layout.addWidget(self.history_table)
 
+        export_layout = QHBoxLayout()
+        export_layout.addStretch()
+        self.export_history_button = QPushButton("Export History...")
+        self.export_history_button.clicked.connect(self.export_student_history)
+        export_layout.addWidget(self.export_history_button)
+        layout.addLayout(export_layout)
+
         tab.setLayout(layout)
         self.tab_widget.addTab(tab, "Student Progress")
 
@@ -286,13 +242,13 @@ class AdvisorDashboard(QMainWindow):
         tab.setLayout(layout)
         self.tab_widget.addTab(tab, "What-If Analysis")
 
-    def load_advisor_data(self):
-        """Load all advisor-related data from the database"""
+    def load_advisor_data(self, data=None):
+        """
+        Load all advisor-related data, from the prewarm fetch when given
+        (see fetch_advisor_data()) or from the database otherwise
+        """
+        conn = None
         try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-
             # Log the start of data loading
             self.logger.log_operation(
                 OperationType.VIEW,
@@ -300,27 +256,13 @@ class AdvisorDashboard(QMainWindow):
                 {"advisor_id": self.advisor_id}
             )
 
+            if data is None:
+                conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                    '..', 'data', 'academic_management.db'))
+                data = fetch_advisor_data(conn, self.advisor_id)
+
             # Load advisees
-            cursor.execute("""
-                SELECT DISTINCT s.student_id, s.major, dm.department_id,
-                       ROUND(AVG(CASE 
-                           WHEN sc.grade = 'A' THEN 4.0
-                           WHEN sc.grade = 'B' THEN 3.0
-                           WHEN sc.grade = 'C' THEN 2.0
-                           WHEN sc.grade = 'D' THEN 1.0
-                           WHEN sc.grade = 'F' THEN 0.0
-                           ELSE NULL
-                       END), 2) as gpa
-                FROM students s
-                JOIN department_majors dm ON s.major = dm.major_name
-                JOIN advisor_departments ad ON dm.department_id = ad.department_id
-                LEFT JOIN student_courses sc ON s.student_id = sc.student_id
-                WHERE ad.advisor_id = ?
-                GROUP BY s.student_id
-                ORDER BY s.student_id
-            """, (self.advisor_id,))
-
-            advisees = cursor.fetchall()
+            advisees = data["advisees"]
 
             # Log advisee data access
             self.logger.log_data_access(
@@ -347,16 +289,7 @@ class AdvisorDashboard(QMainWindow):
                 self.progress_student_combo.addItem(student_text, advisee[0])
 
             # Load available courses
-            cursor.execute("""
-                SELECT DISTINCT c.course_prefix, c.course_number, c.credits
-                FROM courses c
-                JOIN department_majors dm ON c.course_prefix = dm.department_id
-                JOIN advisor_departments ad ON dm.department_id = ad.department_id
-                WHERE ad.advisor_id = ?
-                ORDER BY c.course_prefix, c.course_number
-            """, (self.advisor_id,))
-
-            courses = cursor.fetchall()
+            courses = data["courses"]
 
             # Log course data access
             self.logger.log_data_access(
@@ -418,6 +351,22 @@ class AdvisorDashboard(QMainWindow):
 
             self.advisee_table.setRowHidden(row, not (matches_search and matches_dept))
 
+    def export_student_history(self):
+        """Export the selected student's course history as shown"""
+        student_id = self.progress_student_combo.currentData()
+        if not student_id:
+            QMessageBox.warning(self, "Warning", "Please select a student first")
+            return
+
+        job = export_table(self, self.history_table, "Export Course History", f"{student_id}_history.csv")
+        if job:
+            self.logger.log_data_access(
+                "student_progress",
+                f"exported course history to {job.path}",
+                {"student_id": student_id}
+            )
+            self.export_job = job
+
     def load_student_progress(self):
         """Load progress information for the selected student"""
         student_id = self.progress_student_combo.currentData()
@@ -441,51 +390,40 @@ class AdvisorDashboard(QMainWindow):
                 }
             )
 
-            # Get student progress information
-            cursor.execute("""
-                SELECT s.major, dm.hours_req,
-                       COUNT(sc.course_prefix) as courses_taken,
-                       SUM(c.credits) as credits_earned,
-                       ROUND(AVG(CASE 
-                           WHEN sc.grade = 'A' THEN 4.0
-                           WHEN sc.grade = 'B' THEN 3.0
-                           WHEN sc.grade = 'C' THEN 2.0
-                           WHEN sc.grade = 'D' THEN 1.0
-                           WHEN sc.grade = 'F' THEN 0.0
-                           ELSE NULL
-                       END), 2) as gpa
-                FROM students s
-                JOIN department_majors dm ON s.major = dm.major_name
-                LEFT JOIN student_courses sc ON s.student_id = sc.student_id
-                LEFT JOIN courses c ON sc.course_prefix = c.course_prefix 
-                    AND sc.course_number = c.course_number
-                WHERE s.student_id = ?
-                GROUP BY s.student_id
-            """, (student_id,))
-
-            progress = cursor.fetchone()
-            if progress:
-                major, hours_req, courses_taken, credits_earned, gpa = progress
-                credits_earned = credits_earned or 0
+            # Audit the student against their major's requirement groups
+            if self.auditor is None:
+                self.auditor = DegreeAuditor(self.service.connect())
+            audit = self.auditor.audit_student(student_id)
+            if audit:
+                group_lines = []
+                for group in audit["groups"]:
+                    status = "Complete" if group["satisfied"] else "Incomplete"
+                    line = f"  {group['name']}: {group['earned']}/{group['required']} ({status})"
+                    if group["missing"]:
+                        line += f" - missing {', '.join(group['missing'])}"
+                    group_lines.append(line)
+
+                gpa_text = f"{audit['gpa']:.2f}" if audit["gpa"] is not None else "N/A"
                 progress_text = (
-                    f"Major: {major}\n"
-                    f"Required Credits: {hours_req}\n"
-                    f"Credits Earned: {credits_earned}\n"
-                    f"Courses Taken: {courses_taken}\n"
-                    f"Current GPA: {gpa or 'N/A'}\n"
-                    f"Progress: {(credits_earned / hours_req * 100):.1f}% complete"
+                    f"Major: {audit['major']}\n"
+                    f"Required Credits: {audit['credits_required']}\n"
+                    f"Credits Earned: {audit['credits_earned']}\n"
+                    f"Credits In Progress: {audit['credits_in_progress']}\n"
+                    f"Current GPA: {gpa_text}\n"
+                    f"Progress: {audit['percent_complete']:.1f}% complete\n"
+                    f"Requirements:\n" + "\n".join(group_lines)
                 )
                 self.progress_label.setText(progress_text)
 
                 # Log the progress metrics
                 self.logger.log_data_access(
                     "student_metrics",
-                    "calculated student progress metrics",
+                    "calculated degree audit",
                     {
                         "student_id": student_id,
-                        "major": major,
-                        "credits_earned": credits_earned,
-                        "progress_percentage": f"{(credits_earned / hours_req * 100):.1f}%"
+                        "major": audit["major"],
+                        "credits_earned": audit["credits_earned"],
+                        "progress_percentage": f"{audit['percent_complete']:.1f}%"
                     }
                 )
 
@@ -559,7 +497,7 @@ class AdvisorDashboard(QMainWindow):
             return
 
         # Get selected semester and year
-        semester_data = self.view_semester_combo.currentData()
+        semester_data = self.semester_combo.currentData()
         if not semester_data:
             return
 
@@ -611,6 +549,8 @@ class AdvisorDashboard(QMainWindow):
 
             courses = cursor.fetchall()
 
+            self.update_course_eligibility(conn, student_id, selected_semester, selected_year)
+
             # Log the results
             self.logger.log_data_access(
                 "course_schedule",
@@ -651,6 +591,36 @@ class AdvisorDashboard(QMainWindow):
             if conn:
                 conn.close()
 
+    def update_course_eligibility(self, conn, student_id, semester, year):
+        """Flag courses with unmet prerequisites and list what this term unlocks"""
+        try:
+            graph = get_prerequisite_graph(conn)
+        except ValueError as e:
+            self.logger.log_operation(OperationType.ERROR, f"Invalid prerequisite data: {str(e)}")
+            return
+
+        completed_mask = graph.completed_mask(conn, student_id)
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT course_prefix, course_number
+            FROM student_courses
+            WHERE student_id = ? AND semester = ? AND year_taken = ?
+        """, (student_id, semester, year))
+        term_mask = graph.mask_of(cursor.fetchall())
+
+        for index in range(self.course_combo.count()):
+            prefix, number, credits = self.course_combo.itemData(index)
+            course_text = f"{prefix} {number} ({credits} credits)"
+            if not graph.can_take((prefix, number), completed_mask):
+                course_text += " - prerequisites missing"
+            self.course_combo.setItemText(index, course_text)
+
+        unlocked = graph.unlocked_after(completed_mask, term_mask)
+        self.unlocked_label.setText(
+            "Unlocked after this term: " +
+            (", ".join(f"{prefix} {number}" for prefix, number in unlocked) or "None")
+        )
+
     def drop_course(self):
         """Drop a student from a selected course with enhanced validation"""
         # Validate student selection
@@ -761,36 +731,16 @@ class AdvisorDashboard(QMainWindow):
             return
 
         # Perform database operation
-        conn = None
         try:
-            conn = sqlite3.connect(os.path.join(
-                os.path.dirname(os.path.abspath(__file__)),
-                '..', 'data', 'academic_management.db'
-            ))
-            cursor = conn.cursor()
-
-            # Begin transaction
-            cursor.execute("BEGIN TRANSACTION")
+            violations = self.service.drop_course(student_id, course_prefix, course_number, semester, year)
 
-            # Verify the course exists and can be dropped
-            cursor.execute("""
-                SELECT COUNT(*) FROM student_courses 
-                WHERE student_id = ? 
-                AND course_prefix = ? 
-                AND course_number = ? 
-                AND semester = ? 
-                AND year_taken = ?
-                AND (grade IS NULL OR grade = '')
-            """, (student_id, course_prefix, course_number, semester, year))
-
-            if cursor.fetchone()[0] == 0:
-                cursor.execute("ROLLBACK")
-                error_msg = "Course not found or cannot be dropped."
+            if violations:
+                error_msg = format_violations(violations)
                 self.logger.log_operation(
                     OperationType.ERROR,
                     error_msg,
                     {
-                        "reason": "course_not_found",
+                        "reason": ", ".join(v["rule"] for v in violations),
                         "course": f"{course_prefix} {course_number}",
                         "student_id": student_id
                     }
@@ -798,19 +748,6 @@ class AdvisorDashboard(QMainWindow):
                 QMessageBox.warning(self, "Drop Error", error_msg)
                 return
 
-            # Perform the drop
-            cursor.execute("""
-                DELETE FROM student_courses 
-                WHERE student_id = ? 
-                AND course_prefix = ? 
-                AND course_number = ? 
-                AND semester = ? 
-                AND year_taken = ?
-            """, (student_id, course_prefix, course_number, semester, year))
-
-            # Commit transaction
-            conn.commit()
-
             # Log successful drop
             self.logger.log_operation(
                 OperationType.DROP,
@@ -833,8 +770,6 @@ class AdvisorDashboard(QMainWindow):
             )
 
         except sqlite3.Error as e:
-            if conn:
-                conn.rollback()
             error_msg = f"Database error while dropping course: {str(e)}"
             self.logger.log_operation(
                 OperationType.ERROR,
@@ -845,12 +780,6 @@ class AdvisorDashboard(QMainWindow):
                 "Error",
                 "Failed to drop course. Please try again or contact system administrator."
             )
-        finally:
-            if conn:
-                try:
-                    conn.close()
-                except sqlite3.Error as e:
-                    print(f"Error closing database connection: {e}")
 
     def register_course(self):
         """Register a student for a selected course"""
@@ -874,18 +803,7 @@ class AdvisorDashboard(QMainWindow):
 
         semester, year = semester_data
 
-        # Check for duplicate registration
-        conn = None
         try:
-            conn = sqlite3.connect(os.path.join(
-                os.path.dirname(os.path.abspath(__file__)),
-                '..', 'data', 'academic_management.db'
-            ))
-            cursor = conn.cursor()
-
-            # Begin transaction
-            cursor.execute("BEGIN TRANSACTION")
-
             # Log the registration attempt
             self.logger.log_operation(
                 OperationType.REGISTER,
@@ -898,24 +816,16 @@ class AdvisorDashboard(QMainWindow):
                 }
             )
 
-            # Check if student is already registered for this course in the same semester
-            cursor.execute("""
-                SELECT COUNT(*) FROM student_courses 
-                WHERE student_id = ? 
-                AND course_prefix = ? 
-                AND course_number = ? 
-                AND semester = ? 
-                AND year_taken = ?
-            """, (student_id, course_prefix, course_number, semester, year))
-
-            if cursor.fetchone()[0] > 0:
-                cursor.execute("ROLLBACK")
-                error_msg = "Student is already registered for this course in the selected semester."
+            # Validates duplicates, credit cap, prerequisites and meeting conflicts
+            violations = self.service.register_course(student_id, course_prefix, course_number, semester, year)
+
+            if violations:
+                error_msg = format_violations(violations)
                 self.logger.log_operation(
                     OperationType.ERROR,
                     error_msg,
                     {
-                        "type": "duplicate_registration",
+                        "type": ", ".join(v["rule"] for v in violations),
                         "student_id": student_id,
                         "course": f"{course_prefix} {course_number}"
                     }
@@ -923,16 +833,6 @@ class AdvisorDashboard(QMainWindow):
                 QMessageBox.warning(self, "Registration Error", error_msg)
                 return
 
-            # Register the student for the course
-            cursor.execute("""
-                INSERT INTO student_courses 
-                (student_id, course_prefix, course_number, semester, year_taken)
-                VALUES (?, ?, ?, ?, ?)
-            """, (student_id, course_prefix, course_number, semester, year))
-
-            # Commit transaction
-            conn.commit()
-
             # Log successful registration
             self.logger.log_operation(
                 OperationType.REGISTER,
@@ -955,8 +855,6 @@ class AdvisorDashboard(QMainWindow):
             )
 
         except sqlite3.Error as e:
-            if conn:
-                conn.rollback()
             error_msg = f"Failed to register for course: {str(e)}"
             self.logger.log_operation(
                 OperationType.ERROR,
@@ -970,12 +868,6 @@ class AdvisorDashboard(QMainWindow):
             print(error_msg)
             QMessageBox.critical(self, "Error",
                                  "Failed to register for course. Please try again or contact system administrator.")
-        finally:
-            if conn:
-                try:
-                    conn.close()
-                except sqlite3.Error as e:
-                    print(f"Error closing database connection: {e}")
 
 
     def log_operation(self, operation_type, details):
@@ -1007,6 +899,9 @@ class AdvisorDashboard(QMainWindow):
             "Advisor exited the system",
             include_role_prefix=False
         )
+        if self.auditor is not None:
+            self.auditor.conn.close()
+            self.auditor = None
         event.accept()
 
     def logout(self):
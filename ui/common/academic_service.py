@@ -0,0 +1,526 @@
+import sqlite3
+from typing import Optional, Dict, Any, List, Tuple, Iterable
+
+from ui.common.admin_reports import REPORTS
+from ui.common.db import get_db_path
+from ui.common.degree_audit import GRADE_POINTS
+from ui.common.instructor_load import refresh_instructor_loads, refresh_course_loads
+from ui.common.meeting_conflicts import MeetingConflictChecker, replace_section_meetings
+from ui.common.registration_rules import RegistrationValidator
+from ui.common.reporting_snapshot import connect_reporting
+from ui.common.section_enrollment import adjust_enrollment
+
+# Seconds a call waits for another connection's write lock before failing
+BUSY_TIMEOUT = 10.0
+
+
+def _violation(rule: str, message: str) -> Dict[str, Any]:
+    return {"rule": rule, "message": message}
+
+
+def _missing_references(conn: sqlite3.Connection, student_id: Optional[str] = None,
+                        course: Optional[Tuple[str, str]] = None,
+                        section: Optional[Tuple[str, str, str, int]] = None,
+                        instructor_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Check that the records a change refers to exist. The dashboards only
+    offer existing choices; callers of the service may pass anything.
+
+    Returns:
+        List[Dict[str, Any]]: 'unknown_student', 'unknown_course',
+        'section_not_offered' and 'unknown_instructor' violations
+    """
+    violations = []
+    if student_id is not None and conn.execute(
+            "SELECT 1 FROM students WHERE student_id = ?", (student_id,)).fetchone() is None:
+        violations.append(_violation("unknown_student", f"Student {student_id} does not exist."))
+    if course is not None and conn.execute(
+            "SELECT 1 FROM courses WHERE course_prefix = ? AND course_number = ?", course).fetchone() is None:
+        violations.append(_violation("unknown_course", f"Course {course[0]} {course[1]} does not exist."))
+    elif section is not None and conn.execute("""
+            SELECT 1 FROM instructor_courses
+            WHERE course_prefix = ? AND course_number = ? AND semester = ? AND year_taught = ?
+            """, section).fetchone() is None:
+        violations.append(_violation("section_not_offered",
+                                     f"{section[0]} {section[1]} is not offered in {section[2]} {section[3]}."))
+    if instructor_id is not None and conn.execute(
+            "SELECT 1 FROM instructors WHERE instructor_id = ?", (instructor_id,)).fetchone() is None:
+        violations.append(_violation("unknown_instructor", f"Instructor {instructor_id} does not exist."))
+    return violations
+
+
+def _course_removal_violations(conn: sqlite3.Connection, course_prefix: str,
+                               course_number: str) -> List[Dict[str, Any]]:
+    """Refuse to remove a course that has enrollments."""
+    cursor = conn.execute("""
+        SELECT EXISTS (SELECT 1 FROM student_courses WHERE course_prefix = ? AND course_number = ?)
+    """, (course_prefix, course_number))
+    if cursor.fetchone()[0]:
+        return [_violation("has_enrollments", "Cannot remove course with existing enrollments")]
+    return []
+
+
+def calculate_gpa(courses: Iterable[Tuple[int, Optional[str]]]) -> float:
+    """
+    Return the GPA of (credits, grade) pairs, counting only letter grades.
+
+    Returns:
+        float: The GPA, 0.0 when no course has a letter grade
+    """
+    total_points = 0
+    total_credits = 0
+    for credits, grade in courses:
+        if grade in GRADE_POINTS:
+            total_points += GRADE_POINTS[grade] * credits
+            total_credits += credits
+    return total_points / total_credits if total_credits > 0 else 0.0
+
+
+def fetch_student_record(conn: sqlite3.Connection, student_id: str) -> Dict[str, Any]:
+    """
+    Load a student's details and every course they have taken.
+
+    Returns:
+        Dict[str, Any]: 'info' (student_id, gender, major) and 'courses',
+        (semester, year, prefix, number, credits, grade) rows ordered by
+        term and course
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT student_id, gender, major FROM students WHERE student_id = ?", (student_id,))
+    info = cursor.fetchone()
+    cursor.execute("""
+        SELECT sc.semester, sc.year_taken, c.course_prefix, c.course_number, c.credits, sc.grade
+        FROM student_courses sc
+        JOIN courses c ON sc.course_prefix = c.course_prefix
+            AND sc.course_number = c.course_number
+        WHERE sc.student_id = ?
+        ORDER BY sc.year_taken,
+            CASE sc.semester
+                WHEN 'S' THEN 1
+                WHEN 'U' THEN 2
+                WHEN 'F' THEN 3
+            END,
+            c.course_prefix, c.course_number
+    """, (student_id,))
+    return {"info": info, "courses": cursor.fetchall()}
+
+
+def compute_transcript(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Group a student record (see fetch_student_record()) into terms with
+    their credits and GPAs, in one pass over its courses.
+
+    Returns:
+        Dict[str, Any]: 'info', 'semesters' (oldest first; each with 'term',
+        'year', 'courses', 'semester_credits', 'semester_gpa' and
+        'cumulative_gpa'), 'total_credits' (graded credits) and
+        'cumulative_gpa'
+    """
+    semesters = []
+    cumulative_points = 0
+    cumulative_credits = 0
+    # Courses arrive ordered by term, so each term is one consecutive run
+    for semester, year, prefix, number, credits, grade in record['courses']:
+        if not semesters or (semesters[-1]['code'], semesters[-1]['year']) != (semester, year):
+            semesters.append({
+                'code': semester,
+                'term': {'F': 'Fall', 'S': 'Spring', 'U': 'Summer'}[semester],
+                'year': year,
+                'courses': [],
+                'semester_points': 0,
+                'semester_credits': 0,
+            })
+        current = semesters[-1]
+        current['courses'].append({'prefix': prefix, 'number': number, 'credits': credits, 'grade': grade})
+        if grade in GRADE_POINTS:
+            current['semester_points'] += GRADE_POINTS[grade] * credits
+            current['semester_credits'] += credits
+
+    for current in semesters:
+        cumulative_points += current['semester_points']
+        cumulative_credits += current['semester_credits']
+        current['semester_gpa'] = (current['semester_points'] / current['semester_credits']
+                                   if current['semester_credits'] > 0 else 0.0)
+        current['cumulative_gpa'] = cumulative_points / cumulative_credits if cumulative_credits > 0 else 0.0
+
+    return {
+        'info': record['info'],
+        'semesters': semesters,
+        'total_credits': cumulative_credits,
+        'cumulative_gpa': cumulative_points / cumulative_credits if cumulative_credits > 0 else 0.0,
+    }
+
+
+def fetch_advisor_data(conn: sqlite3.Connection, advisor_id: str) -> Dict[str, List[Tuple]]:
+    """
+    Load an advisor's advisees (with their GPA) and the courses of the
+    advised departments.
+
+    Returns:
+        Dict[str, List[Tuple]]: 'advisees' (student_id, major,
+        department_id, gpa) and 'courses' (prefix, number, credits) rows
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT DISTINCT s.student_id, s.major, dm.department_id,
+               ROUND(AVG(CASE
+                   WHEN sc.grade = 'A' THEN 4.0
+                   WHEN sc.grade = 'B' THEN 3.0
+                   WHEN sc.grade = 'C' THEN 2.0
+                   WHEN sc.grade = 'D' THEN 1.0
+                   WHEN sc.grade = 'F' THEN 0.0
+                   ELSE NULL
+               END), 2) as gpa
+        FROM students s
+        JOIN department_majors dm ON s.major = dm.major_name
+        JOIN advisor_departments ad ON dm.department_id = ad.department_id
+        LEFT JOIN student_courses sc ON s.student_id = sc.student_id
+        WHERE ad.advisor_id = ?
+        GROUP BY s.student_id
+        ORDER BY s.student_id
+    """, (advisor_id,))
+    advisees = cursor.fetchall()
+
+    cursor.execute("""
+        SELECT DISTINCT c.course_prefix, c.course_number, c.credits
+        FROM courses c
+        JOIN department_course_prefixes dcp ON c.course_prefix = dcp.course_prefix
+        JOIN advisor_departments ad ON dcp.department_id = ad.department_id
+        WHERE ad.advisor_id = ?
+        ORDER BY c.course_prefix, c.course_number
+    """, (advisor_id,))
+    return {"advisees": advisees, "courses": cursor.fetchall()}
+
+
+def fetch_department_catalog(conn: sqlite3.Connection, department_id: str) -> List[Tuple]:
+    """Return the (prefix, number, credits) courses of a department's prefixes."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT DISTINCT c.course_prefix, c.course_number, c.credits
+        FROM courses c
+        JOIN department_course_prefixes dcp ON c.course_prefix = dcp.course_prefix
+        WHERE dcp.department_id = ?
+        ORDER BY c.course_prefix, c.course_number
+    """, (department_id,))
+    return cursor.fetchall()
+
+
+def fetch_section_roster(conn: sqlite3.Connection, course_prefix: str, course_number: str,
+                         semester: str, year: int) -> List[Dict[str, Any]]:
+    """Return the students of a course section with their grades, by student ID."""
+    cursor = conn.execute("""
+        SELECT s.student_id, s.gender, s.major, sc.grade
+        FROM student_courses sc
+        JOIN students s ON sc.student_id = s.student_id
+        WHERE sc.course_prefix = ? AND sc.course_number = ? AND sc.semester = ? AND sc.year_taken = ?
+        ORDER BY s.student_id
+    """, (course_prefix, course_number, semester, year))
+    return [{"student_id": student_id, "gender": gender, "major": major, "grade": grade}
+            for student_id, gender, major, grade in cursor.fetchall()]
+
+
+class AcademicService:
+    """
+    Headless enrollment, catalog, scheduling, GPA and reporting operations.
+
+    These are the operations the dashboards perform, without any Qt, so
+    they can be scripted, benchmarked and driven from several threads at
+    once. Every call opens its own connection. Writes take the database
+    write lock before validating (BEGIN IMMEDIATE), so concurrent calls
+    cannot both pass validation and then both write.
+
+    Mutations return a list of violations, as RegistrationValidator does,
+    which is empty when the change was made. They do not log operations;
+    callers log with their own SystemLogger.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the service.
+
+        Args:
+            db_path: Database path, defaults to the application database
+        """
+        self.db_path = db_path or get_db_path()
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a connection to the service's database."""
+        return sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT)
+
+    def _write(self, change) -> List[Dict[str, Any]]:
+        """
+        Run change(conn) in a write transaction, committing when it returns
+        no violations and rolling back otherwise or on an error.
+        """
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            violations = change(conn)
+            if violations:
+                conn.rollback()
+            else:
+                conn.commit()
+            return violations
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    # Enrollment
+
+    def register_course(self, student_id: str, course_prefix: str, course_number: str,
+                        semester: str, year: int) -> List[Dict[str, Any]]:
+        """
+        Register a student for a course section after checking that the
+        student exists and the section is offered, then duplicates, the term
+        credit cap, prerequisites and meeting conflicts.
+
+        Returns:
+            List[Dict[str, Any]]: Violations; empty if the student was registered
+        """
+        def change(conn):
+            violations = _missing_references(conn, student_id=student_id,
+                                             course=(course_prefix, course_number),
+                                             section=(course_prefix, course_number, semester, year))
+            if violations:
+                return violations
+            violations = RegistrationValidator(conn).validate_student_schedule(
+                student_id, [(course_prefix, course_number)], semester, year
+            )
+            violations.extend(MeetingConflictChecker(conn, semester, year).student_conflicts(
+                student_id, (course_prefix, course_number)
+            ))
+            if violations:
+                return violations
+            adjust_enrollment(conn, (course_prefix, course_number, semester, year), 1)
+            conn.execute("""
+                INSERT INTO student_courses
+                (student_id, course_prefix, course_number, semester, year_taken)
+                VALUES (?, ?, ?, ?, ?)
+            """, (student_id, course_prefix, course_number, semester, year))
+            return []
+
+        return self._write(change)
+
+    def drop_course(self, student_id: str, course_prefix: str, course_number: str,
+                    semester: str, year: int) -> List[Dict[str, Any]]:
+        """
+        Drop a student's ungraded course section.
+
+        Returns:
+            List[Dict[str, Any]]: Violations; empty if the course was dropped
+        """
+        def change(conn):
+            cursor = conn.execute("""
+                SELECT COUNT(*) FROM student_courses
+                WHERE student_id = ?
+                AND course_prefix = ?
+                AND course_number = ?
+                AND semester = ?
+                AND year_taken = ?
+                AND (grade IS NULL OR grade = '')
+            """, (student_id, course_prefix, course_number, semester, year))
+            if cursor.fetchone()[0] == 0:
+                return [_violation("course_not_found", "Course not found or cannot be dropped.")]
+            adjust_enrollment(conn, (course_prefix, course_number, semester, year), -1)
+            conn.execute("""
+                DELETE FROM student_courses
+                WHERE student_id = ?
+                AND course_prefix = ?
+                AND course_number = ?
+                AND semester = ?
+                AND year_taken = ?
+            """, (student_id, course_prefix, course_number, semester, year))
+            return []
+
+        return self._write(change)
+
+    def student_record(self, student_id: str) -> Dict[str, Any]:
+        """Return a student's details and courses (see fetch_student_record())."""
+        conn = self.connect()
+        try:
+            return fetch_student_record(conn, student_id)
+        finally:
+            conn.close()
+
+    def section_roster(self, course_prefix: str, course_number: str,
+                       semester: str, year: int) -> List[Dict[str, Any]]:
+        """Return a section's roster (see fetch_section_roster())."""
+        conn = self.connect()
+        try:
+            return fetch_section_roster(conn, course_prefix, course_number, semester, year)
+        finally:
+            conn.close()
+
+    # GPA
+
+    def student_gpa(self, student_id: str) -> float:
+        """Return a student's cumulative GPA."""
+        conn = self.connect()
+        try:
+            courses = conn.execute("""
+                SELECT c.credits, sc.grade
+                FROM student_courses sc
+                JOIN courses c ON sc.course_prefix = c.course_prefix AND sc.course_number = c.course_number
+                WHERE sc.student_id = ? AND sc.grade IS NOT NULL
+            """, (student_id,)).fetchall()
+        finally:
+            conn.close()
+        return calculate_gpa(courses)
+
+    # Catalog
+
+    def department_catalog(self, department_id: str) -> List[Tuple]:
+        """Return a department's (prefix, number, credits) courses."""
+        conn = self.connect()
+        try:
+            return fetch_department_catalog(conn, department_id)
+        finally:
+            conn.close()
+
+    def add_course(self, department_id: str, course_prefix: str, course_number: str,
+                   credits: int) -> List[Dict[str, Any]]:
+        """
+        Add a course to the catalog for a department. A prefix no department
+        owns yet is added to the department's prefixes.
+
+        Returns:
+            List[Dict[str, Any]]: Violations; empty if the course was added
+        """
+        violations = []
+        if not course_prefix or len(course_prefix) != 3 or not course_prefix.isalpha():
+            violations.append(_violation("invalid_prefix", "Course prefix must be exactly 3 letters"))
+        if not course_number or not str(course_number).isdigit():
+            violations.append(_violation("invalid_number", "Course number must be numeric"))
+        if not 1 <= credits <= 4:
+            violations.append(_violation("invalid_credits", "Credits must be between 1 and 4"))
+        if violations:
+            return violations
+
+        def change(conn):
+            cursor = conn.execute("SELECT department_id FROM department_course_prefixes WHERE course_prefix = ?",
+                                  (course_prefix,))
+            existing_dept = cursor.fetchone()
+            if existing_dept and existing_dept[0] != department_id:
+                return [_violation("prefix_owned", "This course prefix belongs to another department")]
+            cursor.execute("SELECT COUNT(*) FROM courses WHERE course_prefix = ? AND course_number = ?",
+                           (course_prefix, course_number))
+            if cursor.fetchone()[0] > 0:
+                return [_violation("duplicate_course", "This course already exists")]
+            if not existing_dept:
+                conn.execute("""
+                    INSERT INTO department_course_prefixes
+                    (department_id, course_prefix, is_primary, added_date)
+                    VALUES (?, ?, 0, datetime('now'))
+                """, (department_id, course_prefix))
+            conn.execute("INSERT INTO courses (course_prefix, course_number, credits) VALUES (?, ?, ?)",
+                         (course_prefix, course_number, credits))
+            return []
+
+        return self._write(change)
+
+    def can_remove_course(self, course_prefix: str, course_number: str) -> List[Dict[str, Any]]:
+        """
+        Check, without writing, whether a course can be removed, e.g. before
+        asking for confirmation. remove_course() checks again when it writes.
+
+        Returns:
+            List[Dict[str, Any]]: Violations; empty if the course can be removed
+        """
+        conn = self.connect()
+        try:
+            return _course_removal_violations(conn, course_prefix, course_number)
+        finally:
+            conn.close()
+
+    def remove_course(self, course_prefix: str, course_number: str) -> List[Dict[str, Any]]:
+        """
+        Remove a course without enrollments from the catalog.
+
+        Returns:
+            List[Dict[str, Any]]: Violations; empty if the course was removed
+        """
+        def change(conn):
+            violations = _course_removal_violations(conn, course_prefix, course_number)
+            if violations:
+                return violations
+            conn.execute("DELETE FROM courses WHERE course_prefix = ? AND course_number = ?",
+                         (course_prefix, course_number))
+            refresh_course_loads(conn, course_prefix, course_number)
+            return []
+
+        return self._write(change)
+
+    # Scheduling
+
+    def schedule_section(self, course_prefix: str, course_number: str, semester: str, year: int,
+                         instructor_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Schedule a course section for a term, optionally with an instructor,
+        after checking that the course and instructor exist, then for a
+        duplicate section and the instructor credit limit.
+
+        Returns:
+            List[Dict[str, Any]]: Violations; empty if the section was scheduled
+        """
+        def change(conn):
+            violations = _missing_references(conn, course=(course_prefix, course_number),
+                                             instructor_id=instructor_id)
+            if violations:
+                return violations
+            violations = RegistrationValidator(conn).validate_term_sections(
+                [{"prefix": course_prefix, "number": course_number, "instructor_id": instructor_id}],
+                semester, year
+            )
+            if violations:
+                return violations
+            conn.execute("""
+                INSERT INTO instructor_courses
+                (course_prefix, course_number, instructor_id, semester, year_taught)
+                VALUES (?, ?, ?, ?, ?)
+            """, (course_prefix, course_number, instructor_id, semester, year))
+            refresh_instructor_loads(conn, [(semester, year)])
+            return []
+
+        return self._write(change)
+
+    def unschedule_section(self, course_prefix: str, course_number: str,
+                           semester: str, year: int) -> List[Dict[str, Any]]:
+        """
+        Remove a course section, and its meetings, from a term's schedule.
+
+        Returns:
+            List[Dict[str, Any]]: Always empty; returned for symmetry with the other mutations
+        """
+        def change(conn):
+            conn.execute("""
+                DELETE FROM instructor_courses
+                WHERE course_prefix = ?
+                AND course_number = ?
+                AND semester = ?
+                AND year_taught = ?
+            """, (course_prefix, course_number, semester, year))
+            refresh_instructor_loads(conn, [(semester, year)])
+            replace_section_meetings(conn, course_prefix, course_number, semester, year, [])
+            return []
+
+        return self._write(change)
+
+    # Reporting
+
+    def report(self, name: str) -> List[Tuple]:
+        """
+        Run one of the administrator reports by name (see REPORTS), on the
+        reporting snapshot when a fresh one exists.
+
+        Raises:
+            ValueError: If there is no report of that name
+        """
+        if name not in REPORTS:
+            raise ValueError(f"Unknown report '{name}'. Reports are: {', '.join(REPORTS)}")
+        conn = connect_reporting(self.db_path)
+        try:
+            return REPORTS[name](conn)
+        finally:
+            conn.close()
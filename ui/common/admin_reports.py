@@ -0,0 +1,282 @@
+import sqlite3
+from typing import List, Tuple
+
+from ui.common.section_enrollment import ensure_section_enrollment_table
+
+# Queries behind the administrator dashboard's log and report tabs. They
+# only need a connection, so they can also run on a prewarm worker thread
+# while the dashboard is being built.
+
+
+LOGS_QUERY = """
+        SELECT timestamp, user_id, operation_type, details
+        FROM operation_logs
+        ORDER BY timestamp DESC
+    """
+
+
+def fetch_logs(conn: sqlite3.Connection) -> List[Tuple]:
+    """System log entries, newest first."""
+    return conn.execute(LOGS_QUERY).fetchall()
+
+
+ACADEMIC_PERFORMANCE_QUERY = """
+        WITH student_gpas AS (
+            SELECT 
+                s.student_id,
+                s.major,
+                CASE 
+                    WHEN SUM(CASE 
+                        WHEN sc.grade IN ('A', 'S') THEN 4 * c.credits
+                        WHEN sc.grade = 'B' THEN 3 * c.credits
+                        WHEN sc.grade = 'C' THEN 2 * c.credits
+                        WHEN sc.grade = 'D' THEN 1 * c.credits
+                        WHEN sc.grade IN ('F', 'U', 'I') THEN 0
+                        ELSE 0
+                    END) = 0 THEN 0
+                    ELSE ROUND(
+                        SUM(CASE 
+                            WHEN sc.grade IN ('A', 'S') THEN 4 * c.credits
+                            WHEN sc.grade = 'B' THEN 3 * c.credits
+                            WHEN sc.grade = 'C' THEN 2 * c.credits
+                            WHEN sc.grade = 'D' THEN 1 * c.credits
+                            WHEN sc.grade IN ('F', 'U', 'I') THEN 0
+                            ELSE 0
+                        END) * 1.0 / 
+                        SUM(CASE WHEN sc.grade IN ('A', 'B', 'C', 'D', 'F', 'S', 'U', 'I') 
+                            THEN c.credits ELSE 0 END),
+                        2
+                    )
+                END as gpa
+            FROM students s
+            LEFT JOIN student_courses sc ON s.student_id = sc.student_id
+            LEFT JOIN courses c ON sc.course_prefix = c.course_prefix 
+                AND sc.course_number = c.course_number
+            GROUP BY s.student_id, s.major
+        )
+        SELECT 
+            major,
+            MAX(gpa) as highest_gpa,
+            MIN(gpa) as lowest_gpa,
+            ROUND(AVG(gpa), 2) as average_gpa
+        FROM student_gpas
+        GROUP BY major
+        ORDER BY average_gpa DESC
+    """
+
+
+def fetch_academic_performance(conn: sqlite3.Connection) -> List[Tuple]:
+    """Highest, lowest and average GPA per major."""
+    return conn.execute(ACADEMIC_PERFORMANCE_QUERY).fetchall()
+
+
+DEPARTMENTAL_RANKINGS_QUERY = """
+        WITH department_gpas AS (
+            SELECT 
+                d.department_id,
+                CASE 
+                    WHEN SUM(CASE 
+                        WHEN sc.grade IN ('A', 'S') THEN 4 * c.credits
+                        WHEN sc.grade = 'B' THEN 3 * c.credits
+                        WHEN sc.grade = 'C' THEN 2 * c.credits
+                        WHEN sc.grade = 'D' THEN 1 * c.credits
+                        WHEN sc.grade IN ('F', 'U', 'I') THEN 0
+                        ELSE 0
+                    END) = 0 THEN 0
+                    ELSE ROUND(
+                        SUM(CASE 
+                            WHEN sc.grade IN ('A', 'S') THEN 4 * c.credits
+                            WHEN sc.grade = 'B' THEN 3 * c.credits
+                            WHEN sc.grade = 'C' THEN 2 * c.credits
+                            WHEN sc.grade = 'D' THEN 1 * c.credits
+                            WHEN sc.grade IN ('F', 'U', 'I') THEN 0
+                            ELSE 0
+                        END) * 1.0 / 
+                        SUM(CASE WHEN sc.grade IN ('A', 'B', 'C', 'D', 'F', 'S', 'U', 'I') 
+                            THEN c.credits ELSE 0 END),
+                        2
+                    )
+                END as dept_gpa
+            FROM departments d
+            JOIN department_majors dm ON d.department_id = dm.department_id
+            JOIN students s ON dm.major_name = s.major
+            LEFT JOIN student_courses sc ON s.student_id = sc.student_id
+            LEFT JOIN courses c ON sc.course_prefix = c.course_prefix 
+                AND sc.course_number = c.course_number
+            GROUP BY d.department_id
+        )
+        SELECT 
+            ROW_NUMBER() OVER (ORDER BY dept_gpa DESC) as rank,
+            department_id,
+            dept_gpa
+        FROM department_gpas
+        ORDER BY dept_gpa DESC
+    """
+
+
+def fetch_departmental_rankings(conn: sqlite3.Connection) -> List[Tuple]:
+    """Departments ranked by GPA."""
+    return conn.execute(DEPARTMENTAL_RANKINGS_QUERY).fetchall()
+
+
+COURSE_PERFORMANCE_QUERY = """
+        SELECT 
+            se.course_prefix || ' ' || se.course_number as course,
+            se.semester,
+            se.year,
+            se.enrolled as total_enrollments,
+            COALESCE(ROUND(CAST(se.grade_points AS REAL) / NULLIF(se.graded, 0), 2), 'N/A') as avg_grade
+        FROM section_enrollment se
+        WHERE se.enrolled > 0
+        ORDER BY 
+            se.year DESC,
+            CASE se.semester
+                WHEN 'F' THEN 1
+                WHEN 'S' THEN 2
+                WHEN 'U' THEN 3
+            END,
+            course
+    """
+
+
+def fetch_course_performance(conn: sqlite3.Connection) -> List[Tuple]:
+    """Enrollments and average grade per course section."""
+    ensure_section_enrollment_table(conn)
+    return conn.execute(COURSE_PERFORMANCE_QUERY).fetchall()
+
+
+INSTRUCTOR_DEMOGRAPHICS_QUERY = """
+        WITH student_majors AS (
+            SELECT 
+                ic.instructor_id,
+                c.course_prefix || ' ' || c.course_number as course,
+                ic.semester,
+                ic.year_taught,
+                s.major,
+                COUNT(DISTINCT s.student_id) as student_count
+            FROM instructor_courses ic
+            JOIN student_courses sc ON ic.course_prefix = sc.course_prefix 
+                AND ic.course_number = sc.course_number
+                AND ic.semester = sc.semester
+                AND ic.year_taught = sc.year_taken
+            JOIN students s ON sc.student_id = s.student_id
+            JOIN courses c ON ic.course_prefix = c.course_prefix 
+                AND ic.course_number = c.course_number
+            WHERE ic.instructor_id IS NOT NULL
+            GROUP BY 
+                ic.instructor_id,
+                c.course_prefix,
+                c.course_number,
+                ic.semester,
+                ic.year_taught,
+                s.major
+        )
+        SELECT 
+            instructor_id,
+            course,
+            CASE semester
+                WHEN 'F' THEN 'Fall'
+                WHEN 'S' THEN 'Spring'
+                WHEN 'U' THEN 'Summer'
+            END || ' ' || year_taught as term,
+            GROUP_CONCAT(major || ': ' || student_count) as major_distribution
+        FROM student_majors
+        GROUP BY instructor_id, course, semester, year_taught
+        ORDER BY instructor_id, year_taught DESC, 
+            CASE semester
+                WHEN 'F' THEN 1
+                WHEN 'S' THEN 2
+                WHEN 'U' THEN 3
+            END DESC,
+            course
+    """
+
+
+def fetch_instructor_demographics(conn: sqlite3.Connection) -> List[Tuple]:
+    """Majors of the students in each instructor's sections."""
+    return conn.execute(INSTRUCTOR_DEMOGRAPHICS_QUERY).fetchall()
+
+
+STUDENT_RANKINGS_QUERY = """
+        WITH student_credits AS (
+            SELECT 
+                s.major,
+                s.student_id,
+                COALESCE(SUM(c.credits), 0) as total_credits
+            FROM students s
+            LEFT JOIN student_courses sc ON s.student_id = sc.student_id
+            LEFT JOIN courses c ON sc.course_prefix = c.course_prefix 
+                AND sc.course_number = c.course_number
+            GROUP BY s.major, s.student_id
+        ),
+        ranked_students AS (
+            SELECT 
+                major,
+                student_id,
+                total_credits,
+                ROW_NUMBER() OVER (
+                    PARTITION BY major 
+                    ORDER BY total_credits DESC, student_id
+                ) as rank_in_major
+            FROM student_credits
+        )
+        SELECT 
+            major,
+            student_id,
+            total_credits
+        FROM ranked_students
+        ORDER BY major, rank_in_major
+    """
+
+
+def fetch_student_rankings(conn: sqlite3.Connection) -> List[Tuple]:
+    """Students ranked by completed credits within each major."""
+    return conn.execute(STUDENT_RANKINGS_QUERY).fetchall()
+
+
+# Report queries by name, for callers that pick a report at runtime
+REPORTS = {
+    "academic_performance": fetch_academic_performance,
+    "departmental_rankings": fetch_departmental_rankings,
+    "course_performance": fetch_course_performance,
+    "instructor_demographics": fetch_instructor_demographics,
+    "student_rankings": fetch_student_rankings,
+}
+
+# Report SQL by name, for callers that stream a report instead of fetching it
+REPORT_QUERIES = {
+    "academic_performance": ACADEMIC_PERFORMANCE_QUERY,
+    "departmental_rankings": DEPARTMENTAL_RANKINGS_QUERY,
+    "course_performance": COURSE_PERFORMANCE_QUERY,
+    "instructor_demographics": INSTRUCTOR_DEMOGRAPHICS_QUERY,
+    "student_rankings": STUDENT_RANKINGS_QUERY,
+}
+
+# Every enrollment ever recorded, oldest term first; only ever streamed
+ENROLLMENT_HISTORY_QUERY = """
+        SELECT 
+            sc.student_id,
+            s.major,
+            sc.course_prefix || ' ' || sc.course_number as course,
+            c.credits,
+            CASE sc.semester
+                WHEN 'F' THEN 'Fall'
+                WHEN 'S' THEN 'Spring'
+                WHEN 'U' THEN 'Summer'
+            END as semester,
+            sc.year_taken as year,
+            sc.grade
+        FROM student_courses sc
+        LEFT JOIN students s ON sc.student_id = s.student_id
+        LEFT JOIN courses c ON sc.course_prefix = c.course_prefix 
+            AND sc.course_number = c.course_number
+        ORDER BY sc.year_taken, 
+            CASE sc.semester
+                WHEN 'S' THEN 1
+                WHEN 'U' THEN 2
+                WHEN 'F' THEN 3
+            END,
+            sc.student_id, course
+    """
+
+ENROLLMENT_HISTORY_HEADERS = ["Student ID", "Major", "Course", "Credits", "Semester", "Year", "Grade"]
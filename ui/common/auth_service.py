@@ -0,0 +1,218 @@
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, Any
+
+from PySide6.QtCore import QObject, Signal
+
+from data.hash_policy import DEFAULT_HASH_METHOD, hash_password, check_password, verify_and_upgrade
+from ui.common.db import get_db_path
+
+# Failed attempts allowed in a burst per username, and seconds to earn one back
+ATTEMPT_BURST = 5
+ATTEMPT_REFILL_SECONDS = 30.0
+
+# Buckets kept in memory before full (idle) ones are dropped
+MAX_TRACKED_USERNAMES = 10000
+
+_IDENTITY_SELECT = """
+    SELECT u.id, u.username, u.password_hash, u.role,
+           s.student_id, i.instructor_id, a.advisor_id, st.staff_id,
+           COALESCE(st.department_id, i.department_id,
+                    (SELECT group_concat(DISTINCT ad.department_id) FROM advisor_departments ad
+                     WHERE ad.advisor_id = a.advisor_id),
+                    (SELECT group_concat(DISTINCT dm.department_id) FROM department_majors dm
+                     WHERE dm.major_name = s.major)),
+           {policy_method}
+    FROM users u
+    LEFT JOIN students s ON s.user_id = u.id
+    LEFT JOIN instructors i ON i.user_id = u.id
+    LEFT JOIN advisors a ON a.user_id = u.id
+    LEFT JOIN staff st ON st.user_id = u.id
+    WHERE u.username = ?
+"""
+
+# The hash_policy table is created by create_tables() or set_hash_method();
+# until then every hash uses DEFAULT_HASH_METHOD
+_POLICY_METHOD = "(SELECT method FROM hash_policy WHERE id = 1)"
+
+
+class TokenBucket:
+    """
+    Per-key token buckets for attempt throttling.
+
+    Each key starts with `capacity` tokens and earns one back every
+    `refill_seconds`; an attempt is allowed only if it can take a token.
+    """
+
+    def __init__(self, capacity: int = ATTEMPT_BURST, refill_seconds: float = ATTEMPT_REFILL_SECONDS):
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self._buckets: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _tokens(self, key: str, now: float) -> float:
+        tokens, updated = self._buckets.get(key, (self.capacity, now))
+        return min(self.capacity, tokens + (now - updated) / self.refill_seconds)
+
+    def take(self, key: str, now: Optional[float] = None) -> bool:
+        """Take a token for a key, returning False if its bucket is empty."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens = self._tokens(key, now)
+            if tokens < 1:
+                return False
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > MAX_TRACKED_USERNAMES:
+                self._buckets = {k: v for k, v in self._buckets.items() if self._tokens(k, now) < self.capacity}
+            return True
+
+    def retry_after(self, key: str, now: Optional[float] = None) -> float:
+        """Return the seconds until the key can take a token again."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return max(0.0, (1 - self._tokens(key, now)) * self.refill_seconds)
+
+    def reset(self, key: str) -> None:
+        """Refill a key's bucket, e.g. after a successful login."""
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+class AuthService(QObject):
+    """
+    Verifies login credentials off the GUI thread.
+
+    The user, all role-specific IDs and the user's departments are
+    resolved with one query, and the password hash is checked on a
+    background thread so a slow hash (scrypt) does not freeze the
+    window; the result is delivered through the finished signal on the
+    GUI thread. Attempts are throttled per
+    username with a token bucket before any hashing is done, and hashes
+    made under an older hash policy are upgraded on successful login.
+    """
+
+    finished = Signal(object)
+
+    def __init__(self, db_path: Optional[str] = None, hash_method: Optional[str] = None,
+                 attempts: Optional[TokenBucket] = None, parent: Optional[QObject] = None):
+        """
+        Initialize the service.
+
+        Args:
+            db_path: Database path, defaults to the application database
+            hash_method: Werkzeug hash method and cost overriding the database's hash policy
+            attempts: Attempt throttle, defaults to a new TokenBucket
+            parent: Optional Qt parent
+        """
+        super().__init__(parent)
+        self.db_path = db_path or get_db_path()
+        self.hash_method = hash_method
+        self.attempts = attempts or TokenBucket()
+        self._dummy_hash = None
+        # Only set and cleared on the GUI thread; connected first, so it is clear when other slots run
+        self._busy = False
+        self.finished.connect(self._on_finished)
+
+    def lookup(self, username: str, conn: Optional[sqlite3.Connection] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return a user's identity, including the role-specific IDs.
+
+        Args:
+            username: Login name
+            conn: Connection to use, defaults to a new one
+
+        Returns:
+            Optional[Dict[str, Any]]: user_id, username, password_hash, role,
+            student_id, instructor_id, advisor_id, staff_id, departments
+            (of a staff member or instructor, advised by an advisor, or
+            offering a student's major) and the hash_method of the
+            current policy (DEFAULT_HASH_METHOD if there is none yet), or None
+        """
+        own_conn = conn is None
+        conn = conn or sqlite3.connect(self.db_path)
+        try:
+            try:
+                row = conn.execute(_IDENTITY_SELECT.format(policy_method=_POLICY_METHOD), (username,)).fetchone()
+            except sqlite3.OperationalError as e:
+                if "hash_policy" not in str(e):
+                    raise
+                row = conn.execute(_IDENTITY_SELECT.format(policy_method="NULL"), (username,)).fetchone()
+        finally:
+            if own_conn:
+                conn.close()
+        if row is None:
+            return None
+        keys = ("user_id", "username", "password_hash", "role",
+                "student_id", "instructor_id", "advisor_id", "staff_id", "departments", "hash_method")
+        identity = dict(zip(keys, row))
+        identity["departments"] = sorted(identity["departments"].split(",")) if identity["departments"] else []
+        identity["hash_method"] = self.hash_method or identity["hash_method"] or DEFAULT_HASH_METHOD
+        return identity
+
+    def authenticate(self, username: str, password: str) -> Dict[str, Any]:
+        """
+        Check credentials synchronously (call authenticate_async() from the GUI).
+
+        Args:
+            username: Login name
+            password: Password as typed
+
+        Returns:
+            Dict[str, Any]: 'ok'; on success 'login_id' (student_id for
+            students, otherwise the user ID as text), 'role' and 'identity';
+            on failure 'error' and, when throttled, 'retry_after' seconds
+        """
+        if not self.attempts.take(username):
+            retry_after = self.attempts.retry_after(username)
+            return {"ok": False, "error": f"Too many attempts. Try again in {int(retry_after) + 1} seconds.",
+                    "retry_after": retry_after}
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            identity = self.lookup(username, conn)
+            if identity is None:
+                # Hash anyway so unknown usernames take as long as wrong passwords
+                if self._dummy_hash is None:
+                    self._dummy_hash = hash_password("")
+                check_password(self._dummy_hash, password)
+                return {"ok": False, "error": "Invalid username or password"}
+            if not verify_and_upgrade(conn, identity["user_id"], identity["password_hash"],
+                                      password, identity["hash_method"]):
+                return {"ok": False, "error": "Invalid username or password"}
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return {"ok": False, "error": "Unable to reach the database"}
+        finally:
+            if conn:
+                conn.close()
+
+        self.attempts.reset(username)
+        identity.pop("password_hash")
+        login_id = identity["student_id"] or str(identity["user_id"])
+        return {"ok": True, "login_id": login_id, "role": identity["role"], "identity": identity}
+
+    def authenticate_async(self, username: str, password: str) -> bool:
+        """
+        Check credentials on a background thread and emit finished with
+        the result of authenticate().
+
+        Returns:
+            bool: False if a check is already running
+        """
+        if self._busy:
+            return False
+        self._busy = True
+        threading.Thread(target=self._background_authenticate, args=(username, password), daemon=True).start()
+        return True
+
+    def _background_authenticate(self, username: str, password: str) -> None:
+        try:
+            result = self.authenticate(username, password)
+        except Exception as e:
+            print(f"Error while checking credentials: {e}")
+            result = {"ok": False, "error": "Unable to check credentials"}
+        self.finished.emit(result)
+
+    def _on_finished(self, result: Dict[str, Any]) -> None:
+        self._busy = False
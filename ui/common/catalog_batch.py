@@ -0,0 +1,316 @@
+import csv
+import sqlite3
+from typing import Optional, Dict, Any, List, Tuple
+
+from ui.common.course_identity import propagate_renames
+from ui.common.instructor_load import refresh_instructor_loads
+from ui.common.section_enrollment import ensure_section_enrollment_table
+
+CourseKey = Tuple[str, str]
+
+ACTIONS = ('add', 'modify', 'remove')
+MIN_CREDITS = 1
+MAX_CREDITS = 4
+
+# Accepted header names of a catalog import file (compared lower-case, without spaces or underscores)
+FILE_COLUMNS = {
+    'action': 'action',
+    'courseprefix': 'prefix',
+    'prefix': 'prefix',
+    'coursenumber': 'number',
+    'number': 'number',
+    'credits': 'credits',
+    'newprefix': 'new_prefix',
+    'newnumber': 'new_number',
+}
+
+
+def read_catalog_file(path: str) -> List[Dict[str, Any]]:
+    """
+    Read catalog changes from a CSV file.
+
+    Columns are CoursePrefix, CourseNumber, Credits and, optionally,
+    Action (add, modify or remove; defaults to add), NewPrefix and
+    NewNumber (to rename a course in a modify row).
+
+    Args:
+        path: Path of the file to import
+
+    Returns:
+        List[Dict[str, Any]]: Changes in file order, each with its file 'row'
+
+    Raises:
+        ValueError: If the file is empty or lacks the prefix or number column
+    """
+    with open(path, newline='', encoding='utf-8-sig') as catalog_file:
+        rows = list(csv.reader(catalog_file))
+    if not rows:
+        raise ValueError("The catalog file is empty")
+
+    columns = [FILE_COLUMNS.get(name.strip().lower().replace(' ', '').replace('_', ''))
+               for name in rows[0]]
+    if 'prefix' not in columns or 'number' not in columns:
+        raise ValueError("The catalog file must have CoursePrefix and CourseNumber columns")
+
+    changes = []
+    for line_number, row in enumerate(rows[1:], start=2):
+        values = {column: value.strip() for column, value in zip(columns, row) if column}
+        if not any(values.values()):
+            continue
+        changes.append({
+            "row": line_number,
+            "action": (values.get('action') or 'add').lower(),
+            "prefix": values.get('prefix', '').upper(),
+            "number": values.get('number', ''),
+            "credits": values.get('credits') or None,
+            "new_prefix": (values.get('new_prefix') or '').upper() or None,
+            "new_number": values.get('new_number') or None,
+        })
+    return changes
+
+
+def _violation(change: Dict[str, Any], rule: str, message: str) -> Dict[str, Any]:
+    label = f"Row {change['row']}: " if change.get("row") else ""
+    return {"rule": rule, "message": f"{label}{message}", "course": f"{change['prefix']} {change['number']}"}
+
+
+def diff_catalog(original: List[Tuple[str, str, Optional[int]]],
+                 edited: List[Tuple[Optional[CourseKey], str, str, Optional[int]]]) -> List[Dict[str, Any]]:
+    """
+    Turn an edited copy of the catalog into a change set.
+
+    Args:
+        original: (prefix, number, credits) rows as loaded
+        edited: (original key or None for a new row, prefix, number, credits) rows
+            after editing; original rows missing from it are removed
+
+    Returns:
+        List[Dict[str, Any]]: Changes for validate() and apply()
+    """
+    credits_by_key = {(prefix, number): credits for prefix, number, credits in original}
+    kept = set()
+    changes = []
+    for row, (key, prefix, number, credits) in enumerate(edited, start=1):
+        if key is None:
+            changes.append({"row": row, "action": "add", "prefix": prefix, "number": number,
+                            "credits": credits})
+            continue
+        kept.add(key)
+        renamed = (prefix, number) != key
+        credits_changed = str(credits) != str(credits_by_key.get(key))
+        if renamed or credits_changed:
+            changes.append({"row": row, "action": "modify", "prefix": key[0], "number": key[1],
+                            "credits": credits if credits_changed else None,
+                            "new_prefix": prefix, "new_number": number})
+    for prefix, number, _ in original:
+        if (prefix, number) not in kept:
+            changes.append({"action": "remove", "prefix": prefix, "number": number})
+    return changes
+
+
+class CatalogBatch:
+    """
+    Validates and applies a set of catalog changes for one department.
+
+    Validation loads prefix ownership, the affected catalog rows and
+    their enrollment counts with one query each, then checks the whole
+    change set in memory. apply() writes every change in one transaction:
+    inserts and credit updates use executemany, and renames go through
+    propagate_renames(), which updates each referencing table with a
+    single indexed UPDATE.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, department_id: str):
+        """
+        Initialize the batch for a department.
+
+        Args:
+            conn: Open connection to the academic management database
+            department_id: Department whose catalog is being edited
+        """
+        self.conn = conn
+        self.department_id = department_id
+
+    def _normalize(self, change: Dict[str, Any]) -> Dict[str, Any]:
+        change = dict(change)
+        change["action"] = str(change.get("action") or "add").lower()
+        change["prefix"] = str(change.get("prefix") or "").strip().upper()
+        change["number"] = str(change.get("number") or "").strip()
+        credits = change.get("credits")
+        if credits is not None and str(credits).strip() != "":
+            try:
+                change["credits"] = int(str(credits).strip())
+            except ValueError:
+                change["credits"] = str(credits).strip()
+        else:
+            change["credits"] = None
+        new_prefix = str(change.get("new_prefix") or "").strip().upper() or change["prefix"]
+        new_number = str(change.get("new_number") or "").strip() or change["number"]
+        change["new_prefix"], change["new_number"] = new_prefix, new_number
+        return change
+
+    def validate(self, changes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Validate a change set without writing anything.
+
+        Args:
+            changes: Dicts with 'action', 'prefix', 'number' and, depending
+                on the action, 'credits', 'new_prefix' and 'new_number'
+
+        Returns:
+            List[Dict[str, Any]]: Rule violations, empty when the change set is valid
+        """
+        changes = [self._normalize(change) for change in changes]
+        violations = []
+        cursor = self.conn.cursor()
+
+        cursor.execute("SELECT course_prefix, department_id FROM department_course_prefixes")
+        prefix_owners: Dict[str, str] = dict(cursor.fetchall())
+
+        # Catalog rows and enrollment counts of every key the batch mentions
+        keys = {(c["prefix"], c["number"]) for c in changes} | {(c["new_prefix"], c["new_number"]) for c in changes}
+        existing: Dict[CourseKey, int] = {}
+        enrolled: Dict[CourseKey, int] = {}
+        if keys:
+            ensure_section_enrollment_table(self.conn)
+            key_filter = ", ".join("(?, ?)" for _ in keys)
+            params = [value for key in keys for value in key]
+            cursor.execute(f"""
+                SELECT course_prefix, course_number, credits FROM courses
+                WHERE (course_prefix, course_number) IN (VALUES {key_filter})
+            """, params)
+            existing = {(prefix, number): credits for prefix, number, credits in cursor.fetchall()}
+            cursor.execute(f"""
+                SELECT course_prefix, course_number, SUM(enrolled) FROM section_enrollment
+                WHERE (course_prefix, course_number) IN (VALUES {key_filter})
+                GROUP BY course_prefix, course_number
+            """, params)
+            enrolled = {(prefix, number): total for prefix, number, total in cursor.fetchall()}
+
+        touched = set()
+        created = set()
+        for change in changes:
+            key = (change["prefix"], change["number"])
+            target = (change["new_prefix"], change["new_number"])
+            action = change["action"]
+
+            if action not in ACTIONS:
+                violations.append(_violation(change, "invalid_action",
+                                             f"Unknown action '{action}' (use add, modify or remove)."))
+                continue
+            for prefix, number in {key, target}:
+                if len(prefix) != 3 or not prefix.isalpha():
+                    violations.append(_violation(change, "invalid_prefix",
+                                                 f"Course prefix '{prefix}' must be exactly 3 letters."))
+                if not number.isdigit():
+                    violations.append(_violation(change, "invalid_number",
+                                                 f"Course number '{number}' must be numeric."))
+            if action == "add" or change["credits"] is not None:
+                credits = change["credits"]
+                if not isinstance(credits, int) or not MIN_CREDITS <= credits <= MAX_CREDITS:
+                    violations.append(_violation(change, "invalid_credits",
+                                                 f"Credits must be a number between {MIN_CREDITS} and {MAX_CREDITS}."))
+
+            for prefix in {key[0], target[0]}:
+                owner = prefix_owners.get(prefix)
+                if owner and owner != self.department_id:
+                    violations.append(_violation(change, "prefix_owner",
+                                                 f"Prefix {prefix} belongs to department {owner}."))
+
+            if key in touched:
+                violations.append(_violation(change, "duplicate_change",
+                                             f"{key[0]} {key[1]} appears more than once in the batch."))
+            touched.add(key)
+
+            if action == "add":
+                if key in existing or key in created:
+                    violations.append(_violation(change, "duplicate_course",
+                                                 f"{key[0]} {key[1]} already exists."))
+                created.add(key)
+                continue
+
+            if key not in existing:
+                violations.append(_violation(change, "unknown_course", f"{key[0]} {key[1]} does not exist."))
+                continue
+            if action == "remove":
+                if enrolled.get(key, 0) > 0:
+                    violations.append(_violation(change, "has_enrollments",
+                                                 f"{key[0]} {key[1]} has existing enrollments."))
+            elif target != key:
+                if target in existing or target in created:
+                    violations.append(_violation(change, "duplicate_course",
+                                                 f"Cannot rename to {target[0]} {target[1]}: it already exists."))
+                created.add(target)
+        return violations
+
+    def apply(self, changes: List[Dict[str, Any]]) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+        """
+        Validate and apply a change set in one transaction.
+
+        Args:
+            changes: Changes as accepted by validate()
+
+        Returns:
+            Tuple[Dict[str, int], List[Dict[str, Any]]]: Counts of added,
+            modified, renamed and removed courses, and the violations (in
+            which case nothing was written)
+
+        Raises:
+            sqlite3.Error: If a write fails; nothing is written in that case
+        """
+        changes = [self._normalize(change) for change in changes]
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("BEGIN TRANSACTION")
+            violations = self.validate(changes)
+            if violations:
+                self.conn.rollback()
+                return {}, violations
+
+            adds = [c for c in changes if c["action"] == "add"]
+            modifies = [c for c in changes if c["action"] == "modify"]
+            removes = [c for c in changes if c["action"] == "remove"]
+            renames = [c for c in modifies if (c["prefix"], c["number"]) != (c["new_prefix"], c["new_number"])]
+
+            # Prefixes not owned by any department yet become this department's
+            cursor.executemany("""
+                INSERT INTO department_course_prefixes (department_id, course_prefix, is_primary, added_date)
+                SELECT ?, ?, 0, datetime('now')
+                WHERE NOT EXISTS (SELECT 1 FROM department_course_prefixes WHERE course_prefix = ?)
+            """, [(self.department_id, prefix, prefix)
+                  for prefix in sorted({c["prefix"] for c in adds} | {c["new_prefix"] for c in renames})])
+
+            cursor.executemany("""
+                INSERT INTO courses (course_prefix, course_number, credits) VALUES (?, ?, ?)
+            """, [(c["prefix"], c["number"], c["credits"]) for c in adds])
+
+            # Renames cascade to every table that refers to the course
+            if renames:
+                propagate_renames(self.conn, {(c["prefix"], c["number"]): (c["new_prefix"], c["new_number"])
+                                              for c in renames})
+            cursor.executemany("""
+                UPDATE courses SET credits = ? WHERE course_prefix = ? AND course_number = ?
+            """, [(c["credits"], c["new_prefix"], c["new_number"]) for c in modifies if c["credits"] is not None])
+
+            if removes:
+                cursor.executemany("DELETE FROM courses WHERE course_prefix = ? AND course_number = ?",
+                                   [(c["prefix"], c["number"]) for c in removes])
+
+            # Credit changes and removals change the loads of every term the courses are taught in
+            load_keys = [(c["new_prefix"], c["new_number"]) for c in modifies if c["credits"] is not None]
+            load_keys += [(c["prefix"], c["number"]) for c in removes]
+            if load_keys:
+                key_filter = ", ".join("(?, ?)" for _ in load_keys)
+                cursor.execute(f"""
+                    SELECT DISTINCT semester, year_taught FROM instructor_courses
+                    WHERE semester IS NOT NULL AND (course_prefix, course_number) IN (VALUES {key_filter})
+                """, [value for key in load_keys for value in key])
+                refresh_instructor_loads(self.conn, cursor.fetchall())
+
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+
+        counts = {"added": len(adds), "modified": len(modifies), "renamed": len(renames), "removed": len(removes)}
+        return counts, []
@@ -0,0 +1,197 @@
+import sqlite3
+from typing import Dict, List, Tuple
+
+CourseKey = Tuple[str, str]
+CourseReference = Tuple[str, str, str]
+
+# Tables that identify a course by its prefix/number text columns without
+# declaring a FOREIGN KEY to courses; tables that do declare one are found
+# through PRAGMA foreign_key_list.
+KNOWN_COURSE_REFERENCES: List[CourseReference] = [
+    ("instructor_courses", "course_prefix", "course_number"),
+    ("student_courses", "course_prefix", "course_number"),
+    ("section_enrollment", "course_prefix", "course_number"),
+    ("section_meetings", "course_prefix", "course_number"),
+    ("course_prerequisites", "course_prefix", "course_number"),
+    ("course_prerequisites", "prereq_prefix", "prereq_number"),
+    ("requirement_courses", "course_prefix", "course_number"),
+]
+
+
+def course_references(conn: sqlite3.Connection) -> List[CourseReference]:
+    """
+    Return every (table, prefix column, number column) that refers to a course.
+
+    Known references are included when their table exists; any other
+    table declaring FOREIGN KEY (prefix, number) REFERENCES
+    courses (course_prefix, course_number) is discovered from its schema.
+
+    Args:
+        conn: Open connection to the academic management database
+
+    Returns:
+        List[CourseReference]: References, excluding the courses table itself
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+    tables = [row[0] for row in cursor.fetchall()]
+
+    references = [reference for reference in KNOWN_COURSE_REFERENCES if reference[0] in tables]
+    for table in tables:
+        if table == "courses":
+            continue
+        foreign_keys: Dict[int, Dict[str, str]] = {}
+        for fk_id, _, parent, from_column, to_column, *_ in conn.execute(f'PRAGMA foreign_key_list("{table}")'):
+            if parent == "courses":
+                foreign_keys.setdefault(fk_id, {})[to_column] = from_column
+        for columns in foreign_keys.values():
+            if set(columns) == {"course_prefix", "course_number"}:
+                reference = (table, columns["course_prefix"], columns["course_number"])
+                if reference not in references:
+                    references.append(reference)
+    return references
+
+
+def ensure_reference_indexes(conn: sqlite3.Connection, references: List[CourseReference]) -> None:
+    """
+    Make sure every reference can be updated through an index.
+
+    An index is only created when no existing index of the table starts
+    with the reference's prefix and number columns.
+    """
+    in_transaction = conn.in_transaction
+    for table, prefix_column, number_column in references:
+        indexed = False
+        for _, index_name, *_ in conn.execute(f'PRAGMA index_list("{table}")'):
+            columns = [row[2] for row in conn.execute(f'PRAGMA index_info("{index_name}")')]
+            if columns[:2] == [prefix_column, number_column]:
+                indexed = True
+                break
+        if not indexed:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_{prefix_column}_{number_column}" '
+                         f'ON "{table}" ("{prefix_column}", "{number_column}")')
+    if not in_transaction:
+        conn.commit()
+
+
+def _stage_renames(conn: sqlite3.Connection, renames: Dict[CourseKey, CourseKey]) -> None:
+    conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS course_renames (
+            old_prefix TEXT, old_number TEXT, new_prefix TEXT, new_number TEXT,
+            PRIMARY KEY (old_prefix, old_number)
+        )
+    """)
+    conn.execute("DELETE FROM temp.course_renames")
+    conn.executemany("INSERT INTO temp.course_renames VALUES (?, ?, ?, ?)",
+                     [old + new for old, new in renames.items() if old != new])
+
+
+def _reference_label(table: str, prefix_column: str) -> str:
+    return table if prefix_column == "course_prefix" else f"{table}.{prefix_column}"
+
+
+def rename_impact(conn: sqlite3.Connection, renames: Dict[CourseKey, CourseKey]) -> Dict[str, int]:
+    """
+    Count the rows a set of renames would change (dry run). The schema is
+    left untouched; missing reference indexes are only created by an
+    actual rename.
+
+    Args:
+        conn: Open connection to the academic management database
+        renames: New course keys by old course key
+
+    Returns:
+        Dict[str, int]: Affected rows per table (including courses)
+    """
+    in_transaction = conn.in_transaction
+    references = [("courses", "course_prefix", "course_number")] + course_references(conn)
+    _stage_renames(conn, renames)
+    impact = {}
+    for table, prefix_column, number_column in references:
+        count = conn.execute(f"""
+            SELECT COUNT(*) FROM "{table}" t
+            JOIN temp.course_renames r ON t."{prefix_column}" = r.old_prefix AND t."{number_column}" = r.old_number
+        """).fetchone()[0]
+        impact[_reference_label(table, prefix_column)] = count
+    if not in_transaction:
+        # Staging the renames opened a transaction; end it so no read lock is held
+        conn.commit()
+    return impact
+
+
+def propagate_renames(conn: sqlite3.Connection, renames: Dict[CourseKey, CourseKey]) -> Dict[str, int]:
+    """
+    Rename courses in the catalog and in every referencing table.
+
+    Renames are staged in a temporary table and each table is updated
+    with a single indexed UPDATE ... FROM, so the cost is proportional to
+    the affected rows. Does not commit, so it can share the caller's
+    transaction.
+
+    Args:
+        conn: Open connection to the academic management database
+        renames: New course keys by old course key
+
+    Returns:
+        Dict[str, int]: Updated rows per table (including courses)
+    """
+    references = [("courses", "course_prefix", "course_number")] + course_references(conn)
+    ensure_reference_indexes(conn, references)
+    _stage_renames(conn, renames)
+    updated = {}
+    for table, prefix_column, number_column in references:
+        cursor = conn.execute(f"""
+            UPDATE "{table}"
+            SET "{prefix_column}" = r.new_prefix, "{number_column}" = r.new_number
+            FROM temp.course_renames r
+            WHERE "{table}"."{prefix_column}" = r.old_prefix AND "{table}"."{number_column}" = r.old_number
+        """)
+        updated[_reference_label(table, prefix_column)] = cursor.rowcount
+    return updated
+
+
+def rename_course(conn: sqlite3.Connection, old: CourseKey, new: CourseKey,
+                  dry_run: bool = False, commit: bool = True) -> Dict[str, int]:
+    """
+    Change a course's prefix and/or number everywhere in one transaction.
+
+    Args:
+        conn: Open connection to the academic management database
+        old: Current (prefix, number) of the course
+        new: New (prefix, number) of the course
+        dry_run: Only count the affected rows
+        commit: Run in a transaction of its own and commit it; when False
+            the updates join the caller's transaction, which the caller
+            commits or rolls back together with its own changes
+
+    Returns:
+        Dict[str, int]: Affected rows per table
+
+    Raises:
+        ValueError: If the course does not exist or the new key is taken
+        sqlite3.Error: If an update fails; nothing is written in that case
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT course_prefix, course_number FROM courses
+        WHERE (course_prefix = ? AND course_number = ?) OR (course_prefix = ? AND course_number = ?)
+    """, old + new)
+    found = set(cursor.fetchall())
+    if old not in found:
+        raise ValueError(f"Course {old[0]} {old[1]} does not exist")
+    if new != old and new in found:
+        raise ValueError(f"Course {new[0]} {new[1]} already exists")
+
+    if dry_run:
+        return rename_impact(conn, {old: new})
+    if not commit:
+        return propagate_renames(conn, {old: new})
+
+    try:
+        cursor.execute("BEGIN TRANSACTION")
+        updated = propagate_renames(conn, {old: new})
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return updated
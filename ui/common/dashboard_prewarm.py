@@ -0,0 +1,139 @@
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, List
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWidgets import QTableWidget, QTableWidgetItem
+
+from ui.common.academic_service import fetch_student_record, fetch_advisor_data, fetch_department_catalog
+from ui.common.admin_reports import (REPORTS, fetch_logs, fetch_academic_performance,
+                                     fetch_departmental_rankings, fetch_course_performance,
+                                     fetch_instructor_demographics, fetch_student_rankings)
+from ui.common.db import get_db_path
+from ui.common.instructor_cache import prewarm_instructor_sections
+from ui.common.reporting_snapshot import connect_reporting
+
+# Fetches of one dashboard running at the same time
+PREWARM_WORKERS = 3
+
+LOADING_TEXT = "Loading..."
+
+
+# What each role's dashboard needs before it can show real data, by name.
+# Every fetch gets its own connection and the session.
+PREWARM_FETCHES: Dict[str, Dict[str, Callable[[sqlite3.Connection, Any], Any]]] = {
+    "student": {
+        "student_record": lambda conn, session: fetch_student_record(conn, session.role_id),
+    },
+    "instructor": {
+        "sections": lambda conn, session: prewarm_instructor_sections(conn, session.role_id),
+    },
+    "advisor": {
+        "advisor_data": lambda conn, session: fetch_advisor_data(conn, session.role_id),
+    },
+    "staff": {
+        "catalog": lambda conn, session: fetch_department_catalog(conn, session.department_id),
+    },
+    "admin": {
+        "logs": lambda conn, session: fetch_logs(conn),
+        "academic_performance": lambda conn, session: fetch_academic_performance(conn),
+        "departmental_rankings": lambda conn, session: fetch_departmental_rankings(conn),
+        "course_performance": lambda conn, session: fetch_course_performance(conn),
+        "instructor_demographics": lambda conn, session: fetch_instructor_demographics(conn),
+        "student_rankings": lambda conn, session: fetch_student_rankings(conn),
+    },
+}
+
+
+def show_loading(table: QTableWidget) -> None:
+    """
+    Put a table in its skeleton state until its data arrives: one row
+    reading LOADING_TEXT, with empty items in the other columns so code
+    reading the row's cells still finds items.
+    """
+    if table.columnCount() == 0:
+        table.setColumnCount(1)
+    table.setRowCount(1)
+    table.setItem(0, 0, QTableWidgetItem(LOADING_TEXT))
+    for col in range(1, table.columnCount()):
+        table.setItem(0, col, QTableWidgetItem(""))
+
+
+class DashboardPrewarm(QObject):
+    """
+    Fetches a dashboard's initial data on worker threads.
+
+    Started as soon as credentials are verified, so the queries run while
+    the dashboard module is imported and its widgets are built. The
+    dashboard shows skeleton states and registers a callback per fetch
+    with on_ready(); callbacks run on the GUI thread as results arrive.
+    A fetch that fails delivers None, and the dashboard's loader then
+    queries (and reports the error) itself.
+    """
+
+    _arrived = Signal(str)
+
+    def __init__(self, session, db_path: Optional[str] = None, parent: Optional[QObject] = None):
+        """
+        Initialize the pipeline for a session.
+
+        Args:
+            session: UserSession of the user who just logged in
+            db_path: Database path, defaults to the application database
+            parent: Optional Qt parent
+        """
+        super().__init__(parent)
+        self.session = session
+        self.db_path = db_path or get_db_path()
+        self.fetches = PREWARM_FETCHES.get(session.role, {})
+        self._results: Dict[str, Any] = {}
+        self._callbacks: Dict[str, List[Callable[[Any], None]]] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._arrived.connect(self._deliver)
+
+    def start(self) -> None:
+        """Start every fetch of the session's role."""
+        if self._executor is not None or not self.fetches:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=PREWARM_WORKERS, thread_name_prefix="prewarm")
+        for name, fetch in self.fetches.items():
+            self._executor.submit(self._run, name, fetch)
+        # Lets the workers exit once the queue is drained, without waiting here
+        self._executor.shutdown(wait=False)
+
+    def _run(self, name: str, fetch: Callable[[sqlite3.Connection, Any], Any]) -> None:
+        conn = None
+        try:
+            # Reports read the reporting snapshot when there is a fresh one
+            conn = connect_reporting(self.db_path) if name in REPORTS else sqlite3.connect(self.db_path)
+            result = fetch(conn, self.session)
+        except Exception as e:
+            print(f"Prewarm of {name} failed: {e}")
+            result = None
+        finally:
+            if conn:
+                conn.close()
+        with self._lock:
+            self._results[name] = result
+        self._arrived.emit(name)
+
+    def on_ready(self, name: str, callback: Callable[[Any], None]) -> None:
+        """
+        Call callback with a fetch's result on the GUI thread once it has
+        arrived (on the next event loop pass if it already has).
+        """
+        with self._lock:
+            arrived = name in self._results
+            if not arrived:
+                self._callbacks.setdefault(name, []).append(callback)
+        if arrived:
+            QTimer.singleShot(0, lambda: callback(self._results[name]))
+
+    def _deliver(self, name: str) -> None:
+        with self._lock:
+            callbacks = self._callbacks.pop(name, [])
+            result = self._results[name]
+        for callback in callbacks:
+            callback(result)
@@ -0,0 +1,7 @@
+import os
+
+
+def get_db_path() -> str:
+    """Return the absolute path of the academic management database."""
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        'data', 'academic_management.db')
@@ -0,0 +1,375 @@
+import sqlite3
+import sys
+from datetime import datetime
+from multiprocessing import Pool
+from typing import Optional, Dict, Any, List, Tuple
+
+from ui.common.db import get_db_path
+from ui.common.prerequisite_graph import PASSING_GRADES, ensure_prerequisites_table
+
+
+GRADE_POINTS = {'A': 4, 'B': 3, 'C': 2, 'D': 1, 'F': 0}
+
+# Tables whose changes make compiled requirement trees stale; like the
+# catalog tables they bump catalog_version
+REQUIREMENT_TABLES = ('requirement_groups', 'requirement_courses', 'department_majors')
+
+
+class RequirementType:
+    """Kinds of requirement groups a major can define"""
+    CORE = "core"          # every listed course must be passed
+    ELECTIVE = "elective"  # min_credits from the listed courses/prefixes
+    CREDITS = "credits"    # min_credits from any passed course
+
+
+def ensure_requirement_tables(conn: sqlite3.Connection) -> None:
+    """
+    Create the degree requirement and audit result tables if needed,
+    with triggers bumping catalog_version when requirements change.
+
+    Args:
+        conn: Open connection to the academic management database
+    """
+    in_transaction = conn.in_transaction
+    cursor = conn.cursor()
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS requirement_groups (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        major_name TEXT NOT NULL,
+        group_name TEXT NOT NULL,
+        group_type TEXT CHECK (group_type IN ('core', 'elective', 'credits')) NOT NULL,
+        min_credits INTEGER DEFAULT 0,
+        sort_order INTEGER DEFAULT 0,
+        FOREIGN KEY (major_name) REFERENCES majors (major_name)
+    )
+    ''')
+    # A NULL course_number matches every course with the given prefix
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS requirement_courses (
+        group_id INTEGER NOT NULL,
+        course_prefix TEXT NOT NULL,
+        course_number TEXT,
+        FOREIGN KEY (group_id) REFERENCES requirement_groups (id)
+    )
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS degree_audits (
+        student_id TEXT PRIMARY KEY,
+        audited_at DATETIME NOT NULL,
+        major TEXT,
+        credits_earned INTEGER,
+        credits_required INTEGER,
+        percent_complete REAL,
+        is_complete INTEGER,
+        gpa REAL,
+        FOREIGN KEY (student_id) REFERENCES students (student_id)
+    )
+    ''')
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' "
+                   "AND name = 'requirement_groups_insert_catalog_version'")
+    if cursor.fetchone() is None:
+        ensure_prerequisites_table(conn)
+        for table in REQUIREMENT_TABLES:
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_catalog_version
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+                END
+                ''')
+    if not in_transaction:
+        conn.commit()
+
+
+class RequirementGroup:
+    """A compiled requirement group of a major"""
+
+    def __init__(self, name: str, group_type: str, min_credits: int = 0):
+        self.name = name
+        self.group_type = group_type
+        self.min_credits = min_credits or 0
+        self.courses = set()
+        self.prefixes = set()
+
+    def matches(self, course: Tuple[str, str]) -> bool:
+        """Return True if a (prefix, number) course counts toward this group."""
+        if self.group_type == RequirementType.CREDITS:
+            return True
+        return course in self.courses or course[0] in self.prefixes
+
+
+class DegreeAuditor:
+    """
+    Evaluates students' histories against the requirement groups of
+    their major.
+
+    Requirement trees are compiled once per major and cached on the
+    auditor until catalog_version moves, so auditing many students of the
+    same major only costs one history query per student.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        Initialize the auditor.
+
+        Args:
+            conn: Open connection to the academic management database
+        """
+        self.conn = conn
+        self._compiled: Dict[str, List[RequirementGroup]] = {}
+        self._compiled_version: Optional[int] = None
+        ensure_requirement_tables(conn)
+
+    def compile_major(self, major: str) -> List[RequirementGroup]:
+        """
+        Return the compiled requirement tree for a major.
+
+        Majors without configured groups fall back to a single total
+        credit requirement taken from department_majors.hours_req.
+
+        Args:
+            major: Major name as stored on the student record
+
+        Returns:
+            List[RequirementGroup]: Groups in evaluation order
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT version FROM catalog_version WHERE id = 1")
+        version = cursor.fetchone()[0]
+        if version != self._compiled_version:
+            self._compiled = {}
+            self._compiled_version = version
+        if major in self._compiled:
+            return self._compiled[major]
+
+        cursor.execute("""
+            SELECT g.id, g.group_name, g.group_type, g.min_credits,
+                   rc.course_prefix, rc.course_number
+            FROM requirement_groups g
+            LEFT JOIN requirement_courses rc ON rc.group_id = g.id
+            WHERE g.major_name = ?
+            ORDER BY g.sort_order, g.id
+        """, (major,))
+
+        groups: Dict[int, RequirementGroup] = {}
+        for group_id, name, group_type, min_credits, prefix, number in cursor.fetchall():
+            group = groups.get(group_id)
+            if group is None:
+                group = groups[group_id] = RequirementGroup(name, group_type, min_credits)
+            if prefix and number:
+                group.courses.add((prefix, number))
+            elif prefix:
+                group.prefixes.add(prefix)
+
+        compiled = list(groups.values())
+        if not any(group.group_type == RequirementType.CREDITS for group in compiled):
+            cursor.execute("""
+                SELECT MAX(hours_req) FROM department_majors WHERE major_name = ?
+            """, (major,))
+            hours_req = cursor.fetchone()[0] or 0
+            compiled.append(RequirementGroup("Total Credits", RequirementType.CREDITS, hours_req))
+
+        self._compiled[major] = compiled
+        return compiled
+
+    def audit_student(self, student_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Audit one student against their major's requirements.
+
+        Args:
+            student_id: The student to audit
+
+        Returns:
+            Optional[Dict[str, Any]]: Audit result, or None if the student does not exist
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT major FROM students WHERE student_id = ?", (student_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        major = row[0]
+
+        cursor.execute("""
+            SELECT sc.course_prefix, sc.course_number, COALESCE(c.credits, 0), sc.grade
+            FROM student_courses sc
+            LEFT JOIN courses c ON sc.course_prefix = c.course_prefix
+                AND sc.course_number = c.course_number
+            WHERE sc.student_id = ?
+        """, (student_id,))
+
+        passed: Dict[Tuple[str, str], int] = {}
+        in_progress_credits = 0
+        graded_points = 0
+        graded_credits = 0
+        for prefix, number, credits, grade in cursor.fetchall():
+            if grade in PASSING_GRADES:
+                passed[(prefix, number)] = credits
+            elif not grade:
+                in_progress_credits += credits
+            if grade in GRADE_POINTS:
+                graded_points += GRADE_POINTS[grade] * credits
+                graded_credits += credits
+
+        audit = self.evaluate(student_id, major, passed, in_progress_credits)
+        audit["gpa"] = graded_points / graded_credits if graded_credits > 0 else None
+        return audit
+
+    def evaluate(self, student_id: str, major: str, passed: Dict[Tuple[str, str], int],
+                 in_progress_credits: int = 0) -> Dict[str, Any]:
+        """
+        Evaluate a student's passed courses against a major's tree.
+
+        Core groups claim their courses first, so a course only counts
+        toward one core or elective group; credit groups count everything.
+
+        Args:
+            student_id: The student being audited
+            major: The student's major
+            passed: Passed courses mapped to their credits
+            in_progress_credits: Credits currently enrolled without a grade
+
+        Returns:
+            Dict[str, Any]: Per-group results and overall progress
+        """
+        groups = self.compile_major(major)
+        claimed = set()
+        results = []
+        total_credits = sum(passed.values())
+
+        ordered = sorted(groups, key=lambda g: (g.group_type != RequirementType.CORE,
+                                                g.group_type == RequirementType.CREDITS))
+        for group in ordered:
+            if group.group_type == RequirementType.CORE:
+                done = sorted(course for course in group.courses if course in passed)
+                missing = sorted(group.courses - set(done))
+                claimed.update(done)
+                results.append({
+                    "name": group.name,
+                    "type": group.group_type,
+                    "required": len(group.courses),
+                    "earned": len(done),
+                    "satisfied": not missing,
+                    "missing": [f"{prefix} {number}" for prefix, number in missing],
+                })
+            elif group.group_type == RequirementType.ELECTIVE:
+                earned = 0
+                for course, credits in sorted(passed.items()):
+                    if course not in claimed and group.matches(course) and earned < group.min_credits:
+                        claimed.add(course)
+                        earned += credits
+                results.append({
+                    "name": group.name,
+                    "type": group.group_type,
+                    "required": group.min_credits,
+                    "earned": earned,
+                    "satisfied": earned >= group.min_credits,
+                    "missing": [],
+                })
+            else:
+                results.append({
+                    "name": group.name,
+                    "type": group.group_type,
+                    "required": group.min_credits,
+                    "earned": total_credits,
+                    "satisfied": total_credits >= group.min_credits,
+                    "missing": [],
+                })
+
+        credits_required = max((g.min_credits for g in groups if g.group_type == RequirementType.CREDITS),
+                               default=0)
+        percent = min(100.0, total_credits / credits_required * 100) if credits_required else 0.0
+        return {
+            "student_id": student_id,
+            "major": major,
+            "groups": results,
+            "credits_earned": total_credits,
+            "credits_in_progress": in_progress_credits,
+            "credits_required": credits_required,
+            "percent_complete": percent,
+            "complete": all(result["satisfied"] for result in results),
+        }
+
+
+def store_audits(conn: sqlite3.Connection, audits: List[Dict[str, Any]]) -> None:
+    """
+    Save audit results to the degree_audits table without committing.
+
+    Args:
+        conn: Open connection to the academic management database
+        audits: Results returned by DegreeAuditor.audit_student
+    """
+    audited_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    conn.executemany("""
+        INSERT OR REPLACE INTO degree_audits
+        (student_id, audited_at, major, credits_earned, credits_required,
+         percent_complete, is_complete, gpa)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(a["student_id"], audited_at, a["major"], a["credits_earned"], a["credits_required"],
+           round(a["percent_complete"], 1), int(a["complete"]), a["gpa"]) for a in audits])
+
+
+# Per-process state for batch audits
+_worker_auditor: Optional[DegreeAuditor] = None
+
+
+def _init_worker(db_path: str) -> None:
+    global _worker_auditor
+    _worker_auditor = DegreeAuditor(sqlite3.connect(db_path))
+
+
+def _audit_in_worker(student_id: str) -> Optional[Dict[str, Any]]:
+    return _worker_auditor.audit_student(student_id)
+
+
+def audit_department(department_id: str, db_path: Optional[str] = None,
+                     processes: Optional[int] = None, store: bool = True) -> List[Dict[str, Any]]:
+    """
+    Audit every student whose major belongs to a department.
+
+    Students are spread over a process pool; each worker keeps its own
+    connection and compiled requirement cache.
+
+    Args:
+        department_id: Department whose students should be audited
+        db_path: Database path, defaults to the application database
+        processes: Worker count, defaults to the CPU count
+        store: Whether to save the results to the degree_audits table
+
+    Returns:
+        List[Dict[str, Any]]: One audit result per student
+    """
+    db_path = db_path or get_db_path()
+    conn = sqlite3.connect(db_path)
+    try:
+        ensure_requirement_tables(conn)
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT DISTINCT s.student_id
+            FROM students s
+            JOIN department_majors dm ON s.major = dm.major_name
+            WHERE dm.department_id = ?
+            ORDER BY s.student_id
+        """, (department_id,))
+        student_ids = [row[0] for row in cursor.fetchall()]
+
+        with Pool(processes=processes, initializer=_init_worker, initargs=(db_path,)) as pool:
+            audits = [audit for audit in pool.map(_audit_in_worker, student_ids, chunksize=64) if audit]
+
+        if store:
+            store_audits(conn, audits)
+            conn.commit()
+        return audits
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    # Overnight batch: python -m ui.common.degree_audit <department_id> [processes]
+    if len(sys.argv) < 2:
+        print("Usage: python -m ui.common.degree_audit <department_id> [processes]")
+        sys.exit(1)
+    worker_count = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    results = audit_department(sys.argv[1], processes=worker_count)
+    complete = sum(1 for result in results if result["complete"])
+    print(f"Audited {len(results)} students in {sys.argv[1]}: {complete} complete")
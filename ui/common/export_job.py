@@ -0,0 +1,197 @@
+import os
+import sqlite3
+import threading
+from typing import Optional, Callable, List, Sequence, Tuple
+
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtWidgets import QWidget, QTableWidget, QFileDialog, QProgressDialog, QMessageBox
+
+from ui.common.query_export import (EXPORT_CHUNK_SIZE, EXPORT_FILE_FILTER, ExportCancelled,
+                                     export_rows, export_query)
+
+# An export callable takes progress and cancelled callbacks and returns the rows written
+Export = Callable[[Callable[[int], None], Callable[[], bool]], int]
+
+
+def choose_export_path(parent: QWidget, title: str, default_name: str) -> Optional[str]:
+    """Ask where to save an export; returns None if the dialog was cancelled."""
+    path, selected_filter = QFileDialog.getSaveFileName(parent, title, default_name, EXPORT_FILE_FILTER)
+    if not path:
+        return None
+    if not os.path.splitext(path)[1]:
+        path += ".xlsx" if "xlsx" in selected_filter else ".csv"
+    return path
+
+
+def table_contents(table: QTableWidget) -> Tuple[List[str], List[List[str]]]:
+    """
+    Copy a table's header labels and cell texts, for exporting what is on
+    screen. Must be called on the GUI thread; the copy can then be written
+    from any thread.
+    """
+    headers = []
+    for col in range(table.columnCount()):
+        header_item = table.horizontalHeaderItem(col)
+        headers.append(header_item.text() if header_item else str(col + 1))
+
+    rows = []
+    for row in range(table.rowCount()):
+        values = []
+        for col in range(table.columnCount()):
+            item = table.item(row, col)
+            values.append(item.text() if item else "")
+        rows.append(values)
+    return headers, rows
+
+
+class ExportJob(QObject):
+    """
+    Runs an export on a background thread behind a progress dialog.
+
+    The export callable gets its own thread, so it must open its own
+    database connection. Progress, completion and failure are sent back
+    with signals and shown on the GUI thread; Cancel stops the export
+    before its next chunk and removes the partial file.
+    """
+
+    _progressed = Signal(int)
+    _finished = Signal(int)
+    _failed = Signal(str)
+    _cancelled = Signal()
+
+    def __init__(self, parent: QWidget, title: str, path: str, export: Export):
+        """
+        Initialize the job.
+
+        Args:
+            parent: Widget the progress dialog and messages belong to
+            title: Title of the progress dialog and messages
+            path: File being written, shown to the user
+            export: Called on the job's thread with progress and cancelled callbacks
+        """
+        super().__init__(parent)
+        self.parent_widget = parent
+        self.title = title
+        self.path = path
+        self.export = export
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.dialog: Optional[QProgressDialog] = None
+
+        self._progressed.connect(self._on_progress)
+        self._finished.connect(self._on_finished)
+        self._failed.connect(self._on_failed)
+        self._cancelled.connect(self._close_dialog)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        # No known total, so the bar stays busy and the label counts rows
+        self.dialog = QProgressDialog(f"Exporting to {os.path.basename(self.path)}...", "Cancel", 0, 0,
+                                      self.parent_widget)
+        self.dialog.setWindowTitle(self.title)
+        self.dialog.setWindowModality(Qt.WindowModal)
+        self.dialog.setMinimumDuration(500)
+        self.dialog.canceled.connect(self.cancel)
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        self._stop.set()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until the export thread has ended."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        try:
+            rows = self.export(self._progressed.emit, self._stop.is_set)
+        except ExportCancelled:
+            self._cancelled.emit()
+        except Exception as e:
+            print(f"Export to {self.path} failed: {e}")
+            self._failed.emit(str(e))
+        else:
+            self._finished.emit(rows)
+
+    def _on_progress(self, rows: int) -> None:
+        if self.dialog:
+            self.dialog.setLabelText(f"Exported {rows} row(s) to {os.path.basename(self.path)}...")
+
+    def _close_dialog(self) -> None:
+        if self.dialog:
+            # Closing the dialog would emit canceled; the export is over by now
+            self.dialog.canceled.disconnect(self.cancel)
+            self.dialog.close()
+            self.dialog = None
+
+    def _on_finished(self, rows: int) -> None:
+        self._close_dialog()
+        QMessageBox.information(self.parent_widget, self.title, f"Exported {rows} row(s) to {self.path}")
+
+    def _on_failed(self, message: str) -> None:
+        self._close_dialog()
+        QMessageBox.warning(self.parent_widget, "Export Failed", message)
+
+
+def export_table(parent: QWidget, table: QTableWidget, title: str, default_name: str) -> Optional[ExportJob]:
+    """
+    Export what a table shows, after asking where to save it.
+
+    Returns:
+        Optional[ExportJob]: The started job, or None if no file was chosen
+    """
+    path = choose_export_path(parent, title, default_name)
+    if not path:
+        return None
+    headers, rows = table_contents(table)
+
+    def export(progress, cancelled):
+        chunks = (rows[start:start + EXPORT_CHUNK_SIZE] for start in range(0, len(rows), EXPORT_CHUNK_SIZE))
+        return export_rows(chunks, path, headers, progress, cancelled)
+
+    job = ExportJob(parent, title, path, export)
+    job.start()
+    return job
+
+
+def export_query_results(parent: QWidget, title: str, default_name: str,
+                         connect: Callable[[], sqlite3.Connection], sql: str,
+                         headers: Optional[List[str]] = None,
+                         prepare: Optional[Callable[[sqlite3.Connection], None]] = None,
+                         params: Sequence = ()) -> Optional[ExportJob]:
+    """
+    Stream a query's results to a file, after asking where to save it.
+    Rows go from the cursor to the file in chunks, without a table in between.
+
+    Args:
+        parent: Widget the dialogs belong to
+        title: Title of the dialogs
+        default_name: File name suggested in the save dialog
+        connect: Opens the connection, on the export's thread
+        sql: Query to export
+        headers: Column names, defaults to the query's own
+        prepare: Called with the connection before the query runs
+        params: Query parameters
+
+    Returns:
+        Optional[ExportJob]: The started job, or None if no file was chosen
+    """
+    path = choose_export_path(parent, title, default_name)
+    if not path:
+        return None
+
+    def export(progress, cancelled):
+        conn = connect()
+        try:
+            if prepare:
+                prepare(conn)
+            return export_query(conn, sql, path, params, headers=headers, progress=progress, cancelled=cancelled)
+        finally:
+            conn.close()
+
+    job = ExportJob(parent, title, path, export)
+    job.start()
+    return job
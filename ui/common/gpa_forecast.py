@@ -0,0 +1,160 @@
+import sqlite3
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+
+import numpy as np
+
+from ui.common.degree_audit import GRADE_POINTS
+
+CourseKey = Tuple[str, str]
+
+# Grades in the column order of the distribution matrices
+GRADES = tuple(GRADE_POINTS)
+POINTS = np.array([GRADE_POINTS[grade] for grade in GRADES], dtype=np.float64)
+
+DEFAULT_SIMULATIONS = 20000
+
+# Weight of the overall grade distribution mixed into each course's own
+# history, so courses with only a few past grades are not overfit
+PRIOR_WEIGHT = 5.0
+
+
+class GradeDistributionModel:
+    """
+    Per-course grade distributions estimated from student_courses.
+
+    Each course's distribution is its historical grade counts smoothed
+    towards the overall distribution; courses without any history use
+    the overall distribution directly.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        Load historical grade counts in one grouped query.
+
+        Args:
+            conn: Open connection to the academic management database
+        """
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT course_prefix, course_number, grade, COUNT(*)
+            FROM student_courses
+            WHERE grade IN ({", ".join("?" for _ in GRADES)})
+            GROUP BY course_prefix, course_number, grade
+        """, GRADES)
+
+        counts: Dict[CourseKey, np.ndarray] = {}
+        for prefix, number, grade, count in cursor.fetchall():
+            key = (prefix, number)
+            if key not in counts:
+                counts[key] = np.zeros(len(GRADES))
+            counts[key][GRADES.index(grade)] = count
+
+        overall = sum(counts.values(), np.zeros(len(GRADES)))
+        self.overall = overall / overall.sum() if overall.sum() > 0 else np.full(len(GRADES), 1 / len(GRADES))
+        self.distributions = {key: (row + PRIOR_WEIGHT * self.overall) / (row.sum() + PRIOR_WEIGHT)
+                              for key, row in counts.items()}
+
+    def distribution(self, course: Optional[CourseKey]) -> np.ndarray:
+        """Return the grade probabilities of a course (or of an unknown course)."""
+        if course is None:
+            return self.overall
+        return self.distributions.get(course, self.overall)
+
+    def simulate(self, current_points: float, current_credits: float,
+                 courses: List[Tuple[Optional[CourseKey], int]], target_gpa: float,
+                 simulations: int = DEFAULT_SIMULATIONS,
+                 rng: Optional[np.random.Generator] = None) -> Dict[str, Any]:
+        """
+        Monte Carlo forecast of the GPA after a set of future courses.
+
+        All simulations are drawn at once: one uniform sample per
+        (simulation, course) is mapped through each course's cumulative
+        grade distribution, so the cost is a few array operations
+        regardless of the simulation count.
+
+        Args:
+            current_points: Quality points earned so far
+            current_credits: GPA credits attempted so far
+            courses: (course, credits) pairs; a None course uses the overall distribution
+            target_gpa: GPA whose probability of being reached is reported
+            simulations: Number of simulated outcomes
+            rng: Random generator, defaults to a fresh unseeded one
+
+        Returns:
+            Dict[str, Any]: Probability of reaching the target and GPA percentiles
+        """
+        rng = rng or np.random.default_rng()
+        total_credits = current_credits + sum(credits for _, credits in courses)
+        if not courses or total_credits <= 0:
+            gpa = current_points / current_credits if current_credits > 0 else 0.0
+            return {
+                "simulations": 0,
+                "probability": float(gpa >= target_gpa - 1e-9),
+                "mean_gpa": gpa,
+                "percentiles": {10: gpa, 50: gpa, 90: gpa},
+            }
+
+        cdf = np.cumsum([self.distribution(course) for course, _ in courses], axis=1)
+        cdf[:, -1] = 1.0
+        credits = np.array([credits for _, credits in courses], dtype=np.float64)
+
+        draws = rng.random((simulations, len(courses)))
+        grade_index = (draws[:, :, None] > cdf[None, :, :]).sum(axis=2)
+        gpas = (current_points + POINTS[grade_index] @ credits) / total_credits
+
+        p10, p50, p90 = np.percentile(gpas, [10, 50, 90])
+        return {
+            "simulations": simulations,
+            "probability": float(np.mean(gpas >= target_gpa - 1e-9)),
+            "mean_gpa": float(gpas.mean()),
+            "percentiles": {10: float(p10), 50: float(p50), 90: float(p90)},
+        }
+
+
+def forecast_student(conn: sqlite3.Connection, student_id: str, target_gpa: float,
+                     extra_credits: Iterable[int] = (), simulations: int = DEFAULT_SIMULATIONS,
+                     model: Optional[GradeDistributionModel] = None) -> Dict[str, Any]:
+    """
+    Forecast a student's GPA after their current registrations.
+
+    Courses the student is registered for without a grade are simulated
+    from their own histories; extra hypothetical courses (credits only)
+    use the overall distribution.
+
+    Args:
+        conn: Open connection to the academic management database
+        student_id: The student to forecast
+        target_gpa: GPA whose probability of being reached is reported
+        extra_credits: Credits of additional hypothetical courses
+        simulations: Number of simulated outcomes
+        model: Preloaded distribution model, reused when forecasting many students
+
+    Returns:
+        Dict[str, Any]: Forecast result including the simulated courses
+    """
+    model = model or GradeDistributionModel(conn)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT sc.course_prefix, sc.course_number, COALESCE(c.credits, 0), sc.grade
+        FROM student_courses sc
+        LEFT JOIN courses c ON sc.course_prefix = c.course_prefix
+            AND sc.course_number = c.course_number
+        WHERE sc.student_id = ?
+    """, (student_id,))
+
+    points = 0
+    credits = 0
+    courses: List[Tuple[Optional[CourseKey], int]] = []
+    for prefix, number, course_credits, grade in cursor.fetchall():
+        if grade in GRADE_POINTS:
+            points += GRADE_POINTS[grade] * course_credits
+            credits += course_credits
+        elif not grade and course_credits > 0:
+            courses.append(((prefix, number), course_credits))
+    courses.extend((None, extra) for extra in extra_credits)
+
+    result = model.simulate(points, credits, courses, target_gpa, simulations)
+    result["current_gpa"] = points / credits if credits > 0 else 0.0
+    result["courses"] = [f"{course[0]} {course[1]}" if course else f"Additional {course_credits}-credit course"
+                         for course, course_credits in courses]
+    return result
@@ -0,0 +1,144 @@
+import csv
+import os
+import sqlite3
+from typing import Optional, Dict, List, Tuple
+
+from ui.common.degree_audit import DegreeAuditor, store_audits
+from ui.common.section_enrollment import ensure_section_enrollment_table, refresh_sections, SECTION_GRADE_POINTS
+
+# Grades an instructor may post: the grades the section counters know, letter
+# grades, S/U pass-fail and 'I' for an incomplete
+VALID_GRADES = tuple(SECTION_GRADE_POINTS)
+
+# Accepted header names for the student and grade columns of an import file
+STUDENT_COLUMNS = ('studentid', 'student_id', 'student id')
+GRADE_COLUMNS = ('grade',)
+
+
+def normalize_grade(value) -> Optional[str]:
+    """
+    Normalize a grade cell, returning None for a blank (ungraded) cell.
+
+    Raises:
+        ValueError: If the value is not a valid grade
+    """
+    grade = str(value).strip().upper() if value is not None else ""
+    if grade in ("", "N/A"):
+        return None
+    if grade not in VALID_GRADES:
+        raise ValueError(f"Invalid grade '{value}'. Valid grades are: {', '.join(VALID_GRADES)}")
+    return grade
+
+
+def read_grade_file(path: str) -> Dict[str, Optional[str]]:
+    """
+    Read student grades from a CSV or Excel (.xlsx) file.
+
+    The first row must contain a student ID column (StudentID) and a
+    Grade column; other columns are ignored.
+
+    Args:
+        path: Path of the file to import
+
+    Returns:
+        Dict[str, Optional[str]]: Grades keyed by student ID
+
+    Raises:
+        ValueError: If the file is missing a column or contains an invalid grade
+    """
+    if os.path.splitext(path)[1].lower() == '.xlsx':
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError("Importing .xlsx files requires the openpyxl package; save the sheet as CSV instead")
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        rows = list(workbook.active.iter_rows(values_only=True))
+        workbook.close()
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as grade_file:
+            rows = list(csv.reader(grade_file))
+
+    if not rows:
+        raise ValueError("The grade file is empty")
+
+    header = [str(cell or "").strip().lower() for cell in rows[0]]
+    student_column = next((i for i, name in enumerate(header) if name in STUDENT_COLUMNS), None)
+    grade_column = next((i for i, name in enumerate(header) if name in GRADE_COLUMNS), None)
+    if student_column is None or grade_column is None:
+        raise ValueError("The grade file must have StudentID and Grade columns")
+
+    grades = {}
+    for line_number, row in enumerate(rows[1:], start=2):
+        if not row or student_column >= len(row) or not str(row[student_column] or "").strip():
+            continue
+        student_id = str(row[student_column]).strip()
+        try:
+            grades[student_id] = normalize_grade(row[grade_column] if grade_column < len(row) else None)
+        except ValueError as e:
+            raise ValueError(f"Line {line_number}: {e}")
+    return grades
+
+
+def post_section_grades(conn: sqlite3.Connection, course_prefix: str, course_number: str,
+                        semester: str, year: int, grades: Dict[str, Optional[str]]) -> Tuple[int, List[str]]:
+    """
+    Post the grades of one section in a single transaction.
+
+    All grade updates are applied with one executemany UPDATE, and the
+    stored degree audits (which include each student's GPA) of the
+    affected students and the section's grade counters are refreshed
+    before the same commit, so readers never see new grades next to
+    stale derived data.
+
+    Args:
+        conn: Open connection to the academic management database
+        course_prefix: Course prefix of the section
+        course_number: Course number of the section
+        semester: Semester code of the section
+        year: Year of the section
+        grades: Grades keyed by student ID; None clears a grade
+
+    Returns:
+        Tuple[int, List[str]]: Number of students updated, and student IDs
+        in the grades that are not on the section roster (not updated)
+
+    Raises:
+        ValueError: If a grade is invalid
+        sqlite3.Error: If the update fails; nothing is written in that case
+    """
+    grades = {student_id: normalize_grade(grade) for student_id, grade in grades.items()}
+
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT DISTINCT student_id
+        FROM student_courses
+        WHERE course_prefix = ? AND course_number = ? AND semester = ? AND year_taken = ?
+    """, (course_prefix, course_number, semester, year))
+    roster = {row[0] for row in cursor.fetchall()}
+
+    unknown = sorted(student_id for student_id in grades if student_id not in roster)
+    updates = [(grade, student_id, course_prefix, course_number, semester, year)
+               for student_id, grade in grades.items() if student_id in roster]
+    if not updates:
+        return 0, unknown
+
+    ensure_section_enrollment_table(conn)
+    try:
+        cursor.execute("BEGIN TRANSACTION")
+        cursor.executemany("""
+            UPDATE student_courses
+            SET grade = ?
+            WHERE student_id = ? AND course_prefix = ? AND course_number = ?
+                AND semester = ? AND year_taken = ?
+        """, updates)
+
+        auditor = DegreeAuditor(conn)
+        audits = [auditor.audit_student(update[1]) for update in updates]
+        store_audits(conn, [audit for audit in audits if audit])
+        refresh_sections(conn, [(course_prefix, course_number, semester, year)])
+
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return len(updates), unknown
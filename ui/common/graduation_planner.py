@@ -0,0 +1,344 @@
+import sqlite3
+from datetime import date
+from typing import Optional, Dict, Any, List, Set, Tuple
+
+from ui.common.degree_audit import DegreeAuditor, GRADE_POINTS
+from ui.common.prerequisite_graph import PrerequisiteGraph, get_prerequisite_graph
+from ui.common.registration_rules import MAX_TERM_CREDITS
+
+CourseKey = Tuple[str, str]
+Term = Tuple[int, str]
+
+# Semesters in calendar order within a year
+SEMESTER_ORDER = ('S', 'U', 'F')
+
+# Number of future terms searched (six years including summers)
+DEFAULT_HORIZON = 18
+
+# Grade points per course assumed by the current-GPA scenario (and for
+# courses without history) when the student has no graded courses yet
+DEFAULT_BASE_GPA = 3.0
+
+
+class GradeScenario:
+    """How the planner predicts the grade earned in a future course"""
+    OPTIMISTIC = "optimistic"   # every course is an A
+    HISTORICAL = "historical"   # each course's mean grade in student_courses
+    CURRENT = "current"         # the student's current GPA in every course
+
+
+def current_term(today: Optional[date] = None) -> Term:
+    """Return the (year, semester) term containing a date."""
+    today = today or date.today()
+    if today.month <= 5:
+        return today.year, 'S'
+    if today.month <= 7:
+        return today.year, 'U'
+    return today.year, 'F'
+
+
+def next_terms(start: Term, count: int) -> List[Term]:
+    """Return the count terms that follow start, in order."""
+    year, semester = start
+    position = SEMESTER_ORDER.index(semester)
+    terms = []
+    for _ in range(count):
+        position += 1
+        if position == len(SEMESTER_ORDER):
+            position = 0
+            year += 1
+        terms.append((year, SEMESTER_ORDER[position]))
+    return terms
+
+
+class GraduationPlanner:
+    """
+    Searches upcoming course offerings for the fewest terms needed to
+    reach a target GPA and credit total.
+
+    The search is exact. Earned credits and quality points follow from
+    the set of courses taken, so a state is that set as a bitmask over
+    the prerequisite graph, kept with the earliest term it is reached in
+    (memoized: reaching it again later cannot help). Terms are searched
+    breadth-first, each state trying every set of eligible offered
+    courses within the term credit cap. Three pruning rules never lose
+    a shorter plan:
+
+    - A course whose predicted grade is at or above the target GPA is
+      never left out of a term it would still fit in: adding it cannot
+      lower the GPA below the target or hurt any later term.
+    - States that cannot reach the credit target, or the target GPA
+      even with every remaining course that raises it, within the
+      horizon are dropped.
+    - A state is not expanded again for a term whose eligible courses
+      it has already been expanded with.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, horizon: int = DEFAULT_HORIZON):
+        """
+        Initialize the planner and load the catalog.
+
+        Args:
+            conn: Open connection to the academic management database
+            horizon: Number of future terms to search
+        """
+        self.conn = conn
+        self.horizon = horizon
+        self.graph: PrerequisiteGraph = get_prerequisite_graph(conn)
+
+        cursor = conn.cursor()
+        cursor.execute("SELECT course_prefix, course_number, credits FROM courses")
+        self.course_credits: Dict[CourseKey, int] = {(prefix, number): int(credits or 0)
+                                                     for prefix, number, credits in cursor.fetchall()}
+
+        # Mean grade points per course, used by the historical scenario
+        cursor.execute(f"""
+            SELECT course_prefix, course_number,
+                   AVG(CASE grade {" ".join(f"WHEN '{g}' THEN {p}" for g, p in GRADE_POINTS.items())} END)
+            FROM student_courses
+            WHERE grade IN ({", ".join("?" for _ in GRADE_POINTS)})
+            GROUP BY course_prefix, course_number
+        """, tuple(GRADE_POINTS))
+        self.historical_points: Dict[CourseKey, float] = {(prefix, number): mean
+                                                          for prefix, number, mean in cursor.fetchall()}
+
+    def load_offerings(self, terms: List[Term]) -> Dict[Term, List[CourseKey]]:
+        """
+        Return the courses offered in each term.
+
+        Terms with sections in instructor_courses use those sections;
+        terms nothing has been scheduled for yet fall back to the full
+        catalog.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT DISTINCT year_taught, semester, course_prefix, course_number
+            FROM instructor_courses
+            WHERE year_taught >= ?
+        """, (terms[0][0],))
+        scheduled: Dict[Term, List[CourseKey]] = {}
+        for year, semester, prefix, number in cursor.fetchall():
+            if (prefix, number) in self.course_credits:
+                scheduled.setdefault((int(year), semester), []).append((prefix, number))
+
+        catalog = list(self.course_credits)
+        return {term: scheduled.get(term, catalog) for term in terms}
+
+    def student_standing(self, student_id: str) -> Dict[str, Any]:
+        """
+        Return the starting point of a plan for a student.
+
+        In-progress courses (no grade yet) are assumed to be passed: they
+        count toward earned credits and are not planned again, but do not
+        affect the GPA.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT sc.course_prefix, sc.course_number, COALESCE(c.credits, 0), sc.grade
+            FROM student_courses sc
+            LEFT JOIN courses c ON sc.course_prefix = c.course_prefix
+                AND sc.course_number = c.course_number
+            WHERE sc.student_id = ?
+        """, (student_id,))
+
+        gpa_credits = 0
+        points = 0
+        taken: Dict[CourseKey, int] = {}
+        for prefix, number, credits, grade in cursor.fetchall():
+            if grade in GRADE_POINTS:
+                gpa_credits += credits
+                points += GRADE_POINTS[grade] * credits
+            if grade in GRADE_POINTS and grade != 'F' or not grade:
+                taken[(prefix, number)] = credits
+
+        return {
+            "earned_credits": sum(taken.values()),
+            "gpa_credits": gpa_credits,
+            "quality_points": points,
+            "gpa": points / gpa_credits if gpa_credits > 0 else 0.0,
+            "taken": list(taken),
+        }
+
+    def _grade_points(self, course: CourseKey, scenario: str, current_gpa: float) -> float:
+        if scenario == GradeScenario.OPTIMISTIC:
+            return 4.0
+        if scenario == GradeScenario.HISTORICAL and course in self.historical_points:
+            return self.historical_points[course]
+        return current_gpa
+
+    def plan(self, student_id: str, target_gpa: float, target_credits: Optional[int] = None,
+             scenario: str = GradeScenario.HISTORICAL,
+             start: Optional[Term] = None) -> Optional[Dict[str, Any]]:
+        """
+        Find the minimum-term path to a target GPA and credit total.
+
+        Among the plans finishing in the fewest terms, the one adding the
+        fewest credits is returned.
+
+        Args:
+            student_id: The student to plan for
+            target_gpa: GPA the student must reach
+            target_credits: Earned credits required, defaults to the major's requirement
+            scenario: GradeScenario used to predict future grades
+            start: Current term; planning starts with the term after it
+
+        Returns:
+            Optional[Dict[str, Any]]: The plan with one entry per term, or
+            None if the targets cannot be reached within the horizon
+        """
+        standing = self.student_standing(student_id)
+        if target_credits is None:
+            audit = DegreeAuditor(self.conn).audit_student(student_id)
+            target_credits = audit["credits_required"] if audit else 0
+
+        terms = next_terms(start or current_term(), self.horizon)
+        offerings = self.load_offerings(terms)
+        base_gpa = standing["gpa"] if standing["gpa_credits"] > 0 else DEFAULT_BASE_GPA
+        rates = {course: self._grade_points(course, scenario, base_gpa) for course in self.course_credits}
+
+        def reached(added_credits: int, added_points: float) -> bool:
+            credits = standing["earned_credits"] + added_credits
+            gpa_credits = standing["gpa_credits"] + added_credits
+            points = standing["quality_points"] + added_points
+            gpa = points / gpa_credits if gpa_credits > 0 else 0.0
+            return credits >= target_credits and gpa >= target_gpa - 1e-9
+
+        # Plannable courses by graph position
+        credits_at: Dict[int, int] = {}
+        points_at: Dict[int, float] = {}
+        for course, position in self.graph.index.items():
+            if self.course_credits.get(course, 0) > 0:
+                credits_at[position] = self.course_credits[course]
+                points_at[position] = rates[course] * credits_at[position]
+        # Courses predicted at or above the target GPA never pull it below the target
+        raising = {position for position in credits_at
+                   if points_at[position] >= target_gpa * credits_at[position] - 1e-9}
+
+        def can_still_reach(mask: int, credits: int, points: float, remaining_terms: int) -> bool:
+            untaken = [position for position in credits_at if not (mask >> position) & 1]
+            max_credits = min(remaining_terms * MAX_TERM_CREDITS, sum(credits_at[p] for p in untaken))
+            if standing["earned_credits"] + credits + max_credits < target_credits:
+                return False
+            # Quality points above the target GPA's, at best adding every course that raises them
+            surplus = standing["quality_points"] + points - target_gpa * (standing["gpa_credits"] + credits)
+            surplus += sum(points_at[p] - target_gpa * credits_at[p] for p in untaken if p in raising)
+            return surplus >= -1e-9
+
+        start_mask = self.graph.mask_of(standing["taken"])
+        if reached(0, 0.0):
+            return self._build_plan(standing, {start_mask: (0, 0.0)}, {start_mask: None}, start_mask, [],
+                                    rates, target_gpa, target_credits, scenario)
+
+        # Every state reached so far with its added credits and points, and how it was reached:
+        # (previous mask, term index, courses taken that term)
+        states: Dict[int, Tuple[int, float]] = {start_mask: (0, 0.0)}
+        parents: Dict[int, Optional[Tuple[int, int, List[int]]]] = {start_mask: None}
+        expanded: Dict[int, List[int]] = {}
+        hopeless = set()
+
+        for term_index, term in enumerate(terms):
+            offered = sorted({self.graph.index[course] for course in offerings[term]
+                              if self.graph.index.get(course) in credits_at})
+            remaining_terms = len(terms) - term_index - 1
+            finished = []
+
+            # States reached in this term are only expanded from the next term on
+            for mask, (credits, points) in list(states.items()):
+                eligible = [position for position in offered
+                            if not (mask >> position) & 1 and not self.graph.direct[position] & ~mask]
+                eligible_mask = sum(1 << position for position in eligible)
+                if any(eligible_mask & ~done == 0 for done in expanded.get(mask, ())):
+                    continue
+                expanded.setdefault(mask, []).append(eligible_mask)
+
+                for chosen in self._term_choices(eligible, credits_at, raising):
+                    new_mask = mask | sum(1 << position for position in chosen)
+                    if new_mask in states or new_mask in hopeless:
+                        continue
+                    new_credits = credits + sum(credits_at[position] for position in chosen)
+                    new_points = points + sum(points_at[position] for position in chosen)
+                    if not can_still_reach(new_mask, new_credits, new_points, remaining_terms):
+                        hopeless.add(new_mask)
+                        continue
+                    states[new_mask] = (new_credits, new_points)
+                    parents[new_mask] = (mask, term_index, chosen)
+                    if reached(new_credits, new_points):
+                        finished.append(new_mask)
+
+            if finished:
+                final_mask = min(finished, key=lambda m: (states[m][0], -states[m][1], m))
+                return self._build_plan(standing, states, parents, final_mask, terms[:term_index + 1],
+                                        rates, target_gpa, target_credits, scenario)
+        return None
+
+    @staticmethod
+    def _term_choices(eligible: List[int], credits_at: Dict[int, int], raising: Set[int]):
+        """
+        Yield the non-empty sets of eligible courses (graph positions)
+        worth taking in one term: those within MAX_TERM_CREDITS where no
+        left-out course that raises the GPA would still fit.
+        """
+        remaining = [0] * (len(eligible) + 1)
+        for i in range(len(eligible) - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + credits_at[eligible[i]]
+        chosen: List[int] = []
+
+        def walk(i: int, load: int, min_load: int):
+            # min_load: the load at which every raising course left out so far no longer fits
+            if load + remaining[i] < min_load:
+                return
+            if i == len(eligible):
+                if chosen:
+                    yield list(chosen)
+                return
+            position = eligible[i]
+            course_credits = credits_at[position]
+            if load + course_credits <= MAX_TERM_CREDITS:
+                chosen.append(position)
+                yield from walk(i + 1, load + course_credits, min_load)
+                chosen.pop()
+            if position in raising:
+                min_load = max(min_load, MAX_TERM_CREDITS - course_credits + 1)
+            yield from walk(i + 1, load, min_load)
+
+        return walk(0, 0, 0)
+
+    def _build_plan(self, standing: Dict[str, Any], states: Dict[int, Tuple[int, float]],
+                    parents: Dict[int, Optional[Tuple[int, int, List[int]]]], final_mask: int,
+                    terms: List[Term], rates: Dict[CourseKey, float], target_gpa: float,
+                    target_credits: int, scenario: str) -> Dict[str, Any]:
+        """Walk the back pointers of the search into a term-by-term plan."""
+        taken_in: Dict[int, List[int]] = {}
+        mask = final_mask
+        while parents[mask] is not None:
+            previous, term_index, chosen = parents[mask]
+            taken_in[term_index] = chosen
+            mask = previous
+
+        path = []
+        for term_index, term in enumerate(terms):
+            courses = [self.graph.courses[position] for position in taken_in.get(term_index, [])]
+            path.append({
+                "term": term,
+                "courses": [{"course": f"{prefix} {number}",
+                             "credits": self.course_credits[(prefix, number)],
+                             "expected_points": round(rates[(prefix, number)], 2)}
+                            for prefix, number in courses],
+                "credits": sum(self.course_credits[course] for course in courses),
+            })
+        while path and not path[-1]["courses"]:
+            path.pop()
+
+        added_credits, added_points = states[final_mask]
+        gpa_credits = standing["gpa_credits"] + added_credits
+        projected_gpa = ((standing["quality_points"] + added_points) / gpa_credits
+                         if gpa_credits > 0 else 0.0)
+        return {
+            "terms": path,
+            "term_count": len(path),
+            "target_gpa": target_gpa,
+            "target_credits": target_credits,
+            "scenario": scenario,
+            "projected_gpa": projected_gpa,
+            "projected_credits": standing["earned_credits"] + added_credits,
+        }
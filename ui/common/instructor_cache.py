@@ -0,0 +1,252 @@
+import sqlite3
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from ui.common.db import get_db_path
+from ui.common.section_enrollment import ensure_section_enrollment_table
+
+SectionKey = Tuple[str, str, str, int]
+
+# Milliseconds between checks for changes made by other connections
+POLL_INTERVAL = 2000
+
+SEMESTER_RANK = {'S': 1, 'U': 2, 'F': 3}
+
+# Tables the cached sections and rosters are read from
+SECTION_TABLES = ('instructor_courses', 'student_courses', 'section_enrollment', 'courses', 'students')
+
+
+def ensure_section_version_table(conn: sqlite3.Connection) -> None:
+    """
+    Create the section_version counter that triggers bump on every change
+    to the tables the instructor cache reads, if it does not exist yet.
+
+    Unlike PRAGMA data_version it does not move on commits that only touch
+    other tables, such as the operation_logs rows the system logger adds.
+
+    Args:
+        conn: Open connection to the academic management database
+    """
+    in_transaction = conn.in_transaction
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'section_version'")
+    if cursor.fetchone() is not None:
+        return
+    ensure_section_enrollment_table(conn)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS section_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO section_version (id, version) VALUES (1, 0)")
+    for table in SECTION_TABLES:
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_section_version
+            AFTER {event} ON {table}
+            BEGIN
+                UPDATE section_version SET version = version + 1 WHERE id = 1;
+            END
+            ''')
+    if not in_transaction:
+        conn.commit()
+
+
+def read_section_version(conn: sqlite3.Connection) -> int:
+    """Return the section_version counter."""
+    return conn.execute("SELECT version FROM section_version WHERE id = 1").fetchone()[0]
+
+
+
+
+def load_instructor_sections(conn: sqlite3.Connection, instructor_id: str) -> Dict[SectionKey, Dict[str, Any]]:
+    """Load every section of an instructor with its roster."""
+    ensure_section_enrollment_table(conn)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT ic.course_prefix, ic.course_number, ic.semester, ic.year_taught, c.credits,
+               COALESCE(se.enrolled, 0), s.student_id, s.gender, s.major, MAX(sc.grade)
+        FROM instructor_courses ic
+        JOIN courses c ON ic.course_prefix = c.course_prefix
+            AND ic.course_number = c.course_number
+        LEFT JOIN section_enrollment se ON se.course_prefix = ic.course_prefix
+            AND se.course_number = ic.course_number
+            AND se.semester = ic.semester
+            AND se.year = ic.year_taught
+        LEFT JOIN student_courses sc ON sc.course_prefix = ic.course_prefix
+            AND sc.course_number = ic.course_number
+            AND sc.semester = ic.semester
+            AND sc.year_taken = ic.year_taught
+        LEFT JOIN students s ON sc.student_id = s.student_id
+        WHERE ic.instructor_id = ?
+        GROUP BY ic.course_prefix, ic.course_number, ic.semester, ic.year_taught, s.student_id
+        ORDER BY s.student_id
+    """, (instructor_id,))
+
+    sections: Dict[SectionKey, Dict[str, Any]] = {}
+    for (prefix, number, semester, year, credits, enrolled,
+         student_id, gender, major, grade) in cursor.fetchall():
+        key = (prefix, number, semester, year)
+        section = sections.get(key)
+        if section is None:
+            section = sections[key] = {"credits": credits, "enrolled": enrolled, "roster": []}
+        if student_id is not None:
+            section["roster"].append({
+                "student_id": student_id,
+                "gender": gender,
+                "major": major,
+                "grade": grade,
+                "status": "Completed" if grade is not None else "In Progress",
+            })
+    return sections
+
+
+def prewarm_instructor_sections(conn: sqlite3.Connection, instructor_id: str) -> Dict[str, Any]:
+    """
+    Load an instructor's sections for InstructorSessionCache on a worker thread.
+
+    The cache's watch connection is opened here and the section version
+    read before the sections are loaded, so the cache starts from them
+    without reloading on its first poll.
+
+    Returns:
+        Dict[str, Any]: 'sections', 'watch_conn' and 'version'
+    """
+    ensure_section_version_table(conn)
+    db_path = conn.execute("PRAGMA database_list").fetchone()[2]
+    # Handed over to the GUI thread, which is the only one using it afterwards
+    watch_conn = sqlite3.connect(db_path, check_same_thread=False)
+    try:
+        version = read_section_version(watch_conn)
+        sections = load_instructor_sections(conn, instructor_id)
+    except sqlite3.Error:
+        watch_conn.close()
+        raise
+    return {"sections": sections, "watch_conn": watch_conn, "version": version}
+
+
+class InstructorSessionCache(QObject):
+    """
+    In-memory copy of an instructor's sections and rosters.
+
+    Everything is loaded with one grouped query, after which the
+    dashboard serves tab switches and course selections from memory.
+    A timer polls the section_version counter, which triggers bump
+    whenever the sections or rosters change, and reloads the cache on a
+    background thread;
+    the refreshed signal is delivered on the GUI thread once the new
+    data is in place.
+    """
+
+    refreshed = Signal()
+
+    def __init__(self, instructor_id: str, db_path: Optional[str] = None, parent: Optional[QObject] = None,
+                 prewarmed: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the cache and load the instructor's sections.
+
+        Args:
+            instructor_id: The instructor whose sections are cached
+            db_path: Database path, defaults to the application database
+            parent: Optional Qt parent
+            prewarmed: Result of prewarm_instructor_sections(), used
+                instead of loading the sections here
+        """
+        super().__init__(parent)
+        self.instructor_id = instructor_id
+        self.db_path = db_path or get_db_path()
+        self.sections: Dict[SectionKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+        self.refreshed.connect(self._on_refreshed)
+        if prewarmed is None:
+            # Dedicated connection used only to watch for changes from other connections
+            self._watch_conn = sqlite3.connect(self.db_path)
+            ensure_section_version_table(self._watch_conn)
+            self._version = None
+            self.reload()
+        else:
+            self._watch_conn = prewarmed["watch_conn"]
+            self._version = prewarmed["version"]
+            self.sections = prewarmed["sections"]
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.check_for_changes)
+        self._timer.start(POLL_INTERVAL)
+
+    def _read_version(self) -> int:
+        return read_section_version(self._watch_conn)
+
+    def _load_sections(self) -> Dict[SectionKey, Dict[str, Any]]:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return load_instructor_sections(conn, self.instructor_id)
+        finally:
+            conn.close()
+
+    def reload(self) -> None:
+        """Reload the cache synchronously, e.g. after this session changed data."""
+        # Read the version first so commits made during the load trigger another refresh
+        version = self._read_version()
+        sections = self._load_sections()
+        with self._lock:
+            self.sections = sections
+            self._version = version
+
+    def check_for_changes(self) -> None:
+        """Start a background reload if the sections or rosters have changed."""
+        if self._refreshing:
+            return
+        version = self._read_version()
+        if version == self._version:
+            return
+        self._refreshing = True
+        threading.Thread(target=self._background_reload, args=(version,), daemon=True).start()
+
+    def _background_reload(self, version: int) -> None:
+        try:
+            sections = self._load_sections()
+            with self._lock:
+                self.sections = sections
+                self._version = version
+        except sqlite3.Error as e:
+            print(f"Database error while refreshing instructor cache: {e}")
+        finally:
+            self.refreshed.emit()
+
+    def _on_refreshed(self) -> None:
+        self._refreshing = False
+
+    def stop(self) -> None:
+        """Stop polling and release the watch connection."""
+        self._timer.stop()
+        self._watch_conn.close()
+
+    def terms(self) -> List[Tuple[str, int]]:
+        """Return the instructor's (semester, year) terms, most recent first."""
+        with self._lock:
+            terms = {(key[2], key[3]) for key in self.sections}
+        return sorted(terms, key=lambda term: (int(term[1]), SEMESTER_RANK.get(term[0], 0)), reverse=True)
+
+    def section_keys(self) -> List[SectionKey]:
+        """Return every section, most recent term first, then by course."""
+        with self._lock:
+            keys = list(self.sections)
+        return sorted(keys, key=lambda key: (-int(key[3]), -SEMESTER_RANK.get(key[2], 0), key[0], key[1]))
+
+    def sections_in(self, semester: str, year) -> List[Tuple[SectionKey, Dict[str, Any]]]:
+        """Return the sections of a term, or of every term when semester is 'all'."""
+        with self._lock:
+            sections = dict(self.sections)
+        return [(key, sections[key]) for key in self.section_keys()
+                if semester == "all" or (key[2] == semester and str(key[3]) == str(year))]
+
+    def roster(self, key: SectionKey) -> List[Dict[str, Any]]:
+        """Return the roster of a section, empty if the section is unknown."""
+        with self._lock:
+            section = self.sections.get(key)
+        return list(section["roster"]) if section else []
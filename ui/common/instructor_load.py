@@ -0,0 +1,194 @@
+import sqlite3
+from typing import Optional, Dict, Iterable, List, Tuple
+
+# Most credits an instructor may teach in a term, unless their availability is lower
+INSTRUCTOR_CREDIT_LIMIT = 12
+
+TermKey = Tuple[str, int]
+
+_LOAD_TOTALS_SELECT = """
+    SELECT ic.instructor_id, ic.semester, ic.year_taught,
+           COALESCE(SUM(c.credits), 0), COUNT(*)
+    FROM instructor_courses ic
+    JOIN courses c ON ic.course_prefix = c.course_prefix
+        AND ic.course_number = c.course_number
+    WHERE ic.instructor_id IS NOT NULL AND ic.semester IS NOT NULL
+"""
+
+
+def ensure_availability_table(conn: sqlite3.Connection) -> None:
+    """
+    Create the instructor_availability table if it does not exist yet.
+
+    A row caps an instructor's credits for one term (0 means unavailable);
+    instructors without a row are available up to INSTRUCTOR_CREDIT_LIMIT.
+
+    Args:
+        conn: Open connection to the academic management database
+    """
+    in_transaction = conn.in_transaction
+    cursor = conn.cursor()
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS instructor_availability (
+        instructor_id TEXT NOT NULL,
+        semester TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        max_credits INTEGER NOT NULL,
+        PRIMARY KEY (instructor_id, semester, year),
+        FOREIGN KEY (instructor_id) REFERENCES instructors (instructor_id)
+    )
+    ''')
+    if not in_transaction:
+        conn.commit()
+
+
+def ensure_instructor_load_table(conn: sqlite3.Connection) -> None:
+    """
+    Create the instructor_load table, filling it from instructor_courses
+    the first time it is created.
+
+    Args:
+        conn: Open connection to the academic management database
+    """
+    in_transaction = conn.in_transaction
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'instructor_load'")
+    exists = cursor.fetchone() is not None
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS instructor_load (
+        instructor_id TEXT NOT NULL,
+        semester TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        credits INTEGER NOT NULL DEFAULT 0,
+        sections INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (instructor_id, semester, year)
+    )
+    ''')
+    if not exists:
+        rebuild_instructor_loads(conn)
+    if not in_transaction:
+        conn.commit()
+
+
+def rebuild_instructor_loads(conn: sqlite3.Connection) -> None:
+    """Recompute every instructor's load from instructor_courses (e.g. after an import)."""
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM instructor_load")
+    cursor.execute(f"""
+        INSERT INTO instructor_load (instructor_id, semester, year, credits, sections)
+        {_LOAD_TOTALS_SELECT}
+        GROUP BY ic.instructor_id, ic.semester, ic.year_taught
+    """)
+
+
+def refresh_instructor_loads(conn: sqlite3.Connection, terms: Iterable[TermKey]) -> None:
+    """
+    Recompute the loads of specific terms after their assignments changed.
+    Does not commit, so it can share the caller's transaction.
+    """
+    ensure_instructor_load_table(conn)
+    cursor = conn.cursor()
+    for semester, year in set((semester, int(year)) for semester, year in terms):
+        cursor.execute("DELETE FROM instructor_load WHERE semester = ? AND year = ?", (semester, year))
+        cursor.execute(f"""
+            INSERT INTO instructor_load (instructor_id, semester, year, credits, sections)
+            {_LOAD_TOTALS_SELECT}
+                AND ic.semester = ? AND ic.year_taught = ?
+            GROUP BY ic.instructor_id, ic.semester, ic.year_taught
+        """, (semester, year))
+
+
+def refresh_course_loads(conn: sqlite3.Connection, course_prefix: str, course_number: str) -> None:
+    """
+    Recompute the loads of every term a course is scheduled in, e.g. after
+    its credits changed. Does not commit.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT DISTINCT semester, year_taught
+        FROM instructor_courses
+        WHERE course_prefix = ? AND course_number = ? AND semester IS NOT NULL
+    """, (course_prefix, course_number))
+    refresh_instructor_loads(conn, cursor.fetchall())
+
+
+class InstructorLoadMatrix:
+    """
+    In-memory (instructor, term) credit loads and limits.
+
+    The matrix is read from the instructor_load table in one query, so
+    checking whether an instructor can take another section is a
+    dictionary lookup instead of a SUM over the term's assignments. The
+    limit of an instructor is INSTRUCTOR_CREDIT_LIMIT, lowered by any
+    instructor_availability row for the term.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, terms: Iterable[TermKey],
+                 instructor_ids: Optional[Iterable[str]] = None):
+        """
+        Load the loads and limits of the given terms.
+
+        Args:
+            conn: Open connection to the academic management database
+            terms: (semester, year) terms covered by the matrix
+            instructor_ids: Instructors to include, defaults to every instructor with a load
+        """
+        self.terms: List[TermKey] = [(semester, int(year)) for semester, year in terms]
+        self.loads: Dict[Tuple[str, str, int], int] = {}
+        self.sections: Dict[Tuple[str, str, int], int] = {}
+        self.limits: Dict[Tuple[str, str, int], int] = {}
+        if not self.terms:
+            self.instructor_ids: List[str] = sorted(instructor_ids or [])
+            return
+
+        ensure_instructor_load_table(conn)
+        ensure_availability_table(conn)
+        term_filter = " OR ".join("(semester = ? AND year = ?)" for _ in self.terms)
+        params = [value for term in self.terms for value in term]
+        cursor = conn.cursor()
+
+        cursor.execute(f"""
+            SELECT instructor_id, semester, year, credits, sections
+            FROM instructor_load
+            WHERE {term_filter}
+        """, params)
+        for instructor_id, semester, year, credits, sections in cursor.fetchall():
+            self.loads[(instructor_id, semester, year)] = credits
+            self.sections[(instructor_id, semester, year)] = sections
+
+        cursor.execute(f"""
+            SELECT instructor_id, semester, year, max_credits
+            FROM instructor_availability
+            WHERE {term_filter}
+        """, params)
+        for instructor_id, semester, year, max_credits in cursor.fetchall():
+            self.limits[(instructor_id, semester, year)] = min(int(max_credits), INSTRUCTOR_CREDIT_LIMIT)
+
+        if instructor_ids is None:
+            instructor_ids = {key[0] for key in self.loads}
+        self.instructor_ids = sorted(instructor_ids)
+
+    def load(self, instructor_id: str, semester: str, year: int) -> int:
+        """Return an instructor's assigned credits in a term."""
+        return self.loads.get((instructor_id, semester, int(year)), 0)
+
+    def section_count(self, instructor_id: str, semester: str, year: int) -> int:
+        """Return the number of sections an instructor teaches in a term."""
+        return self.sections.get((instructor_id, semester, int(year)), 0)
+
+    def limit(self, instructor_id: str, semester: str, year: int) -> int:
+        """Return the most credits an instructor may teach in a term."""
+        return self.limits.get((instructor_id, semester, int(year)), INSTRUCTOR_CREDIT_LIMIT)
+
+    def can_assign(self, instructor_id: str, semester: str, year: int, credits: int) -> bool:
+        """Return True if the instructor can take a section of the given credits."""
+        return self.load(instructor_id, semester, year) + credits <= self.limit(instructor_id, semester, year)
+
+    def record(self, instructor_id: str, semester: str, year: int, credits: int) -> None:
+        """
+        Apply an assignment change (negative credits for a removal) to the
+        in-memory matrix, e.g. while planning several assignments.
+        """
+        key = (instructor_id, semester, int(year))
+        self.loads[key] = self.loads.get(key, 0) + credits
+        self.sections[key] = self.sections.get(key, 0) + (1 if credits > 0 else -1 if credits < 0 else 0)
@@ -0,0 +1,386 @@
+import heapq
+import re
+import sqlite3
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+
+CourseKey = Tuple[str, str]
+
+# Day codes in week order (R is Thursday, U is Sunday)
+DAYS = "MTWRFSU"
+DAY_NAMES = {'M': 'Mon', 'T': 'Tue', 'W': 'Wed', 'R': 'Thu', 'F': 'Fri', 'S': 'Sat', 'U': 'Sun'}
+MINUTES_PER_DAY = 24 * 60
+
+
+def parse_days(days: str) -> str:
+    """
+    Normalize a day pattern such as 'mwf' or 'T R' to 'MWF' / 'TR'.
+
+    Raises:
+        ValueError: If the pattern contains an unknown day code
+    """
+    codes = re.sub(r"[\s,]", "", days or "").upper()
+    unknown = sorted(set(codes) - set(DAYS))
+    if unknown:
+        raise ValueError(f"Unknown day code(s) {', '.join(unknown)}. Use {DAYS} (R = Thursday, U = Sunday).")
+    return "".join(day for day in DAYS if day in codes)
+
+
+def format_time(minutes: int) -> str:
+    """Format minutes after midnight as HH:MM."""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def format_meeting(meeting: Dict[str, Any]) -> str:
+    """Format a meeting as e.g. 'MWF 09:00-09:50 (B101)'."""
+    text = f"{meeting['days']} {format_time(meeting['start'])}-{format_time(meeting['end'])}"
+    return f"{text} ({meeting['room']})" if meeting.get("room") else text
+
+
+def ensure_section_meetings_table(conn: sqlite3.Connection) -> None:
+    """
+    Create the section_meetings table if it does not exist yet.
+
+    A section may have several meeting patterns (e.g. lecture and lab);
+    times are stored as minutes after midnight.
+
+    Args:
+        conn: Open connection to the academic management database
+    """
+    in_transaction = conn.in_transaction
+    cursor = conn.cursor()
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS section_meetings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        course_prefix TEXT NOT NULL,
+        course_number TEXT NOT NULL,
+        semester TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        days TEXT NOT NULL,
+        start_time INTEGER NOT NULL,
+        end_time INTEGER NOT NULL,
+        room TEXT,
+        CHECK (start_time < end_time)
+    )
+    ''')
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_section_meetings_term
+    ON section_meetings (semester, year)
+    ''')
+    if not in_transaction:
+        conn.commit()
+
+
+def replace_section_meetings(conn: sqlite3.Connection, course_prefix: str, course_number: str,
+                             semester: str, year: int, meetings: Iterable[Dict[str, Any]]) -> None:
+    """
+    Replace the meeting patterns of a section. Does not commit, so it can
+    share the caller's transaction.
+
+    Args:
+        conn: Open connection to the academic management database
+        course_prefix: Course prefix of the section
+        course_number: Course number of the section
+        semester: Semester code of the section
+        year: Year of the section
+        meetings: Dicts with 'days', 'start', 'end' (minutes) and 'room'
+    """
+    ensure_section_meetings_table(conn)
+    cursor = conn.cursor()
+    cursor.execute("""
+        DELETE FROM section_meetings
+        WHERE course_prefix = ? AND course_number = ? AND semester = ? AND year = ?
+    """, (course_prefix, course_number, semester, year))
+    cursor.executemany("""
+        INSERT INTO section_meetings
+        (course_prefix, course_number, semester, year, days, start_time, end_time, room)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(course_prefix, course_number, semester, year, meeting["days"], meeting["start"],
+           meeting["end"], meeting.get("room") or None) for meeting in meetings])
+
+
+def week_intervals(meeting: Dict[str, Any]) -> List[Tuple[int, int]]:
+    """Expand a meeting into half-open [start, end) intervals in minutes since Monday 00:00."""
+    return [(DAYS.index(day) * MINUTES_PER_DAY + meeting["start"],
+             DAYS.index(day) * MINUTES_PER_DAY + meeting["end"])
+            for day in meeting["days"]]
+
+
+class IntervalTree:
+    """
+    Static centered interval tree over half-open [start, end) intervals.
+
+    Each node stores the intervals containing its center point sorted by
+    start and by end, so an overlap query visits one root-to-leaf path
+    plus the intervals it reports: O(log n + k).
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[int, int, Any]]):
+        """
+        Build the tree.
+
+        Args:
+            intervals: (start, end, payload) triples with start < end
+        """
+        self._root = self._build(sorted(intervals, key=lambda interval: interval[:2]))
+
+    def _build(self, intervals: List[Tuple[int, int, Any]]):
+        if not intervals:
+            return None
+        # The median start always overlaps its own interval, so every node holds at least one
+        center = intervals[len(intervals) // 2][0]
+        left, right, overlapping = [], [], []
+        for interval in intervals:
+            if interval[1] <= center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                overlapping.append(interval)
+        by_end = sorted(overlapping, key=lambda interval: interval[1], reverse=True)
+        return center, overlapping, by_end, self._build(left), self._build(right)
+
+    def overlapping(self, start: int, end: int) -> List[Tuple[int, int, Any]]:
+        """Return every stored interval that overlaps [start, end)."""
+        found = []
+        node = self._root
+        stack = [node] if node else []
+        while stack:
+            center, by_start, by_end, left, right = stack.pop()
+            if end <= center:
+                for interval in by_start:
+                    if interval[0] >= end:
+                        break
+                    found.append(interval)
+                if left:
+                    stack.append(left)
+            elif start >= center:
+                for interval in by_end:
+                    if interval[1] <= start:
+                        break
+                    found.append(interval)
+                if right:
+                    stack.append(right)
+            else:
+                found.extend(by_start)
+                if left:
+                    stack.append(left)
+                if right:
+                    stack.append(right)
+        return found
+
+
+class MeetingConflictChecker:
+    """
+    Detects room, instructor and student time conflicts within one term.
+
+    All meeting patterns of the term are loaded with one query. Each
+    resource (room, instructor or student schedule) gets one interval tree
+    over its meetings, built the first time it is checked and reused by
+    every later check on the same checker, so a check is an O(log n + k)
+    query. scan_term() finds every conflict of the term with one sweep
+    over the meetings sorted by start time.
+
+    The trees reflect the term as it was loaded; create a new checker
+    after changing its meetings, assignments or registrations.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, semester: str, year: int):
+        """
+        Initialize the checker and load the term's meeting patterns.
+
+        Args:
+            conn: Open connection to the academic management database
+            semester: Semester code ('S', 'U' or 'F')
+            year: Calendar year of the term
+        """
+        self.conn = conn
+        self.semester = semester
+        self.year = year
+        ensure_section_meetings_table(conn)
+
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT sm.course_prefix, sm.course_number, sm.days, sm.start_time, sm.end_time, sm.room,
+                   ic.instructor_id
+            FROM section_meetings sm
+            LEFT JOIN instructor_courses ic ON ic.course_prefix = sm.course_prefix
+                AND ic.course_number = sm.course_number
+                AND ic.semester = sm.semester
+                AND ic.year_taught = sm.year
+            WHERE sm.semester = ? AND sm.year = ?
+        """, (semester, year))
+
+        self.meetings: Dict[CourseKey, List[Dict[str, Any]]] = {}
+        self.instructors: Dict[CourseKey, Optional[str]] = {}
+        self.room_meetings: Dict[str, List[Dict[str, Any]]] = {}
+        self.instructor_meetings: Dict[str, List[Dict[str, Any]]] = {}
+        for prefix, number, days, start, end, room, instructor_id in cursor.fetchall():
+            key = (prefix, number)
+            meeting = {"course": key, "days": days, "start": start, "end": end, "room": room}
+            self.meetings.setdefault(key, []).append(meeting)
+            self.instructors[key] = instructor_id
+            if room:
+                self.room_meetings.setdefault(room, []).append(meeting)
+            if instructor_id:
+                self.instructor_meetings.setdefault(instructor_id, []).append(meeting)
+
+        # Interval trees by (kind, resource), built on first use
+        self._trees: Dict[Tuple[str, str], IntervalTree] = {}
+
+    def _student_meetings(self, student_id: str) -> List[Dict[str, Any]]:
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT DISTINCT course_prefix, course_number
+            FROM student_courses
+            WHERE student_id = ? AND semester = ? AND year_taken = ?
+        """, (student_id, self.semester, self.year))
+        return [meeting for key in cursor.fetchall() for meeting in self.meetings.get(key, [])]
+
+    def _tree(self, kind: str, resource: str) -> IntervalTree:
+        """Return the interval tree over a room's, instructor's or student's meetings."""
+        key = (kind, resource)
+        if key not in self._trees:
+            if kind == "room":
+                meetings = self.room_meetings.get(resource, [])
+            elif kind == "instructor":
+                meetings = self.instructor_meetings.get(resource, [])
+            else:
+                meetings = self._student_meetings(resource)
+            self._trees[key] = IntervalTree((start, end, meeting)
+                                            for meeting in meetings
+                                            for start, end in week_intervals(meeting))
+        return self._trees[key]
+
+    def _conflicts(self, course: CourseKey, meetings: List[Dict[str, Any]],
+                   kind: str, resource: str) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Return (meeting, other meeting) pairs where a course overlaps another course of a resource."""
+        tree = self._tree(kind, resource)
+        pairs = {}
+        for meeting in meetings:
+            for start, end in week_intervals(meeting):
+                for _, _, other in tree.overlapping(start, end):
+                    if other["course"] != course:
+                        pairs[(id(meeting), id(other))] = (meeting, other)
+        return list(pairs.values())
+
+    def student_conflicts(self, student_id: str, course: CourseKey) -> List[Dict[str, Any]]:
+        """
+        Check a registration against the student's other courses in the term.
+
+        Returns:
+            List[Dict[str, Any]]: 'time_conflict' violations, empty when there is none
+        """
+        if course not in self.meetings:
+            return []
+
+        violations = []
+        for meeting, other in self._conflicts(course, self.meetings[course], "student", student_id):
+            violations.append({
+                "rule": "time_conflict",
+                "message": f"{course[0]} {course[1]} ({format_meeting(meeting)}) conflicts with "
+                           f"{other['course'][0]} {other['course'][1]} ({format_meeting(other)}).",
+                "course": f"{course[0]} {course[1]}",
+                "conflicts_with": f"{other['course'][0]} {other['course'][1]}",
+            })
+        return violations
+
+    def section_conflicts(self, course: CourseKey, instructor_id: Optional[str],
+                          meetings: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Check a section's instructor and rooms against the rest of the term.
+
+        Args:
+            course: The section's course
+            instructor_id: Instructor proposed for the section (None for TBA)
+            meetings: Proposed meeting patterns, defaults to the stored ones
+
+        Returns:
+            List[Dict[str, Any]]: 'instructor_time_conflict' and 'room_conflict' violations
+        """
+        meetings = self.meetings.get(course, []) if meetings is None else meetings
+        meetings = [dict(meeting, course=course) for meeting in meetings]
+        violations = []
+
+        if instructor_id:
+            for meeting, other in self._conflicts(course, meetings, "instructor", instructor_id):
+                violations.append({
+                    "rule": "instructor_time_conflict",
+                    "message": f"Instructor {instructor_id} already teaches {other['course'][0]} "
+                               f"{other['course'][1]} at {format_meeting(other)}.",
+                    "instructor_id": instructor_id,
+                    "conflicts_with": f"{other['course'][0]} {other['course'][1]}",
+                })
+
+        rooms = {meeting["room"] for meeting in meetings if meeting.get("room")}
+        for room in rooms:
+            room_meetings = [meeting for meeting in meetings if meeting.get("room") == room]
+            for meeting, other in self._conflicts(course, room_meetings, "room", room):
+                violations.append({
+                    "rule": "room_conflict",
+                    "message": f"Room {room} is already used by {other['course'][0]} "
+                               f"{other['course'][1]} at {format_meeting(other)}.",
+                    "room": room,
+                    "conflicts_with": f"{other['course'][0]} {other['course'][1]}",
+                })
+        return violations
+
+    def scan_term(self) -> List[Dict[str, Any]]:
+        """
+        Find every room, instructor and student conflict of the term.
+
+        All weekly intervals are sorted once and swept in start order;
+        each resource (room, instructor or student) keeps a heap of its
+        active intervals, so the scan is O(n log n + k).
+
+        Returns:
+            List[Dict[str, Any]]: Conflicts with 'kind', 'resource', the two
+            'courses' and a 'message'
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT DISTINCT sc.student_id, sc.course_prefix, sc.course_number
+            FROM student_courses sc
+            JOIN section_meetings sm ON sm.course_prefix = sc.course_prefix
+                AND sm.course_number = sc.course_number
+                AND sm.semester = sc.semester
+                AND sm.year = sc.year_taken
+            WHERE sc.semester = ? AND sc.year_taken = ?
+        """, (self.semester, self.year))
+        students: Dict[CourseKey, List[str]] = {}
+        for student_id, prefix, number in cursor.fetchall():
+            students.setdefault((prefix, number), []).append(student_id)
+
+        events = []
+        for course, meetings in self.meetings.items():
+            resources = [("student", student_id) for student_id in students.get(course, [])]
+            if self.instructors.get(course):
+                resources.append(("instructor", self.instructors[course]))
+            for meeting in meetings:
+                meeting_resources = resources + ([("room", meeting["room"])] if meeting["room"] else [])
+                for start, end in week_intervals(meeting):
+                    events.append((start, end, course, meeting_resources))
+        events.sort(key=lambda event: event[:2])
+
+        active: Dict[Tuple[str, str], List[Tuple[int, CourseKey]]] = {}
+        found: Dict[Tuple[str, str, CourseKey, CourseKey], Dict[str, Any]] = {}
+        for start, end, course, resources in events:
+            for resource in resources:
+                heap = active.setdefault(resource, [])
+                while heap and heap[0][0] <= start:
+                    heapq.heappop(heap)
+                for _, other in heap:
+                    if other == course:
+                        continue
+                    first, second = sorted((course, other))
+                    key = (resource[0], resource[1], first, second)
+                    if key not in found:
+                        found[key] = {
+                            "kind": resource[0],
+                            "resource": resource[1],
+                            "courses": (f"{first[0]} {first[1]}", f"{second[0]} {second[1]}"),
+                            "message": f"{resource[0].capitalize()} {resource[1]}: {first[0]} {first[1]} "
+                                       f"overlaps {second[0]} {second[1]}",
+                        }
+                heapq.heappush(heap, (end, course))
+        return sorted(found.values(), key=lambda conflict: (conflict["kind"], conflict["resource"],
+                                                            conflict["courses"]))
@@ -0,0 +1,237 @@
+import sqlite3
+from typing import Optional, Dict, List, Iterable, Tuple
+
+
+# 'S' is a satisfactory pass/fail grade; like a letter pass it satisfies a prerequisite
+PASSING_GRADES = ('A', 'B', 'C', 'D', 'S')
+
+# Tables whose changes make a cached graph stale
+GRAPH_TABLES = ('courses', 'course_prerequisites')
+
+CourseKey = Tuple[str, str]
+
+_cached_graph: Optional["PrerequisiteGraph"] = None
+_cached_version: Optional[int] = None
+
+
+def ensure_prerequisites_table(conn: sqlite3.Connection) -> None:
+    """
+    Create the course_prerequisites table if it does not exist yet, with
+    the catalog_version counter that triggers bump on every change to the
+    catalog or its prerequisites.
+
+    Args:
+        conn: Open connection to the academic management database
+    """
+    in_transaction = conn.in_transaction
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'catalog_version'")
+    version_exists = cursor.fetchone() is not None
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS course_prerequisites (
+        course_prefix TEXT NOT NULL,
+        course_number TEXT NOT NULL,
+        prereq_prefix TEXT NOT NULL,
+        prereq_number TEXT NOT NULL,
+        PRIMARY KEY (course_prefix, course_number, prereq_prefix, prereq_number)
+    )
+    ''')
+    if not version_exists:
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS catalog_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+        ''')
+        cursor.execute("INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)")
+        # Triggers catch every writer, including other processes and plain
+        # UPDATEs that leave row counts and rowids unchanged
+        for table in GRAPH_TABLES:
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_catalog_version
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE catalog_version SET version = version + 1 WHERE id = 1;
+                END
+                ''')
+    # Leave an enclosing transaction (e.g. a registration) for the caller to finish
+    if not in_transaction:
+        conn.commit()
+
+
+def get_prerequisite_graph(conn: sqlite3.Connection, refresh: bool = False) -> "PrerequisiteGraph":
+    """
+    Return the shared prerequisite graph, rebuilding it only when the
+    catalog or prerequisite tables have changed (catalog_version moved).
+
+    Args:
+        conn: Open connection to the academic management database
+        refresh: Force a rebuild even if the tables look unchanged
+
+    Returns:
+        PrerequisiteGraph: Graph with a precomputed transitive closure
+    """
+    global _cached_graph, _cached_version
+
+    ensure_prerequisites_table(conn)
+    cursor = conn.cursor()
+    cursor.execute("SELECT version FROM catalog_version WHERE id = 1")
+    version = cursor.fetchone()[0]
+
+    if refresh or _cached_graph is None or version != _cached_version:
+        _cached_graph = PrerequisiteGraph.load(conn)
+        _cached_version = version
+    return _cached_graph
+
+
+class PrerequisiteGraph:
+    """
+    Directed acyclic graph of course prerequisites.
+
+    Every course is assigned a bit position, so a set of courses is a
+    plain Python int. Direct prerequisites and the full transitive closure
+    are stored as one bitset per course, which turns eligibility checks
+    into a couple of integer operations.
+    """
+
+    def __init__(self, courses: Iterable[CourseKey], edges: Iterable[Tuple[CourseKey, CourseKey]]):
+        """
+        Build the graph and precompute its transitive closure.
+
+        Args:
+            courses: All catalog courses as (prefix, number) pairs
+            edges: (course, prerequisite) pairs
+
+        Raises:
+            ValueError: If the prerequisites contain a cycle
+        """
+        edges = list(edges)
+        keys = set(courses)
+        for course, prereq in edges:
+            keys.add(course)
+            keys.add(prereq)
+
+        self.courses: List[CourseKey] = sorted(keys)
+        self.index: Dict[CourseKey, int] = {key: i for i, key in enumerate(self.courses)}
+        self.direct: List[int] = [0] * len(self.courses)
+        for course, prereq in edges:
+            self.direct[self.index[course]] |= 1 << self.index[prereq]
+
+        self.closure: List[int] = self._compute_closure()
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection) -> "PrerequisiteGraph":
+        """Load the catalog and prerequisite edges from the database."""
+        ensure_prerequisites_table(conn)
+        cursor = conn.cursor()
+        cursor.execute("SELECT course_prefix, course_number FROM courses")
+        courses = cursor.fetchall()
+        cursor.execute("""
+            SELECT course_prefix, course_number, prereq_prefix, prereq_number
+            FROM course_prerequisites
+        """)
+        edges = [((row[0], row[1]), (row[2], row[3])) for row in cursor.fetchall()]
+        return cls(courses, edges)
+
+    def _compute_closure(self) -> List[int]:
+        """Compute ancestor bitsets in topological order (Kahn's algorithm)."""
+        count = len(self.courses)
+        dependents: List[List[int]] = [[] for _ in range(count)]
+        indegree = [0] * count
+        for course in range(count):
+            mask = self.direct[course]
+            while mask:
+                low = mask & -mask
+                prereq = low.bit_length() - 1
+                dependents[prereq].append(course)
+                indegree[course] += 1
+                mask ^= low
+
+        closure = list(self.direct)
+        ready = [course for course in range(count) if indegree[course] == 0]
+        processed = 0
+        while ready:
+            prereq = ready.pop()
+            processed += 1
+            for course in dependents[prereq]:
+                closure[course] |= closure[prereq]
+                indegree[course] -= 1
+                if indegree[course] == 0:
+                    ready.append(course)
+
+        if processed != count:
+            cyclic = [self.courses[c] for c in range(count) if indegree[c] > 0]
+            raise ValueError(f"Prerequisite cycle detected among: {cyclic}")
+        return closure
+
+    def mask_of(self, keys: Iterable[CourseKey]) -> int:
+        """Return the bitset for a collection of courses, ignoring unknown ones."""
+        mask = 0
+        for key in keys:
+            position = self.index.get(key)
+            if position is not None:
+                mask |= 1 << position
+        return mask
+
+    def courses_in(self, mask: int) -> List[CourseKey]:
+        """Return the courses contained in a bitset, in catalog order."""
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(self.courses[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+    def completed_mask(self, conn: sqlite3.Connection, student_id: str) -> int:
+        """
+        Return the bitset of courses a student has passed.
+
+        Args:
+            conn: Open connection to the academic management database
+            student_id: The student to look up
+
+        Returns:
+            int: Bitset of completed courses
+        """
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT course_prefix, course_number
+            FROM student_courses
+            WHERE student_id = ? AND grade IN ({", ".join("?" for _ in PASSING_GRADES)})
+        """, (student_id, *PASSING_GRADES))
+        return self.mask_of(cursor.fetchall())
+
+    def can_take(self, course: CourseKey, completed_mask: int) -> bool:
+        """Return True if every direct prerequisite of the course is completed."""
+        position = self.index.get(course)
+        if position is None:
+            return True
+        return self.direct[position] & ~completed_mask == 0
+
+    def missing_prerequisites(self, course: CourseKey, completed_mask: int) -> List[CourseKey]:
+        """Return every outstanding course in the prerequisite chain of a course."""
+        position = self.index.get(course)
+        if position is None:
+            return []
+        return self.courses_in(self.closure[position] & ~completed_mask)
+
+    def unlocked_after(self, completed_mask: int, term_mask: int) -> List[CourseKey]:
+        """
+        Return courses that become available once a term's courses are passed.
+
+        Args:
+            completed_mask: Courses already completed
+            term_mask: Courses being taken this term
+
+        Returns:
+            List[CourseKey]: Courses eligible afterwards that are not eligible now
+        """
+        after = completed_mask | term_mask
+        unlocked = []
+        for position, direct in enumerate(self.direct):
+            if not direct or (after >> position) & 1:
+                continue
+            if direct & ~after == 0 and direct & ~completed_mask != 0:
+                unlocked.append(self.courses[position])
+        return unlocked
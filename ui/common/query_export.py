@@ -0,0 +1,142 @@
+import csv
+import importlib.util
+import os
+import sqlite3
+from typing import Optional, Callable, Iterable, Sequence, List
+
+# Rows fetched from the cursor and written per step; memory use stays at
+# one chunk however many rows the query returns
+EXPORT_CHUNK_SIZE = 1000
+
+# Excel workbooks are written with openpyxl, an optional dependency
+XLSX_AVAILABLE = importlib.util.find_spec("openpyxl") is not None
+
+# File dialog filter for the supported formats; Excel is only offered when it can be written
+EXPORT_FILE_FILTER = "CSV Files (*.csv);;Excel Files (*.xlsx)" if XLSX_AVAILABLE else "CSV Files (*.csv)"
+
+
+class ExportCancelled(Exception):
+    """Raised when an export is cancelled; the partial file is removed."""
+
+
+class _CsvWriter:
+    def __init__(self, path: str):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+
+    def write_rows(self, rows: Iterable[Sequence]) -> None:
+        self.writer.writerows(rows)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class _XlsxWriter:
+    def __init__(self, path: str):
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise ValueError("Exporting .xlsx files requires the openpyxl package; export as CSV instead")
+        self.path = path
+        # Write-only workbooks stream rows out instead of keeping every cell
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet()
+
+    def write_rows(self, rows: Iterable[Sequence]) -> None:
+        for row in rows:
+            self.sheet.append(list(row))
+
+    def close(self) -> None:
+        self.workbook.save(self.path)
+
+
+def open_export_writer(path: str):
+    """
+    Open a row writer for path, chosen by its extension (.xlsx, otherwise CSV).
+
+    Raises:
+        ValueError: If .xlsx is asked for and openpyxl is not installed
+    """
+    if os.path.splitext(path)[1].lower() == '.xlsx':
+        return _XlsxWriter(path)
+    return _CsvWriter(path)
+
+
+def export_rows(chunks: Iterable[Sequence[Sequence]], path: str, headers: Sequence[str],
+                progress: Optional[Callable[[int], None]] = None,
+                cancelled: Optional[Callable[[], bool]] = None) -> int:
+    """
+    Write a header row and then each chunk of rows to path.
+
+    Args:
+        chunks: Row chunks, each written before the next is requested
+        path: Output file; .xlsx writes a workbook, anything else CSV
+        headers: Column names for the first row
+        progress: Called with the number of rows written after each chunk
+        cancelled: Checked before each chunk; returning True stops the export
+
+    Returns:
+        int: Number of rows written, not counting the header
+
+    Raises:
+        ExportCancelled: If cancelled() returned True
+        ValueError: If .xlsx is asked for and openpyxl is not installed
+    """
+    writer = open_export_writer(path)
+    written = 0
+    completed = False
+    try:
+        writer.write_rows([headers])
+        for chunk in chunks:
+            if cancelled and cancelled():
+                raise ExportCancelled(f"Export to {path} cancelled")
+            writer.write_rows(chunk)
+            written += len(chunk)
+            if progress:
+                progress(written)
+        completed = True
+    finally:
+        writer.close()
+        if not completed and os.path.exists(path):
+            os.remove(path)
+    return written
+
+
+def iter_chunks(cursor: sqlite3.Cursor, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Yield a cursor's remaining rows in lists of at most chunk_size."""
+    while True:
+        chunk = cursor.fetchmany(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_query(conn: sqlite3.Connection, sql: str, path: str, params: Sequence = (),
+                 headers: Optional[Sequence[str]] = None, chunk_size: int = EXPORT_CHUNK_SIZE,
+                 progress: Optional[Callable[[int], None]] = None,
+                 cancelled: Optional[Callable[[], bool]] = None) -> int:
+    """
+    Stream a query's results to a CSV or Excel file, chunk by chunk from the cursor.
+
+    Args:
+        conn: Connection to run the query on
+        sql: Query to export
+        path: Output file; .xlsx writes a workbook, anything else CSV
+        params: Query parameters
+        headers: Column names; the query's own column names are used when
+            not given or when their number does not match the query's
+        chunk_size: Rows fetched per step
+        progress: Called with the number of rows written after each chunk
+        cancelled: Checked before each chunk; returning True stops the export
+
+    Returns:
+        int: Number of rows written
+    """
+    cursor = conn.execute(sql, params)
+    columns: List[str] = [description[0] for description in cursor.description]
+    if headers is None or len(headers) != len(columns):
+        headers = columns
+    try:
+        return export_rows(iter_chunks(cursor, chunk_size), path, headers, progress, cancelled)
+    finally:
+        cursor.close()
@@ -0,0 +1,270 @@
+import sqlite3
+import time
+from typing import Optional, Dict, Any, List, Iterable, Tuple, Set
+from ui.common.prerequisite_graph import PrerequisiteGraph, get_prerequisite_graph, PASSING_GRADES
+from ui.common.instructor_load import InstructorLoadMatrix, INSTRUCTOR_CREDIT_LIMIT
+
+
+# Most credits a student may register for in a term
+MAX_TERM_CREDITS = 18
+
+# Seconds allowed for evaluating the rules of a single validation pass
+DEFAULT_TIME_BUDGET = 0.25
+
+CourseKey = Tuple[str, str]
+
+
+def format_violations(violations: List[Dict[str, Any]]) -> str:
+    """
+    Join violation messages into a single user-facing string.
+
+    Args:
+        violations: Violations returned by a RegistrationValidator
+
+    Returns:
+        str: One message per line
+    """
+    return "\n".join(violation["message"] for violation in violations)
+
+
+class RegistrationValidator:
+    """
+    Rule engine for course registrations and teaching assignments.
+
+    All data a rule needs is loaded up front with a few set-based queries,
+    after which a whole proposed schedule (a student's term, or a term's
+    instructor assignments) is checked in a single in-memory pass.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, time_budget: float = DEFAULT_TIME_BUDGET):
+        """
+        Initialize the validator and preload the course catalog.
+
+        Args:
+            conn: Open connection to the academic management database
+            time_budget: Seconds allowed for rule evaluation in one pass
+        """
+        self.conn = conn
+        self.time_budget = time_budget
+        self.course_credits: Dict[CourseKey, int] = {}
+        self.prerequisites: Optional[PrerequisiteGraph] = None
+        self._load_catalog()
+
+    def _load_catalog(self) -> None:
+        """Load course credits and the shared prerequisite graph."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT course_prefix, course_number, credits FROM courses")
+        self.course_credits = {(prefix, number): int(credits or 0)
+                               for prefix, number, credits in cursor.fetchall()}
+        self.prerequisites = get_prerequisite_graph(self.conn)
+
+    def validate_student_schedule(self, student_id: str,
+                                  proposed_courses: Iterable[CourseKey],
+                                  semester: str, year: int) -> List[Dict[str, Any]]:
+        """
+        Validate a student's proposed courses for one term.
+
+        Checks duplicate registrations, the term credit cap and
+        prerequisite satisfaction against the student's history.
+
+        Args:
+            student_id: The student being registered
+            proposed_courses: (prefix, number) pairs to add to the term
+            semester: Semester code ('S', 'U' or 'F')
+            year: Calendar year of the term
+
+        Returns:
+            List[Dict[str, Any]]: Rule violations, empty when the schedule is valid
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT course_prefix, course_number, semester, year_taken, grade
+            FROM student_courses
+            WHERE student_id = ?
+        """, (student_id,))
+
+        term_courses: Set[CourseKey] = set()
+        completed: Set[CourseKey] = set()
+        for prefix, number, row_semester, row_year, grade in cursor.fetchall():
+            key = (prefix, number)
+            if row_semester == semester and str(row_year) == str(year):
+                term_courses.add(key)
+            elif grade in PASSING_GRADES:
+                completed.add(key)
+
+        context = {
+            "student_id": student_id,
+            "proposed": list(proposed_courses),
+            "term_courses": term_courses,
+            "completed": completed,
+        }
+        rules = [
+            self._check_student_duplicates,
+            self._check_term_credit_cap,
+            self._check_prerequisites,
+        ]
+        return self._run_rules(rules, context)
+
+    def validate_term_sections(self, sections: Iterable[Dict[str, Any]],
+                               semester: str, year: int) -> List[Dict[str, Any]]:
+        """
+        Validate sections being scheduled or reassigned in one term.
+
+        Each section is a dict with 'prefix', 'number' and 'instructor_id'
+        (None for TBA). Sections flagged with 'replaces_existing' reassign
+        sections already on the schedule: the one instructor_courses row
+        given as 'section_id', or else every row of the course in the term.
+        They are not duplicates, and the credits of the rows they replace
+        no longer count towards those rows' instructors.
+
+        Instructor loads and limits come from an InstructorLoadMatrix, so
+        an instructor's availability for the term lowers their limit.
+
+        Args:
+            sections: Proposed sections for the term
+            semester: Semester code ('S', 'U' or 'F')
+            year: Calendar year of the term
+
+        Returns:
+            List[Dict[str, Any]]: Rule violations, empty when the assignments are valid
+        """
+        sections = list(sections)
+        replaced_ids = {s["section_id"] for s in sections
+                        if s.get("replaces_existing") and s.get("section_id") is not None}
+        replaced_courses = {(s["prefix"], s["number"]) for s in sections
+                            if s.get("replaces_existing") and s.get("section_id") is None}
+
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT ic.id, ic.instructor_id, ic.course_prefix, ic.course_number, c.credits
+            FROM instructor_courses ic
+            JOIN courses c ON ic.course_prefix = c.course_prefix
+                AND ic.course_number = c.course_number
+            WHERE ic.semester = ? AND ic.year_taught = ?
+        """, (semester, year))
+
+        scheduled: Set[CourseKey] = set()
+        replaced_loads = []
+        for row_id, instructor_id, prefix, number, credits in cursor.fetchall():
+            scheduled.add((prefix, number))
+            if instructor_id and (row_id in replaced_ids or (prefix, number) in replaced_courses):
+                replaced_loads.append((instructor_id, int(credits or 0)))
+
+        instructor_ids = {s["instructor_id"] for s in sections if s.get("instructor_id")}
+        loads = InstructorLoadMatrix(self.conn, [(semester, year)], instructor_ids)
+        for instructor_id, credits in replaced_loads:
+            loads.record(instructor_id, semester, year, -credits)
+
+        context = {
+            "sections": sections,
+            "scheduled": scheduled,
+            "semester": semester,
+            "year": year,
+            "loads": loads,
+        }
+        rules = [
+            self._check_section_duplicates,
+            self._check_instructor_credit_limit,
+        ]
+        return self._run_rules(rules, context)
+
+    def _run_rules(self, rules, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Evaluate rules in order within the configured time budget.
+
+        A pass that runs over budget stops early and reports a
+        'time_budget' violation so callers never accept a partially
+        validated schedule.
+        """
+        violations: List[Dict[str, Any]] = []
+        start = time.perf_counter()
+        for rule in rules:
+            violations.extend(rule(context))
+            elapsed = time.perf_counter() - start
+            if elapsed > self.time_budget:
+                violations.append({
+                    "rule": "time_budget",
+                    "message": "Validation did not finish within its time budget. Please try again.",
+                    "elapsed": round(elapsed, 4),
+                })
+                break
+        return violations
+
+    def _check_student_duplicates(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        violations = []
+        seen = set(context["term_courses"])
+        for key in context["proposed"]:
+            if key in seen:
+                violations.append({
+                    "rule": "duplicate_registration",
+                    "message": f"Student is already registered for {key[0]} {key[1]} in the selected semester.",
+                    "course": f"{key[0]} {key[1]}",
+                })
+            seen.add(key)
+        return violations
+
+    def _check_term_credit_cap(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        keys = set(context["term_courses"]) | set(context["proposed"])
+        total = sum(self.course_credits.get(key, 0) for key in keys)
+        if total > MAX_TERM_CREDITS:
+            return [{
+                "rule": "term_credit_cap",
+                "message": f"Registration would bring the term to {total} credits "
+                           f"(maximum {MAX_TERM_CREDITS}).",
+                "credits": total,
+            }]
+        return []
+
+    def _check_prerequisites(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        violations = []
+        completed_mask = self.prerequisites.mask_of(context["completed"])
+        for key in context["proposed"]:
+            if self.prerequisites.can_take(key, completed_mask):
+                continue
+            missing = self.prerequisites.missing_prerequisites(key, completed_mask)
+            missing_text = ", ".join(f"{prefix} {number}" for prefix, number in missing)
+            violations.append({
+                "rule": "missing_prerequisite",
+                "message": f"{key[0]} {key[1]} requires: {missing_text}.",
+                "course": f"{key[0]} {key[1]}",
+                "missing": missing_text,
+            })
+        return violations
+
+    def _check_section_duplicates(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        violations = []
+        seen = set(context["scheduled"])
+        for section in context["sections"]:
+            if section.get("replaces_existing"):
+                continue
+            key = (section["prefix"], section["number"])
+            if key in seen:
+                violations.append({
+                    "rule": "duplicate_section",
+                    "message": f"{key[0]} {key[1]} is already scheduled for the selected semester.",
+                    "course": f"{key[0]} {key[1]}",
+                })
+            seen.add(key)
+        return violations
+
+    def _check_instructor_credit_limit(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        violations = []
+        loads: InstructorLoadMatrix = context["loads"]
+        term = (context["semester"], context["year"])
+        for section in context["sections"]:
+            instructor_id = section.get("instructor_id")
+            if not instructor_id:
+                continue
+            credits = self.course_credits.get((section["prefix"], section["number"]), 0)
+            if not loads.can_assign(instructor_id, *term, credits):
+                limit = loads.limit(instructor_id, *term)
+                violations.append({
+                    "rule": "instructor_credit_limit",
+                    "message": f"Instructor {instructor_id} would exceed {limit} "
+                               f"credit hours for the semester.",
+                    "instructor_id": instructor_id,
+                    "current_credits": loads.load(instructor_id, *term),
+                    "attempted_add": credits,
+                })
+            loads.record(instructor_id, *term, credits)
+        return violations
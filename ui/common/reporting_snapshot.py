@@ -0,0 +1,135 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Callable, List
+
+from ui.common.db import get_db_path
+from ui.common.section_enrollment import ensure_section_enrollment_table
+
+# Seconds between snapshots while a refresher runs
+SNAPSHOT_INTERVAL = 300
+# Snapshots older than this are not used; reports then read the live database
+SNAPSHOT_MAX_AGE = 3 * SNAPSHOT_INTERVAL
+
+
+def get_snapshot_path(db_path: Optional[str] = None) -> str:
+    """Return the reporting snapshot's path, next to the database it copies."""
+    return os.path.join(os.path.dirname(db_path or get_db_path()), "reporting_snapshot.db")
+
+
+def create_snapshot(db_path: Optional[str] = None, snapshot_path: Optional[str] = None) -> str:
+    """
+    Copy the database into the reporting snapshot.
+
+    The copy is made with the SQLite backup API in a single step, so it is
+    consistent: registrations committed during the copy wait for it (it
+    takes milliseconds at this database's size) instead of being half
+    included. The copy is written to a temporary file and then renamed
+    over the old snapshot, so readers never see a partial file.
+
+    Args:
+        db_path: Database to copy, defaults to the application database
+        snapshot_path: Snapshot file, defaults to get_snapshot_path()
+
+    Returns:
+        str: The snapshot's path
+    """
+    db_path = db_path or get_db_path()
+    snapshot_path = snapshot_path or get_snapshot_path(db_path)
+    # Unique per writer, in case two refreshers run at once
+    temporary_path = f"{snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    source = sqlite3.connect(db_path)
+    try:
+        # Reports create this table on first use, which a read-only snapshot cannot do
+        ensure_section_enrollment_table(source)
+        target = sqlite3.connect(temporary_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+    finally:
+        source.close()
+    os.replace(temporary_path, snapshot_path)
+    return snapshot_path
+
+
+def snapshot_time(snapshot_path: Optional[str] = None) -> Optional[datetime]:
+    """Return when the snapshot was taken, or None if there is none."""
+    snapshot_path = snapshot_path or get_snapshot_path()
+    if not os.path.exists(snapshot_path):
+        return None
+    return datetime.fromtimestamp(os.path.getmtime(snapshot_path))
+
+
+def connect_reporting(db_path: Optional[str] = None, max_age: float = SNAPSHOT_MAX_AGE) -> sqlite3.Connection:
+    """
+    Open a connection for reports: a read-only one to the snapshot if it
+    is younger than max_age seconds, otherwise one to the live database.
+
+    Reports read through this never hold locks on the live database while
+    a snapshot is fresh, so long scans do not delay registrations.
+    """
+    db_path = db_path or get_db_path()
+    snapshot_path = get_snapshot_path(db_path)
+    taken = snapshot_time(snapshot_path)
+    if taken is not None and (datetime.now() - taken).total_seconds() <= max_age:
+        return sqlite3.connect(f"file:{snapshot_path}?mode=ro", uri=True)
+    return sqlite3.connect(db_path)
+
+
+class SnapshotRefresher:
+    """
+    Takes a snapshot on a background thread every `interval` seconds.
+
+    The first snapshot is taken right away. on_snapshot, if given, is
+    called on the refresher's thread after each snapshot with its time.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, interval: float = SNAPSHOT_INTERVAL,
+                 on_snapshot: Optional[Callable[[datetime], None]] = None):
+        self.db_path = db_path or get_db_path()
+        self.interval = interval
+        self.on_snapshot = on_snapshot
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                snapshot_path = create_snapshot(self.db_path)
+                if self.on_snapshot:
+                    self.on_snapshot(snapshot_time(snapshot_path))
+            except (sqlite3.Error, OSError) as e:
+                print(f"Failed to create reporting snapshot: {e}")
+            self._stopped.wait(self.interval)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Create the reporting snapshot once or periodically.")
+    parser.add_argument("--db", default=None, help="database path, defaults to data/academic_management.db")
+    parser.add_argument("--every", type=float, metavar="SECONDS", help="keep taking snapshots at this interval")
+    args = parser.parse_args(argv)
+
+    while True:
+        started = time.perf_counter()
+        snapshot_path = create_snapshot(args.db)
+        print(f"Snapshot {snapshot_path} taken in {(time.perf_counter() - started) * 1000:.1f} ms")
+        if not args.every:
+            return
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
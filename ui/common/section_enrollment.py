@@ -0,0 +1,99 @@
+import sqlite3
+from typing import Iterable, Tuple
+
+SectionKey = Tuple[str, str, str, int]
+
+# Grade points used for section averages (S/U pass-fail and I incomplete included)
+SECTION_GRADE_POINTS = {'A': 4, 'S': 4, 'B': 3, 'C': 2, 'D': 1, 'F': 0, 'U': 0, 'I': 0}
+
+_SECTION_TOTALS_SELECT = f"""
+    SELECT course_prefix, course_number, semester, year_taken,
+           COUNT(DISTINCT student_id),
+           COUNT(CASE WHEN grade IN ({", ".join(f"'{g}'" for g in SECTION_GRADE_POINTS)}) THEN 1 END),
+           COALESCE(SUM(CASE grade {" ".join(f"WHEN '{g}' THEN {p}" for g, p in SECTION_GRADE_POINTS.items())} END), 0)
+    FROM student_courses
+"""
+
+
+def ensure_section_enrollment_table(conn: sqlite3.Connection) -> None:
+    """
+    Create the section_enrollment counter table, filling it from
+    student_courses the first time it is created.
+
+    Args:
+        conn: Open connection to the academic management database
+    """
+    in_transaction = conn.in_transaction
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'section_enrollment'")
+    exists = cursor.fetchone() is not None
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS section_enrollment (
+        course_prefix TEXT NOT NULL,
+        course_number TEXT NOT NULL,
+        semester TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        enrolled INTEGER NOT NULL DEFAULT 0,
+        graded INTEGER NOT NULL DEFAULT 0,
+        grade_points INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (course_prefix, course_number, semester, year)
+    )
+    ''')
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_student_courses_section
+    ON student_courses (course_prefix, course_number, semester, year_taken)
+    ''')
+    if not exists:
+        rebuild_section_enrollment(conn)
+    if not in_transaction:
+        conn.commit()
+
+
+def rebuild_section_enrollment(conn: sqlite3.Connection) -> None:
+    """Recompute every section counter from student_courses (e.g. after an import)."""
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM section_enrollment")
+    cursor.execute(f"""
+        INSERT INTO section_enrollment
+        (course_prefix, course_number, semester, year, enrolled, graded, grade_points)
+        {_SECTION_TOTALS_SELECT}
+        GROUP BY course_prefix, course_number, semester, year_taken
+    """)
+
+
+def refresh_sections(conn: sqlite3.Connection, sections: Iterable[SectionKey]) -> None:
+    """
+    Recompute the counters of specific sections, e.g. after grades change.
+    Does not commit, so it can share the caller's transaction.
+    """
+    cursor = conn.cursor()
+    for prefix, number, semester, year in set(sections):
+        cursor.execute(f"""
+            INSERT OR REPLACE INTO section_enrollment
+            (course_prefix, course_number, semester, year, enrolled, graded, grade_points)
+            {_SECTION_TOTALS_SELECT}
+            WHERE course_prefix = ? AND course_number = ? AND semester = ? AND year_taken = ?
+            GROUP BY course_prefix, course_number, semester, year_taken
+        """, (prefix, number, semester, year))
+
+
+def adjust_enrollment(conn: sqlite3.Connection, section: SectionKey, delta: int) -> None:
+    """
+    Add delta to a section's enrolled count when a student registers (+1)
+    or drops (-1). Does not commit, so it can share the caller's transaction.
+
+    Call it before changing student_courses: if the counter table is
+    created here, its initial build must not include the change yet.
+    """
+    prefix, number, semester, year = section
+    ensure_section_enrollment_table(conn)
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT OR IGNORE INTO section_enrollment (course_prefix, course_number, semester, year)
+        VALUES (?, ?, ?, ?)
+    """, (prefix, number, semester, year))
+    cursor.execute("""
+        UPDATE section_enrollment
+        SET enrolled = MAX(enrolled + ?, 0)
+        WHERE course_prefix = ? AND course_number = ? AND semester = ? AND year = ?
+    """, (delta, prefix, number, semester, year))
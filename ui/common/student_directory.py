@@ -0,0 +1,150 @@
+import sqlite3
+from typing import Optional, Any, List, Tuple
+
+# Columns the directory can be sorted by, in display order, with their SQL
+# sort expressions (NULLs sort as empty text so keyset comparisons work)
+SORT_COLUMNS = {
+    "student_id": "s.student_id",
+    "gender": "COALESCE(s.gender, '')",
+    "major": "COALESCE(s.major, '')",
+}
+PAGE_SIZE = 100
+
+PageKey = Tuple[Any, str]
+
+
+def ensure_student_directory_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Create the index the directory pages through.
+
+    department_majors is already indexed by its UNIQUE (department_id,
+    major_name) constraint; students are looked up by major and ordered
+    by student_id within it.
+
+    Args:
+        conn: Open connection to the academic management database
+    """
+    in_transaction = conn.in_transaction
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_students_major_student_id ON students (major, student_id)")
+    if not in_transaction:
+        conn.commit()
+
+
+def _like_pattern(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class StudentDirectory:
+    """
+    Paged, sortable and searchable list of the students in a department's
+    majors.
+
+    Filtering, sorting and paging all happen in SQL, so only one page of
+    students is ever loaded. Pages are addressed by keyset (the sort value
+    and student ID of the last row shown) rather than OFFSET, so moving to
+    the next or previous page costs the same however deep into the list
+    it is.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, department_id: str, page_size: int = PAGE_SIZE):
+        """
+        Initialize the directory for a department.
+
+        Args:
+            conn: Open connection to the academic management database
+            department_id: Department whose majors' students are listed
+            page_size: Number of students per page
+        """
+        self.conn = conn
+        self.department_id = department_id
+        self.page_size = page_size
+        ensure_student_directory_indexes(conn)
+
+    def _filter(self, search: str) -> Tuple[str, List[Any]]:
+        sql = """
+            FROM students s
+            JOIN department_majors dm ON s.major = dm.major_name
+            WHERE dm.department_id = ?
+        """
+        params: List[Any] = [self.department_id]
+        search = search.strip()
+        if search:
+            sql += """
+                AND (s.student_id LIKE ? ESCAPE '\\' OR s.major LIKE ? ESCAPE '\\'
+                     OR s.gender LIKE ? ESCAPE '\\')
+            """
+            params += [_like_pattern(search)] * 3
+        return sql, params
+
+    def count(self, search: str = "") -> int:
+        """Return the number of students matching a search."""
+        sql, params = self._filter(search)
+        return self.conn.execute(f"SELECT COUNT(*) {sql}", params).fetchone()[0]
+
+    def page(self, search: str = "", sort: str = "student_id", descending: bool = False,
+             after: Optional[PageKey] = None, before: Optional[PageKey] = None) -> List[Tuple[str, str, str]]:
+        """
+        Return one page of students.
+
+        Args:
+            search: Text matched anywhere in the student ID, major or gender
+            sort: Key of SORT_COLUMNS to order by (ties are ordered by student ID)
+            descending: Sort in descending order
+            after: Key of the last row of the current page, to get the next page
+            before: Key of the first row of the current page, to get the previous page
+
+        Returns:
+            List[Tuple[str, str, str]]: (student_id, gender, major) rows in display order
+
+        Raises:
+            ValueError: If sort is not a key of SORT_COLUMNS
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort the student directory by '{sort}'")
+        sort_expr = SORT_COLUMNS[sort]
+        sql, params = self._filter(search)
+
+        # Fetching the previous page walks the order backwards from its first row
+        backwards = before is not None
+        reverse = descending != backwards
+        direction = "DESC" if reverse else "ASC"
+        key = before if backwards else after
+        if key is not None:
+            sql += f" AND ({sort_expr}, s.student_id) {'<' if reverse else '>'} (?, ?)"
+            params += list(key)
+
+        rows = self.conn.execute(f"""
+            SELECT s.student_id, s.gender, s.major
+            {sql}
+            ORDER BY {sort_expr} {direction}, s.student_id {direction}
+            LIMIT ?
+        """, params + [self.page_size]).fetchall()
+        if backwards:
+            rows.reverse()
+        return rows
+
+    def listing(self, search: str = "", sort: str = "student_id",
+                descending: bool = False) -> Tuple[str, List[Any]]:
+        """
+        Return the query listing every student matching a search in
+        display order, with its parameters, e.g. to stream an export.
+
+        Raises:
+            ValueError: If sort is not a key of SORT_COLUMNS
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort the student directory by '{sort}'")
+        sql, params = self._filter(search)
+        direction = "DESC" if descending else "ASC"
+        return f"""
+            SELECT s.student_id, s.gender, s.major
+            {sql}
+            ORDER BY {SORT_COLUMNS[sort]} {direction}, s.student_id {direction}
+        """, params
+
+    @staticmethod
+    def key(row: Tuple[str, str, str], sort: str = "student_id") -> PageKey:
+        """Return the keyset position of a row returned by page()."""
+        value = row[list(SORT_COLUMNS).index(sort)]
+        return ("" if value is None else value, row[0])
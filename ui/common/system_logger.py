@@ -36,17 +36,17 @@ class SystemLogger:
     Handles logging for all user roles and operation types.
     """
 
-    def __init__(self, user_id: str, role: UserRole):
+    def __init__(self, session):
         """
-        Initialize the logger with user information.
+        Initialize the logger with the logged-in user's session.
 
         Args:
-            user_id: The user's ID in the system
-            role: UserRole enum indicating the user's role
+            session: UserSession created at login
         """
-        self.user_id = user_id
-        self.role = role
-        self.role_prefix = role.name.lower()
+        self.session = session
+        self.user_id = session.user_id
+        self.role = session.user_role
+        self.role_prefix = self.role.name.lower()
         self.db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
                                     'data', 'academic_management.db')
 
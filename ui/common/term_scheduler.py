@@ -0,0 +1,192 @@
+import sqlite3
+from typing import Optional, Dict, Any, List, Set, Tuple
+
+from ui.common.registration_rules import RegistrationValidator
+from ui.common.instructor_load import InstructorLoadMatrix, refresh_instructor_loads
+
+# Maximum number of earlier placements moved to make room for one section
+REPAIR_DEPTH = 2
+
+
+class TermScheduler:
+    """
+    Assigns instructors to a department's unassigned (TBA) sections for
+    one term.
+
+    Sections are placed largest first on the eligible instructor with the
+    lowest resulting load, preferring instructors who have taught the
+    course before. A section that fits nobody triggers a repair step: an
+    augmenting-path search, as in bipartite matching, that moves sections
+    planned earlier in the run between instructors until one has room.
+    Nothing is written until apply() is called with the plan.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, department_id: str, semester: str, year: int):
+        """
+        Initialize the scheduler and load the term's sections and loads.
+
+        Args:
+            conn: Open connection to the academic management database
+            department_id: Department whose sections are scheduled
+            semester: Semester code ('S', 'U' or 'F')
+            year: Calendar year of the term
+        """
+        self.conn = conn
+        self.department_id = department_id
+        self.semester = semester
+        self.year = year
+        self._load()
+
+    def _load(self) -> None:
+        cursor = self.conn.cursor()
+
+        # Unassigned sections of the department in this term
+        cursor.execute("""
+            SELECT ic.id, ic.course_prefix, ic.course_number, COALESCE(c.credits, 0)
+            FROM instructor_courses ic
+            JOIN courses c ON ic.course_prefix = c.course_prefix
+                AND ic.course_number = c.course_number
+            JOIN department_course_prefixes dcp ON c.course_prefix = dcp.course_prefix
+            WHERE dcp.department_id = ? AND ic.semester = ? AND ic.year_taught = ?
+                AND ic.instructor_id IS NULL
+            ORDER BY ic.course_prefix, ic.course_number
+        """, (self.department_id, self.semester, self.year))
+        self.sections = [{"id": row_id, "prefix": prefix, "number": number, "credits": int(credits)}
+                         for row_id, prefix, number, credits in cursor.fetchall()]
+
+        # Department instructors with their term cap and current load across all departments
+        cursor.execute("SELECT instructor_id FROM instructors WHERE department_id = ? ORDER BY instructor_id",
+                       (self.department_id,))
+        instructor_ids = [row[0] for row in cursor.fetchall()]
+        matrix = InstructorLoadMatrix(self.conn, [(self.semester, self.year)], instructor_ids)
+        self.capacity: Dict[str, int] = {}
+        self.base_loads: Dict[str, int] = {}
+        for instructor_id in instructor_ids:
+            self.capacity[instructor_id] = matrix.limit(instructor_id, self.semester, self.year)
+            self.base_loads[instructor_id] = matrix.load(instructor_id, self.semester, self.year)
+
+        # Courses each instructor has taught before, used as a preference
+        cursor.execute("""
+            SELECT DISTINCT ic.instructor_id, ic.course_prefix, ic.course_number
+            FROM instructor_courses ic
+            JOIN instructors i ON ic.instructor_id = i.instructor_id
+            WHERE i.department_id = ?
+        """, (self.department_id,))
+        self.experience: Set[Tuple[str, str, str]] = set(cursor.fetchall())
+
+    def plan(self) -> Dict[str, Any]:
+        """
+        Compute an assignment without writing it (dry run).
+
+        Returns:
+            Dict[str, Any]: 'assignments' (section dicts with an
+            'instructor_id'), 'unassigned' sections and resulting 'loads'
+        """
+        loads = dict(self.base_loads)
+        assigned: Dict[int, str] = {}
+        unassigned = []
+        by_id = {section["id"]: section for section in self.sections}
+
+        def best_instructor(section: Dict[str, Any]) -> Optional[str]:
+            candidates = [instructor_id for instructor_id in self.capacity
+                          if loads[instructor_id] + section["credits"] <= self.capacity[instructor_id]]
+            if not candidates:
+                return None
+            return min(candidates, key=lambda instructor_id: (
+                (instructor_id, section["prefix"], section["number"]) not in self.experience,
+                loads[instructor_id] + section["credits"],
+                instructor_id,
+            ))
+
+        for section in sorted(self.sections, key=lambda s: (-s["credits"], s["prefix"], s["number"])):
+            instructor_id = best_instructor(section)
+            if instructor_id is not None:
+                assigned[section["id"]] = instructor_id
+                loads[instructor_id] += section["credits"]
+            elif (sum(self.capacity.values()) - sum(loads.values()) < section["credits"]
+                  or not self._repair(section, assigned, by_id, loads, set())):
+                # Moving sections around never creates capacity, only defragments it
+                unassigned.append(section)
+
+        assignments = [dict(by_id[section_id], instructor_id=instructor_id)
+                       for section_id, instructor_id in assigned.items()]
+        assignments.sort(key=lambda s: (s["prefix"], s["number"], s["id"]))
+        return {"assignments": assignments, "unassigned": unassigned, "loads": loads}
+
+    def _repair(self, section: Dict[str, Any], assigned: Dict[int, str], by_id: Dict[int, Dict[str, Any]],
+                loads: Dict[str, int], moved: Set[int], depth: int = 0) -> bool:
+        """
+        Place a section by following an augmenting path: bump a section
+        planned earlier in this run off an instructor to make room, then
+        re-place the bumped section the same way. Each section is bumped
+        at most once per path and paths are at most REPAIR_DEPTH long.
+        """
+        for instructor_id in self.capacity:
+            if loads[instructor_id] + section["credits"] <= self.capacity[instructor_id]:
+                assigned[section["id"]] = instructor_id
+                loads[instructor_id] += section["credits"]
+                return True
+        if depth >= REPAIR_DEPTH:
+            return False
+
+        tried = set()
+        for bumped_id, holder in list(assigned.items()):
+            bumped = by_id[bumped_id]
+            # Bumping equal-credit sections off the same instructor is equivalent
+            if bumped_id in moved or bumped["credits"] == section["credits"] or (holder, bumped["credits"]) in tried:
+                continue
+            tried.add((holder, bumped["credits"]))
+            if loads[holder] - bumped["credits"] + section["credits"] > self.capacity[holder]:
+                continue
+            # Swap the section in, then try to find a new home for the bumped one
+            del assigned[bumped_id]
+            loads[holder] += section["credits"] - bumped["credits"]
+            assigned[section["id"]] = holder
+            if self._repair(bumped, assigned, by_id, loads, moved | {section["id"]}, depth + 1):
+                return True
+            del assigned[section["id"]]
+            loads[holder] -= section["credits"] - bumped["credits"]
+            assigned[bumped_id] = holder
+        return False
+
+    def apply(self, plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Write a plan's assignments in one transaction.
+
+        The plan is re-validated against the current schedule inside the
+        transaction, so concurrent changes cannot push an instructor over
+        the credit limit; on any violation nothing is written.
+
+        Args:
+            plan: Result of plan()
+
+        Returns:
+            List[Dict[str, Any]]: Rule violations, empty when the plan was applied
+        """
+        assignments = plan["assignments"]
+        if not assignments:
+            return []
+
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("BEGIN TRANSACTION")
+            violations = RegistrationValidator(self.conn).validate_term_sections(
+                [{"prefix": s["prefix"], "number": s["number"], "instructor_id": s["instructor_id"],
+                  "replaces_existing": True, "section_id": s["id"]} for s in assignments],
+                self.semester, self.year
+            )
+            if violations:
+                self.conn.rollback()
+                return violations
+
+            cursor.executemany("""
+                UPDATE instructor_courses
+                SET instructor_id = ?
+                WHERE id = ? AND instructor_id IS NULL
+            """, [(s["instructor_id"], s["id"]) for s in assignments])
+            refresh_instructor_loads(self.conn, [(self.semester, self.year)])
+            self.conn.commit()
+            return []
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
@@ -0,0 +1,267 @@
+import argparse
+import os
+import sqlite3
+import zlib
+from datetime import date
+from multiprocessing import Pool
+from typing import Optional, Dict, Any, List, Tuple
+
+from ui.common.academic_service import fetch_student_record, compute_transcript
+from ui.common.db import get_db_path
+from ui.common.degree_audit import ensure_requirement_tables
+
+# US Letter, in points
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 72
+LINE_HEIGHT = 14
+
+# x positions of the course, credits and grade columns
+COLUMNS = (MARGIN, 330, 420)
+
+# Built-in PDF fonts, so no font files are embedded
+REGULAR_FONT = "F1"
+BOLD_FONT = "F2"
+FONTS = {REGULAR_FONT: "Helvetica", BOLD_FONT: "Helvetica-Bold"}
+
+# A placed piece of text: x, y, font, size, text
+Line = Tuple[float, float, str, int, str]
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def layout_transcript(transcript: Dict[str, Any], issued: str) -> List[List[Line]]:
+    """
+    Place a transcript's text on pages.
+
+    Args:
+        transcript: Result of compute_transcript()
+        issued: Issue date printed in the header
+
+    Returns:
+        List[List[Line]]: The text of each page
+    """
+    student_id, _, major = transcript['info']
+    pages: List[List[Line]] = []
+    y = 0.0
+
+    def new_page():
+        nonlocal y
+        pages.append([
+            (MARGIN, PAGE_HEIGHT - MARGIN, BOLD_FONT, 16, "Official Academic Transcript"),
+            (MARGIN, PAGE_HEIGHT - MARGIN - 22, REGULAR_FONT, 10,
+             f"Student ID: {student_id}    Major: {major}    Issued: {issued}"),
+            (COLUMNS[0], PAGE_HEIGHT - MARGIN - 48, BOLD_FONT, 10, "Course"),
+            (COLUMNS[1], PAGE_HEIGHT - MARGIN - 48, BOLD_FONT, 10, "Credits"),
+            (COLUMNS[2], PAGE_HEIGHT - MARGIN - 48, BOLD_FONT, 10, "Grade"),
+        ])
+        y = PAGE_HEIGHT - MARGIN - 48 - 2 * LINE_HEIGHT
+
+    def add(x, font, text, size=10):
+        pages[-1].append((x, y, font, size, text))
+
+    new_page()
+    for semester in transcript['semesters']:
+        # A term is never split across pages
+        needed = (len(semester['courses']) + 3) * LINE_HEIGHT
+        if y - needed < MARGIN:
+            new_page()
+
+        add(COLUMNS[0], BOLD_FONT, f"{semester['term']} {semester['year']}")
+        y -= LINE_HEIGHT
+        for course in semester['courses']:
+            add(COLUMNS[0], REGULAR_FONT, f"{course['prefix']} {course['number']}")
+            add(COLUMNS[1], REGULAR_FONT, str(course['credits']))
+            add(COLUMNS[2], REGULAR_FONT, course['grade'] or "-")
+            y -= LINE_HEIGHT
+        add(COLUMNS[0], REGULAR_FONT,
+            f"Semester Credits: {semester['semester_credits']}    "
+            f"Semester GPA: {semester['semester_gpa']:.2f}    "
+            f"Cumulative GPA: {semester['cumulative_gpa']:.2f}", size=9)
+        y -= 2 * LINE_HEIGHT
+
+    if y - 2 * LINE_HEIGHT < MARGIN:
+        new_page()
+    add(COLUMNS[0], BOLD_FONT, f"Total Graded Credits: {transcript['total_credits']}    "
+                               f"Cumulative GPA: {transcript['cumulative_gpa']:.2f}")
+
+    for number, page in enumerate(pages, 1):
+        page.append((PAGE_WIDTH - MARGIN - 60, MARGIN / 2, REGULAR_FONT, 8, f"Page {number} of {len(pages)}"))
+    return pages
+
+
+def render_pdf(pages: List[List[Line]]) -> bytes:
+    """Write laid-out pages as a PDF document, with compressed page contents."""
+    objects: List[bytes] = []
+
+    def add_object(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font_refs = {name: add_object(f"<< /Type /Font /Subtype /Type1 /BaseFont /{base} "
+                                  f"/Encoding /WinAnsiEncoding >>".encode())
+                 for name, base in FONTS.items()}
+    resources = " ".join(f"/{name} {ref} 0 R" for name, ref in font_refs.items())
+    # The page tree is written after its pages, whose /Parent must point at it
+    pages_ref = len(objects) + 2 * len(pages) + 1
+
+    page_refs = []
+    for page in pages:
+        content = "\n".join(f"BT /{font} {size} Tf {x:.1f} {y:.1f} Td ({_escape(text)}) Tj ET"
+                            for x, y, font, size, text in page)
+        stream = zlib.compress(content.encode("cp1252", "replace"))
+        content_ref = add_object(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream)
+                                 + stream + b"\nendstream")
+        page_refs.append(add_object(
+            f"<< /Type /Page /Parent {pages_ref} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << {resources} >> >> /Contents {content_ref} 0 R >>".encode()))
+
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs)
+    add_object(f"<< /Type /Pages /Kids [{kids}] /Count {len(page_refs)} >>".encode())
+    catalog_ref = add_object(f"<< /Type /Catalog /Pages {pages_ref} 0 R >>".encode())
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for ref, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % ref + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_ref, xref_offset)
+    return bytes(output)
+
+
+def render_transcript_pdf(transcript: Dict[str, Any], issued: Optional[str] = None) -> bytes:
+    """
+    Render a transcript (see compute_transcript()) as a PDF document.
+
+    Args:
+        transcript: The computed transcript
+        issued: Issue date printed on every page, defaults to today
+    """
+    return render_pdf(layout_transcript(transcript, issued or date.today().isoformat()))
+
+
+def write_transcript_pdf(conn: sqlite3.Connection, student_id: str, out_dir: str,
+                         issued: Optional[str] = None) -> Optional[str]:
+    """
+    Fetch, compute and render one student's transcript into out_dir.
+
+    Returns:
+        Optional[str]: The PDF's path, or None if the student does not exist
+    """
+    record = fetch_student_record(conn, student_id)
+    if record['info'] is None:
+        return None
+    path = os.path.join(out_dir, f"transcript_{student_id}.pdf")
+    with open(path, 'wb') as pdf_file:
+        pdf_file.write(render_transcript_pdf(compute_transcript(record), issued))
+    return path
+
+
+def select_graduating_class(conn: sqlite3.Connection, department_id: Optional[str] = None,
+                            major: Optional[str] = None) -> List[str]:
+    """
+    Return the students whose last degree audit found every requirement met,
+    optionally only those of one department or major.
+
+    Audits are stored by degree_audit.audit_department(), so run it first
+    for an up-to-date class.
+    """
+    ensure_requirement_tables(conn)
+    query = """
+        SELECT DISTINCT s.student_id
+        FROM students s
+        JOIN degree_audits da ON s.student_id = da.student_id
+        LEFT JOIN department_majors dm ON s.major = dm.major_name
+        WHERE da.is_complete = 1
+    """
+    params = []
+    if department_id:
+        query += " AND dm.department_id = ?"
+        params.append(department_id)
+    if major:
+        query += " AND s.major = ?"
+        params.append(major)
+    cursor = conn.execute(query + " ORDER BY s.student_id", params)
+    return [row[0] for row in cursor.fetchall()]
+
+
+# Per-process state for batch rendering
+_worker_conn: Optional[sqlite3.Connection] = None
+_worker_out_dir = ""
+_worker_issued = ""
+
+
+def _init_worker(db_path: str, out_dir: str, issued: str) -> None:
+    global _worker_conn, _worker_out_dir, _worker_issued
+    _worker_conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    _worker_out_dir = out_dir
+    _worker_issued = issued
+
+
+def _render_in_worker(student_id: str) -> Optional[str]:
+    return write_transcript_pdf(_worker_conn, student_id, _worker_out_dir, _worker_issued)
+
+
+def generate_transcripts(student_ids: List[str], out_dir: str, db_path: Optional[str] = None,
+                         processes: Optional[int] = None) -> List[str]:
+    """
+    Render transcripts for many students into out_dir.
+
+    Students are spread over a process pool; each worker keeps its own
+    read-only connection and writes its PDFs itself, so only student IDs
+    and paths cross process boundaries.
+
+    Args:
+        student_ids: Students to render
+        out_dir: Directory for the PDFs, created if needed
+        db_path: Database path, defaults to the application database
+        processes: Worker count, defaults to the CPU count
+
+    Returns:
+        List[str]: Paths of the written PDFs, skipping unknown students
+    """
+    db_path = db_path or get_db_path()
+    os.makedirs(out_dir, exist_ok=True)
+    issued = date.today().isoformat()
+    if len(student_ids) <= 1:
+        # Not worth starting a pool for
+        _init_worker(db_path, out_dir, issued)
+        return [path for path in map(_render_in_worker, student_ids) if path]
+
+    with Pool(processes=processes, initializer=_init_worker, initargs=(db_path, out_dir, issued)) as pool:
+        return [path for path in pool.imap(_render_in_worker, student_ids, chunksize=32) if path]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Render official transcripts as PDF files.")
+    parser.add_argument("out_dir", help="directory for the PDFs")
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument("--student", nargs="+", metavar="STUDENT_ID", help="students to render")
+    selection.add_argument("--graduating", action="store_true",
+                           help="the graduating class: students whose degree audit is complete")
+    parser.add_argument("--department", help="with --graduating, only this department's students")
+    parser.add_argument("--major", help="with --graduating, only this major's students")
+    parser.add_argument("--processes", type=int, help="worker processes, defaults to the CPU count")
+    parser.add_argument("--db", default=None, help="database path, defaults to data/academic_management.db")
+    args = parser.parse_args(argv)
+
+    student_ids = args.student
+    if args.graduating:
+        conn = sqlite3.connect(args.db or get_db_path())
+        try:
+            student_ids = select_graduating_class(conn, args.department, args.major)
+        finally:
+            conn.close()
+
+    paths = generate_transcripts(student_ids, args.out_dir, args.db, args.processes)
+    print(f"Rendered {len(paths)} of {len(student_ids)} transcripts into {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import secrets
+import threading
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterable, List
+
+from ui.common.system_logger import UserRole
+
+# Identity column holding each role's role-specific ID
+ROLE_ID_KEYS = {
+    "student": "student_id",
+    "instructor": "instructor_id",
+    "advisor": "advisor_id",
+    "staff": "staff_id",
+}
+
+
+class UserSession:
+    """
+    Identity of a logged-in user, resolved once at login.
+
+    Carries the user ID, role, role-specific ID and departments so
+    dashboards and the logger never look them up again.
+    """
+
+    def __init__(self, user_id: int, username: str, role: str, role_id: Optional[str] = None,
+                 departments: Iterable[str] = (), token: Optional[str] = None):
+        """
+        Initialize the session.
+
+        Args:
+            user_id: users.id of the account
+            username: Login name
+            role: 'student', 'instructor', 'advisor', 'staff' or 'admin'
+            role_id: student_id, instructor_id, advisor_id or staff_id of the user
+            departments: Departments the user belongs to or advises
+            token: Session token, defaults to a new random one
+        """
+        self.user_id = user_id
+        self.username = username
+        self.role = role
+        self.role_id = role_id
+        self.departments: List[str] = list(departments)
+        self.token = token or secrets.token_urlsafe(32)
+        self.created_at = datetime.now()
+
+    @classmethod
+    def from_identity(cls, identity: Dict[str, Any]) -> "UserSession":
+        """
+        Build a session from an identity returned by AuthService.lookup().
+
+        Args:
+            identity: Identity with the role-specific IDs and departments
+
+        Returns:
+            UserSession: The new session
+        """
+        role = identity["role"]
+        role_id = identity.get(ROLE_ID_KEYS[role]) if role in ROLE_ID_KEYS else None
+        return cls(identity["user_id"], identity["username"], role, role_id, identity.get("departments") or [])
+
+    @property
+    def user_role(self) -> UserRole:
+        """Return the role as a UserRole."""
+        return UserRole[self.role.upper()]
+
+    @property
+    def department_id(self) -> Optional[str]:
+        """Return the user's (first) department."""
+        return self.departments[0] if self.departments else None
+
+
+class SessionStore:
+    """In-memory sessions by token, from login until logout."""
+
+    def __init__(self):
+        self._sessions: Dict[str, UserSession] = {}
+        self._lock = threading.Lock()
+
+    def create(self, identity: Dict[str, Any]) -> UserSession:
+        """Create and store a session for a verified identity."""
+        session = UserSession.from_identity(identity)
+        with self._lock:
+            self._sessions[session.token] = session
+        return session
+
+    def revoke(self, token: str) -> None:
+        """End a session, e.g. on logout."""
+        with self._lock:
+            self._sessions.pop(token, None)
@@ -24,22 +24,21 @@ class StudentWhatIfAnalysis(WhatIfAnalysisBase):
                 f"Projected GPA: {new_gpa:.2f}\n"
                 f"With current total credits: {self.total_credits}"
             )
+        elif self.analysis_type.currentIndex() == 2:  # GPA Forecast
+            target_gpa = self.target_gpa_input.value()
+            forecast = self.calculate_gpa_forecast(self.student_id, target_gpa)
+            self.results_label.setText(
+                f"Current GPA: {self.current_gpa:.2f}\n"
+                f"{self.describe_gpa_forecast(forecast, target_gpa)}"
+            )
         else:  # Target GPA
             target_gpa = self.target_gpa_input.value()
-            courses_needed = self.calculate_target_courses(
-                self.current_gpa, self.total_credits, self.total_points, target_gpa
+            plan = self.calculate_graduation_path(self.student_id, target_gpa)
+            self.show_graduation_path(plan)
+            self.results_label.setText(
+                f"Current GPA: {self.current_gpa:.2f}\n"
+                f"{self.describe_graduation_path(plan, target_gpa)}"
             )
-            if courses_needed:
-                self.results_label.setText(
-                    f"Current GPA: {self.current_gpa:.2f}\n"
-                    f"To reach target GPA of {target_gpa:.2f}, "
-                    f"you need approximately {courses_needed} courses with A grades\n"
-                    f"(Assuming 3-credit courses)"
-                )
-            else:
-                self.results_label.setText(
-                    "Target GPA must be higher than current GPA and not exceed 4.0"
-                )
 
 
 class AdvisorWhatIfAnalysis(WhatIfAnalysisBase):
@@ -141,20 +140,20 @@ class AdvisorWhatIfAnalysis(WhatIfAnalysisBase):
                 f"Projected GPA: {new_gpa:.2f}\n"
                 f"With current total credits: {self.total_credits}"
             )
+        elif self.analysis_type.currentIndex() == 2:  # GPA Forecast
+            target_gpa = self.target_gpa_input.value()
+            forecast = self.calculate_gpa_forecast(self.student_selector.currentData(), target_gpa)
+            self.results_label.setText(
+                f"Student: {self.student_selector.currentText()}\n"
+                f"Current GPA: {self.current_gpa:.2f}\n"
+                f"{self.describe_gpa_forecast(forecast, target_gpa)}"
+            )
         else:  # Target GPA
             target_gpa = self.target_gpa_input.value()
-            courses_needed = self.calculate_target_courses(
-                self.current_gpa, self.total_credits, self.total_points, target_gpa
+            plan = self.calculate_graduation_path(self.student_selector.currentData(), target_gpa)
+            self.show_graduation_path(plan)
+            self.results_label.setText(
+                f"Student: {self.student_selector.currentText()}\n"
+                f"Current GPA: {self.current_gpa:.2f}\n"
+                f"{self.describe_graduation_path(plan, target_gpa)}"
             )
-            if courses_needed:
-                self.results_label.setText(
-                    f"Student: {self.student_selector.currentText()}\n"
-                    f"Current GPA: {self.current_gpa:.2f}\n"
-                    f"To reach target GPA of {target_gpa:.2f}, "
-                    f"student needs approximately {courses_needed} courses with A grades\n"
-                    f"(Assuming 3-credit courses)"
-                )
-            else:
-                self.results_label.setText(
-                    "Target GPA must be higher than current GPA and not exceed 4.0"
-                )
\ No newline at end of file
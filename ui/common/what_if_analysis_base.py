@@ -5,6 +5,7 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                                QTableWidget, QTableWidgetItem, QGroupBox,
                                QScrollArea, QMessageBox)
 from PySide6.QtCore import Qt
+from ui.common.graduation_planner import GraduationPlanner, GradeScenario
 
 class WhatIfAnalysisBase(QWidget):
     def __init__(self):
@@ -24,7 +25,8 @@ class WhatIfAnalysisBase(QWidget):
         type_layout = QVBoxLayout()
         type_layout.setAlignment(Qt.AlignTop)
         self.analysis_type = QComboBox()
-        self.analysis_type.addItems(["GPA Impact of Future Courses", "Courses Needed for Target GPA"])
+        self.analysis_type.addItems(["GPA Impact of Future Courses", "Courses Needed for Target GPA",
+                                     "GPA Forecast (Monte Carlo)"])
         self.analysis_type.currentIndexChanged.connect(self.on_analysis_type_changed)
         type_layout.addWidget(self.analysis_type)
         type_group.setLayout(type_layout)
@@ -60,6 +62,21 @@ class WhatIfAnalysisBase(QWidget):
         self.target_gpa_input.setDecimals(2)
         self.target_gpa_input.setSingleStep(0.01)
         target_layout.addWidget(self.target_gpa_input)
+
+        self.target_credits_label = QLabel("Target Credits:")
+        target_layout.addWidget(self.target_credits_label)
+        self.target_credits_input = QSpinBox()
+        self.target_credits_input.setRange(0, 200)
+        self.target_credits_input.setSpecialValueText("Degree requirement")
+        target_layout.addWidget(self.target_credits_input)
+
+        self.grade_scenario_label = QLabel("Grade Scenario:")
+        target_layout.addWidget(self.grade_scenario_label)
+        self.grade_scenario = QComboBox()
+        self.grade_scenario.addItem("Historical course grades", GradeScenario.HISTORICAL)
+        self.grade_scenario.addItem("Current GPA in every course", GradeScenario.CURRENT)
+        self.grade_scenario.addItem("All A grades", GradeScenario.OPTIMISTIC)
+        target_layout.addWidget(self.grade_scenario)
         self.target_group.setLayout(target_layout)
         layout.addWidget(self.target_group)
 
@@ -78,6 +95,17 @@ class WhatIfAnalysisBase(QWidget):
         results_group.setLayout(results_layout)
         layout.addWidget(results_group)
 
+        # Planned Path Section
+        self.path_group = QGroupBox("Planned Path")
+        path_layout = QVBoxLayout()
+        self.path_table = QTableWidget()
+        self.path_table.setColumnCount(3)
+        self.path_table.setHorizontalHeaderLabels(["Term", "Courses", "Credits"])
+        self.path_table.horizontalHeader().setStretchLastSection(True)
+        path_layout.addWidget(self.path_table)
+        self.path_group.setLayout(path_layout)
+        layout.addWidget(self.path_group)
+
         # Initial state
         self.on_analysis_type_changed(0)
 
@@ -113,8 +141,14 @@ class WhatIfAnalysisBase(QWidget):
 
     def on_analysis_type_changed(self, index):
         is_impact_analysis = index == 0
-        self.courses_group.setVisible(is_impact_analysis)
+        is_path_analysis = index == 1
+        # The forecast simulates current registrations plus any added future courses
+        self.courses_group.setVisible(not is_path_analysis)
         self.target_group.setVisible(not is_impact_analysis)
+        self.path_group.setVisible(is_path_analysis)
+        for widget in (self.target_credits_label, self.target_credits_input,
+                       self.grade_scenario_label, self.grade_scenario):
+            widget.setVisible(is_path_analysis)
 
     def get_gpa_data(self, student_id):
         try:
@@ -175,15 +209,91 @@ class WhatIfAnalysisBase(QWidget):
         new_gpa = (total_points + additional_points) / (total_credits + additional_credits)
         return new_gpa
 
-    def calculate_target_courses(self, current_gpa, total_credits, total_points, target_gpa):
-        if target_gpa <= current_gpa or target_gpa > 4.0:
+    def calculate_graduation_path(self, student_id, target_gpa):
+        """Search upcoming offerings for the fewest terms to the target GPA and credits"""
+        conn = None
+        try:
+            current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            db_path = os.path.join(current_dir, 'data', 'academic_management.db')
+            conn = sqlite3.connect(db_path)
+
+            target_credits = self.target_credits_input.value() or None
+            planner = GraduationPlanner(conn)
+            return planner.plan(student_id, target_gpa, target_credits, self.grade_scenario.currentData())
+
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error while planning graduation path: {e}")
             return None
+        finally:
+            if conn:
+                conn.close()
 
-        points_needed = (target_gpa * total_credits) - total_points
-        credits_needed = points_needed / (4 - target_gpa)  # Assuming all A's
-        courses_needed = credits_needed / 3  # Assuming 3-credit courses
+    def show_graduation_path(self, plan):
+        """Fill the planned path table with one row per term"""
+        self.path_table.setRowCount(0)
+        if not plan:
+            return
+
+        semester_names = {'S': 'Spring', 'U': 'Summer', 'F': 'Fall'}
+        self.path_table.setRowCount(len(plan["terms"]))
+        for row, entry in enumerate(plan["terms"]):
+            year, semester = entry["term"]
+            courses = ", ".join(course["course"] for course in entry["courses"]) or "No courses"
+            self.path_table.setItem(row, 0, QTableWidgetItem(f"{semester_names[semester]} {year}"))
+            self.path_table.setItem(row, 1, QTableWidgetItem(courses))
+            self.path_table.setItem(row, 2, QTableWidgetItem(str(entry["credits"])))
+        self.path_table.resizeColumnsToContents()
+
+    def describe_graduation_path(self, plan, target_gpa):
+        """Summarize a planned path for the results label"""
+        if plan is None:
+            return (f"Target GPA of {target_gpa:.2f} cannot be reached within "
+                    f"the planning horizon with the selected grade scenario")
+        if plan["term_count"] == 0:
+            return f"Target GPA of {target_gpa:.2f} and {plan['target_credits']} credits are already met"
+        return (f"Target GPA of {target_gpa:.2f} with {plan['target_credits']} credits "
+                f"can be reached in {plan['term_count']} term(s)\n"
+                f"Projected GPA: {plan['projected_gpa']:.2f}, "
+                f"projected credits: {plan['projected_credits']}")
+
+    def calculate_gpa_forecast(self, student_id, target_gpa):
+        """Simulate the student's GPA after current registrations and added courses"""
+        # Imported here so numpy is only loaded when a forecast is run
+        try:
+            from ui.common.gpa_forecast import forecast_student
+        except ImportError:
+            QMessageBox.warning(self, "GPA Forecast",
+                                "The GPA forecast requires the numpy package, which is not installed")
+            return None
+
+        conn = None
+        try:
+            current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            db_path = os.path.join(current_dir, 'data', 'academic_management.db')
+            conn = sqlite3.connect(db_path)
+
+            # The grade distributions are reloaded each time, so grades posted since are included
+            extra_credits = [credits_spin.value() for credits_spin, _ in self.course_list]
+            return forecast_student(conn, student_id, target_gpa, extra_credits)
+
+        except sqlite3.Error as e:
+            print(f"Database error in calculate_gpa_forecast: {e}")
+            return None
+        finally:
+            if conn:
+                conn.close()
 
-        return round(courses_needed, 1)
+    def describe_gpa_forecast(self, forecast, target_gpa):
+        """Summarize a forecast for the results label"""
+        if forecast is None:
+            return "Unable to run the GPA forecast"
+        if forecast["simulations"] == 0:
+            return "No current registrations or future courses to forecast"
+        percentiles = forecast["percentiles"]
+        return (f"Chance of reaching {target_gpa:.2f}: {forecast['probability'] * 100:.1f}% "
+                f"over {forecast['simulations']:,} simulations of {len(forecast['courses'])} course(s)\n"
+                f"Expected GPA: {forecast['mean_gpa']:.2f} "
+                f"(10th-90th percentile {percentiles[10]:.2f} - {percentiles[90]:.2f})")
 
     def calculate_analysis(self):
         pass  # To be implemented by derived classes
\ No newline at end of file
@@ -2,52 +2,40 @@ import sys
 import os
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                                QLabel, QPushButton, QTableWidget, QTableWidgetItem,
-                               QTabWidget, QComboBox, QMessageBox)
+                               QTabWidget, QComboBox, QMessageBox, QFileDialog)
 from PySide6.QtCore import Qt, Signal
 import sqlite3
 from datetime import datetime
-from ui.common.system_logger import SystemLogger, UserRole, OperationType
+from ui.common.system_logger import SystemLogger, OperationType
+from ui.common.grade_posting import post_section_grades, read_grade_file, normalize_grade
+from ui.common.instructor_cache import InstructorSessionCache
+from ui.common.dashboard_prewarm import show_loading, LOADING_TEXT
+from ui.common.export_job import export_table
 
 
 class InstructorDashboard(QMainWindow):
     logout_signal = Signal()
 
-    def __init__(self, user_id):
+    def __init__(self, session, prewarm=None):
         super().__init__()
-        self.user_id = user_id
-        self.instructor_id = self.get_instructor_id()
+        # Identity was resolved at login
+        self.session = session
+        # Started at login; the sections and rosters arrive through it
+        self.prewarm = prewarm
+        self.user_id = session.user_id
+        self.instructor_id = session.role_id
         print(f"Initializing InstructorDashboard with user_id: {self.user_id}, instructor_id: {self.instructor_id}")
         self.setWindowTitle("Instructor Dashboard")
         self.setGeometry(100, 100, 800, 600)
 
         # Initialize the logger
-        self.logger = SystemLogger(self.user_id, UserRole.INSTRUCTOR)
+        self.logger = SystemLogger(session)
 
         self.setup_ui()
 
         # Log the login session
         self.logger.log_session(OperationType.LOGIN)
 
-    def get_instructor_id(self):
-        """Get the instructor_id from the database based on user_id"""
-        try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-            cursor.execute("SELECT instructor_id FROM instructors WHERE user_id = ?", (self.user_id,))
-            result = cursor.fetchone()
-            if result:
-                return result[0]
-            else:
-                print(f"No instructor found for user_id: {self.user_id}")
-                return None
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return None
-        finally:
-            if conn:
-                conn.close()
-
     def setup_ui(self):
         """Initialize the user interface"""
         central_widget = QWidget()
@@ -105,7 +93,6 @@ class InstructorDashboard(QMainWindow):
         course_selection_layout = QHBoxLayout()
         course_selection_layout.addWidget(QLabel("Select Course:"))
         self.course_selector = QComboBox()
-        self.course_selector.currentIndexChanged.connect(self.load_student_list)
         course_selection_layout.addWidget(self.course_selector)
         course_selection_layout.addStretch()
         student_list_layout.addLayout(course_selection_layout)
@@ -117,24 +104,40 @@ class InstructorDashboard(QMainWindow):
             "Student ID", "Gender", "Major", "Grade", "Status"
         ])
         student_list_layout.addWidget(self.student_list_table)
-        tab_widget.addTab(student_list_tab, "Student List")
 
-        # Connect tab change event
-        tab_widget.currentChanged.connect(self.on_tab_changed)
-
-        self.load_instructor_data()
+        # Grade posting buttons
+        grade_buttons_layout = QHBoxLayout()
+        self.export_list_button = QPushButton("Export List...")
+        self.export_list_button.clicked.connect(self.export_student_list)
+        grade_buttons_layout.addWidget(self.export_list_button)
+        grade_buttons_layout.addStretch()
+        self.import_grades_button = QPushButton("Import Grades...")
+        self.import_grades_button.clicked.connect(self.import_grades)
+        grade_buttons_layout.addWidget(self.import_grades_button)
+        self.post_grades_button = QPushButton("Post Grades")
+        self.post_grades_button.clicked.connect(self.post_grades)
+        grade_buttons_layout.addWidget(self.post_grades_button)
+        student_list_layout.addLayout(grade_buttons_layout)
+        tab_widget.addTab(student_list_tab, "Student List")
 
-    def load_instructor_data(self):
-        """Load all instructor-related data"""
+        if self.prewarm:
+            show_loading(self.assigned_courses_table)
+            self.semester_selector.addItem(LOADING_TEXT, None)
+            self.course_selector.addItem(LOADING_TEXT, None)
+            self.prewarm.on_ready("sections", self.load_instructor_data)
+        else:
+            self.load_instructor_data()
+
+    def load_instructor_data(self, prewarmed=None):
+        """
+        Load all instructor-related data, seeding the session cache with
+        the prewarmed sections when given
+        """
         if not self.instructor_id:
             print("No valid instructor_id, cannot load data.")
             return
 
         try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-
             # Log the data access attempt
             self.logger.log_data_access(
                 "instructor_courses",
@@ -142,33 +145,17 @@ class InstructorDashboard(QMainWindow):
                 {"instructor_id": self.instructor_id}
             )
 
-            # Load unique semesters for the semester selector
-            cursor.execute("""
-                SELECT DISTINCT semester, year_taught 
-                FROM instructor_courses 
-                WHERE instructor_id = ?
-                ORDER BY year_taught DESC, 
-                    CASE semester 
-                        WHEN 'F' THEN 1
-                        WHEN 'S' THEN 2
-                        WHEN 'U' THEN 3
-                    END DESC
-            """, (self.instructor_id,))
-
-            semesters = cursor.fetchall()
-            self.semester_selector.clear()
-            self.semester_selector.addItem("All Semesters", ("all", "all"))
-            for semester, year in semesters:
-                semester_name = {'F': 'Fall', 'S': 'Spring', 'U': 'Summer'}[semester]
-                display_text = f"{semester_name} {year}"
-                self.semester_selector.addItem(display_text, (semester, year))
-
-            # Connect semester selector to update method
-            self.semester_selector.currentIndexChanged.connect(self.update_course_table)
+            # Load all sections and rosters once; later views are served from memory
+            self.session_cache = InstructorSessionCache(self.instructor_id, parent=self, prewarmed=prewarmed)
+            self.session_cache.refreshed.connect(self.on_cache_refreshed)
 
-            # Load all courses for the student list tab
+            self.load_semesters_for_selector()
             self.load_all_courses_for_selector()
 
+            # Connect selectors once the initial data is in place
+            self.semester_selector.currentIndexChanged.connect(self.update_course_table)
+            self.course_selector.currentIndexChanged.connect(lambda: self.load_student_list())
+
             # Initial load of course data for assigned courses tab
             self.update_course_table()
 
@@ -180,56 +167,58 @@ class InstructorDashboard(QMainWindow):
             )
             print(error_msg)
             QMessageBox.critical(self, "Error", "Failed to load instructor data")
-        finally:
-            if conn:
-                conn.close()
 
-    def load_all_courses_for_selector(self):
-        """Load all courses for the student list tab's course selector"""
-        try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT DISTINCT 
-                    c.course_prefix || ' ' || c.course_number as course,
-                    ic.semester,
-                    ic.year_taught
-                FROM instructor_courses ic
-                JOIN courses c ON ic.course_prefix = c.course_prefix 
-                    AND ic.course_number = c.course_number
-                WHERE ic.instructor_id = ?
-                ORDER BY ic.year_taught DESC, ic.semester DESC, course
-            """, (self.instructor_id,))
-
-            courses = cursor.fetchall()
-
-            self.course_selector.clear()
-            self.course_selector.addItem("Select Course", None)
-
-            for course, semester, year in courses:
-                semester_name = {'F': 'Fall', 'S': 'Spring', 'U': 'Summer'}[semester]
-                display_text = f"{course} - {semester_name} {year}"
-                course_parts = course.split()
-                self.course_selector.addItem(display_text,
-                                             (course_parts[0], course_parts[1], semester, year))
-
-        except sqlite3.Error as e:
-            error_msg = f"Database error while loading course selector: {str(e)}"
-            self.logger.log_operation(
-                OperationType.ERROR,
-                error_msg
-            )
-            print(error_msg)
-        finally:
-            if conn:
-                conn.close()
+    def load_semesters_for_selector(self):
+        """Fill the semester selector from the session cache, keeping the current selection"""
+        selected = self.semester_selector.currentData()
+        self.semester_selector.blockSignals(True)
+        self.semester_selector.clear()
+        self.semester_selector.addItem("All Semesters", ("all", "all"))
+        for semester, year in self.session_cache.terms():
+            semester_name = {'F': 'Fall', 'S': 'Spring', 'U': 'Summer'}[semester]
+            display_text = f"{semester_name} {year}"
+            self.semester_selector.addItem(display_text, (semester, year))
+        self.semester_selector.setCurrentIndex(self.find_selector_index(self.semester_selector, selected))
+        self.semester_selector.blockSignals(False)
 
-    def on_tab_changed(self, index):
-        """Handle tab change events"""
-        if index == 1:  # Student List tab
-            self.load_all_courses_for_selector()
+    def load_all_courses_for_selector(self):
+        """Fill the student list tab's course selector from the session cache"""
+        selected = self.course_selector.currentData()
+        self.course_selector.blockSignals(True)
+        self.course_selector.clear()
+        self.course_selector.addItem("Select Course", None)
+
+        for prefix, number, semester, year in self.session_cache.section_keys():
+            semester_name = {'F': 'Fall', 'S': 'Spring', 'U': 'Summer'}[semester]
+            display_text = f"{prefix} {number} - {semester_name} {year}"
+            self.course_selector.addItem(display_text, (prefix, number, semester, year))
+
+        self.course_selector.setCurrentIndex(self.find_selector_index(self.course_selector, selected))
+        self.course_selector.blockSignals(False)
+
+    def find_selector_index(self, selector, data):
+        """Return the index of the item holding data, or 0 if it is no longer listed"""
+        for index in range(selector.count()):
+            if selector.itemData(index) == data:
+                return index
+        return 0
+
+    def on_cache_refreshed(self):
+        """Redraw the views after the session cache picked up database changes"""
+        self.load_semesters_for_selector()
+        self.load_all_courses_for_selector()
+        self.update_course_table()
+        # Keep grades the instructor is still editing on screen
+        if not self.has_unposted_grades():
+            self.load_student_list(log_access=False)
+
+    def has_unposted_grades(self):
+        """Return True if any grade in the roster was edited but not posted yet"""
+        for row in range(self.student_list_table.rowCount()):
+            grade_item = self.student_list_table.item(row, 3)
+            if grade_item and grade_item.text() != str(grade_item.data(Qt.UserRole) or 'N/A'):
+                return True
+        return False
 
     def update_course_table(self):
         """Update the courses table based on selected semester"""
@@ -238,65 +227,21 @@ class InstructorDashboard(QMainWindow):
             return
 
         semester, year = selected_data
-
-        try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-
-            # Build query based on semester selection
-            query = """
-                SELECT 
-                    c.course_prefix || ' ' || c.course_number,
-                    c.credits,
-                    ic.semester,
-                    ic.year_taught,
-                    COUNT(DISTINCT sc.student_id) as enrolled_students
-                FROM instructor_courses ic
-                JOIN courses c ON ic.course_prefix = c.course_prefix 
-                    AND ic.course_number = c.course_number
-                LEFT JOIN student_courses sc ON c.course_prefix = sc.course_prefix 
-                    AND c.course_number = sc.course_number
-                    AND sc.semester = ic.semester 
-                    AND sc.year_taken = ic.year_taught
-                WHERE ic.instructor_id = ?
-            """
-
-            params = [self.instructor_id]
-
-            if semester != "all":
-                query += " AND ic.semester = ? AND ic.year_taught = ?"
-                params.extend([semester, year])
-
-            query += """
-                GROUP BY c.course_prefix, c.course_number, ic.semester, ic.year_taught
-                ORDER BY ic.year_taught DESC, ic.semester DESC
-            """
-
-            cursor.execute(query, params)
-            courses = cursor.fetchall()
-
-            # Update the course table
-            self.assigned_courses_table.setRowCount(len(courses))
-            for row, course in enumerate(courses):
-                for col, value in enumerate(course):
-                    if col == 2:  # Format semester
-                        value = {'F': 'Fall', 'S': 'Spring', 'U': 'Summer'}[value]
-                    self.assigned_courses_table.setItem(row, col, QTableWidgetItem(str(value)))
-
-        except sqlite3.Error as e:
-            error_msg = f"Database error while updating course table: {str(e)}"
-            self.logger.log_operation(
-                OperationType.ERROR,
-                error_msg
-            )
-            print(error_msg)
-            QMessageBox.critical(self, "Error", "Failed to update course information")
-        finally:
-            if conn:
-                conn.close()
-
-    def load_student_list(self):
+        sections = self.session_cache.sections_in(semester, year)
+
+        self.assigned_courses_table.setRowCount(len(sections))
+        for row, ((prefix, number, section_semester, section_year), section) in enumerate(sections):
+            values = [
+                f"{prefix} {number}",
+                section["credits"],
+                {'F': 'Fall', 'S': 'Spring', 'U': 'Summer'}[section_semester],
+                section_year,
+                section["enrolled"],
+            ]
+            for col, value in enumerate(values):
+                self.assigned_courses_table.setItem(row, col, QTableWidgetItem(str(value)))
+
+    def load_student_list(self, log_access=True):
         """Load student list for selected course"""
         selected_course = self.course_selector.currentData()
         if not selected_course:
@@ -305,11 +250,7 @@ class InstructorDashboard(QMainWindow):
 
         prefix, number, semester, year = selected_course
 
-        try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-
+        if log_access:
             # Log the data access
             self.logger.log_data_access(
                 "student_list",
@@ -320,42 +261,115 @@ class InstructorDashboard(QMainWindow):
                 }
             )
 
-            # Modified query to use DISTINCT and ensure we only get one record per student
-            cursor.execute("""
-                SELECT DISTINCT 
-                    s.student_id,
-                    s.gender,
-                    s.major,
-                    MAX(sc.grade) as grade,  -- Take the latest grade if there are duplicates
-                    CASE 
-                        WHEN MAX(sc.grade) IS NOT NULL THEN 'Completed'
-                        ELSE 'In Progress'
-                    END as status
-                FROM student_courses sc
-                JOIN students s ON sc.student_id = s.student_id
-                WHERE sc.course_prefix = ? 
-                    AND sc.course_number = ? 
-                    AND sc.semester = ? 
-                    AND sc.year_taken = ?
-                GROUP BY s.student_id, s.gender, s.major  -- Group by student information
-                ORDER BY s.student_id
-            """, (prefix, number, semester, year))
-
-            students = cursor.fetchall()
-            self.student_list_table.setRowCount(len(students))
-
-            for row, student in enumerate(students):
-                for col, value in enumerate(student):
-                    self.student_list_table.setItem(row, col, QTableWidgetItem(str(value or 'N/A')))
+        students = self.session_cache.roster(selected_course)
+        self.student_list_table.setRowCount(len(students))
+
+        for row, student in enumerate(students):
+            values = [student["student_id"], student["gender"], student["major"],
+                      student["grade"], student["status"]]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(str(value or 'N/A'))
+                # Only the grade column is editable
+                if col == 3:
+                    item.setData(Qt.UserRole, value)
+                else:
+                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+                self.student_list_table.setItem(row, col, item)
+
+    def import_grades(self):
+        """Fill the roster's grade column from a CSV or Excel file"""
+        if not self.course_selector.currentData():
+            QMessageBox.warning(self, "Warning", "Please select a course first")
+            return
+
+        path, _ = QFileDialog.getOpenFileName(self, "Import Grades", "",
+                                              "Grade Files (*.csv *.xlsx);;All Files (*)")
+        if not path:
+            return
+
+        try:
+            grades = read_grade_file(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Import Failed", str(e))
+            return
+
+        matched = 0
+        for row in range(self.student_list_table.rowCount()):
+            student_id = self.student_list_table.item(row, 0).text()
+            if student_id in grades:
+                self.student_list_table.item(row, 3).setText(grades.pop(student_id) or 'N/A')
+                matched += 1
+
+        message = f"Imported {matched} grade(s). Review them and click Post Grades to save."
+        if grades:
+            message += f"\n\nNot on this roster: {', '.join(sorted(grades))}"
+        QMessageBox.information(self, "Grades Imported", message)
+
+    def export_student_list(self):
+        """Export the selected section's roster as shown, including unposted grade edits"""
+        selected_course = self.course_selector.currentData()
+        if not selected_course:
+            QMessageBox.warning(self, "Warning", "Please select a course first")
+            return
+
+        prefix, number, semester, year = selected_course
+        job = export_table(self, self.student_list_table, "Export Student List",
+                           f"{prefix}{number}_{semester}{year}_students.csv")
+        if job:
+            self.logger.log_data_access(
+                "student_list",
+                f"exported student list to {job.path}",
+                {"course": f"{prefix} {number}", "semester": semester, "year": year}
+            )
+            self.export_job = job
+
+    def post_grades(self):
+        """Save all changed grades of the selected section in one transaction"""
+        selected_course = self.course_selector.currentData()
+        if not selected_course:
+            QMessageBox.warning(self, "Warning", "Please select a course first")
+            return
+
+        prefix, number, semester, year = selected_course
+
+        changed = {}
+        try:
+            for row in range(self.student_list_table.rowCount()):
+                grade_item = self.student_list_table.item(row, 3)
+                grade = normalize_grade(grade_item.text())
+                if grade != grade_item.data(Qt.UserRole):
+                    changed[self.student_list_table.item(row, 0).text()] = grade
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Grade", str(e))
+            return
+
+        if not changed:
+            QMessageBox.information(self, "Post Grades", "No grades have changed")
+            return
+
+        conn = None
+        try:
+            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                '..', 'data', 'academic_management.db'))
+            updated, _ = post_section_grades(conn, prefix, number, semester, year, changed)
+
+            self.logger.log_data_modification(
+                "grades",
+                f"posted {updated} grade(s) for {prefix} {number} {semester} {year}",
+                after=changed
+            )
+            QMessageBox.information(self, "Success", f"Posted {updated} grade(s)")
+            self.session_cache.reload()
+            self.on_cache_refreshed()
 
         except sqlite3.Error as e:
-            error_msg = f"Database error while loading student list: {str(e)}"
+            error_msg = f"Database error while posting grades: {str(e)}"
             self.logger.log_operation(
                 OperationType.ERROR,
                 error_msg
             )
             print(error_msg)
-            QMessageBox.critical(self, "Error", "Failed to load student list")
+            QMessageBox.critical(self, "Error", "Failed to post grades. No grades were changed.")
         finally:
             if conn:
                 conn.close()
@@ -373,4 +387,6 @@ class InstructorDashboard(QMainWindow):
             "Instructor exited the system",
             include_role_prefix=False
         )
+        if hasattr(self, 'session_cache'):
+            self.session_cache.stop()
         event.accept()
\ No newline at end of file
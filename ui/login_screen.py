@@ -1,17 +1,19 @@
 import sys
-import sqlite3
-import os
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QSpacerItem, \
     QSizePolicy
 from PySide6.QtCore import Qt, Signal
-from werkzeug.security import check_password_hash
+from ui.common.auth_service import AuthService
+from ui.common.user_session import SessionStore
 
 class LoginScreen(QWidget):
-    login_successful = Signal(str, str)  # Signal to emit user_id and role on successful login
+    login_successful = Signal(object)  # Signal to emit the UserSession on successful login
 
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Academic Management System - Login")
+        self.auth_service = AuthService(parent=self)
+        self.auth_service.finished.connect(self.on_login_checked)
+        self.sessions = SessionStore()
         self.setup_ui()
 
     def setup_ui(self):
@@ -55,11 +57,11 @@ class LoginScreen(QWidget):
         self.password_input.returnPressed.connect(self.login)
 
         # Login button
-        login_button = QPushButton("Login")
-        login_button.clicked.connect(self.login)
-        login_button.setFixedWidth(280)
-        login_button.setStyleSheet("margin-top: 20px;")
-        login_layout.addWidget(login_button, alignment=Qt.AlignCenter)
+        self.login_button = QPushButton("Login")
+        self.login_button.clicked.connect(self.login)
+        self.login_button.setFixedWidth(280)
+        self.login_button.setStyleSheet("margin-top: 20px;")
+        login_layout.addWidget(self.login_button, alignment=Qt.AlignCenter)
 
         # Exit button
         exit_button = QPushButton("Exit")
@@ -82,39 +84,30 @@ class LoginScreen(QWidget):
         username = self.username_input.text()
         password = self.password_input.text()
 
-        user_id, role = self.check_credentials(username, password)
-        if user_id and role:
+        # The password hash is checked on a worker thread; on_login_checked receives the result
+        if not self.auth_service.authenticate_async(username, password):
+            return
+        self.login_button.setEnabled(False)
+        self.error_label.setText("Signing in...")
+        self.error_label.setStyleSheet("color: gray; margin-top: 10px;")
+
+    def on_login_checked(self, result):
+        self.login_button.setEnabled(True)
+        if result["ok"]:
+            session = self.sessions.create(result["identity"])
             self.error_label.setText("Login successful!")
             self.error_label.setStyleSheet("color: green; margin-top: 10px;")
-            print(f"Emitting login_successful signal with user_id: {user_id}, role: {role}")  # Debug print
-            self.login_successful.emit(user_id, role)
+            print(f"Emitting login_successful signal with user_id: {session.user_id}, role: {session.role}")  # Debug print
+            self.login_successful.emit(session)
         else:
-            self.error_label.setText("Invalid username or password")
+            self.error_label.setText(result["error"])
             self.error_label.setStyleSheet("color: red; margin-top: 10px;")
 
     def check_credentials(self, username, password):
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        db_path = os.path.join(current_dir, '..', 'data', 'academic_management.db')
-        print(f"Attempting to connect to database at: {db_path}")  # Debug print
-
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT u.id, u.password_hash, u.role, s.student_id 
-                FROM users u
-                LEFT JOIN students s ON u.id = s.user_id
-                WHERE u.username = ?
-            """, (username,))
-            result = cursor.fetchone()
-            conn.close()
-
-            if result and check_password_hash(result[1], password):
-                user_id = result[3] if result[3] else str(result[0])
-                print(f"Login successful for user: {username}, id: {user_id}, role: {result[2]}")  # Debug print
-                return user_id, result[2]  # Return student_id (or user_id if not a student) and role
-            print(f"Login failed for user: {username}")  # Debug print
-            return None, None
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return None, None
\ No newline at end of file
+        """Check credentials synchronously, returning (user_id, role) or (None, None)"""
+        result = self.auth_service.authenticate(username, password)
+        if result["ok"]:
+            print(f"Login successful for user: {username}, id: {result['login_id']}, role: {result['role']}")  # Debug print
+            return result["login_id"], result["role"]
+        print(f"Login failed for user: {username}")  # Debug print
+        return None, None
@@ -5,6 +5,7 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                               QPushButton, QComboBox, QMessageBox, QFormLayout,
                               QLineEdit, QSpinBox, QTabWidget, QWidget)
 from PySide6.QtCore import Qt, Signal
+from ui.common.registration_rules import format_violations
 
 
 class CourseManagementDialog(QDialog):
@@ -191,65 +192,22 @@ class CourseManagementDialog(QDialog):
         instructor_id = self.instructor_combo.currentData()
 
         try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
+            # Validates duplicate sections and the instructor credit cap
+            violations = self.parent.service.schedule_section(prefix, number, semester, year, instructor_id)
 
-            # Check if course is already scheduled for this semester
-            cursor.execute("""
-                SELECT COUNT(*) FROM instructor_courses
-                WHERE course_prefix = ? AND course_number = ?
-                AND semester = ? AND year_taught = ?
-            """, (prefix, number, semester, year))
-
-            if cursor.fetchone()[0] > 0:
+            if violations:
                 self.parent.logger.log_operation(
                     "error",
-                    "Attempted to schedule duplicate course",
+                    "Course scheduling rejected by validation",
                     {
                         "course": f"{prefix} {number}",
-                        "semester": f"{semester} {year}"
+                        "semester": f"{semester} {year}",
+                        "rules": ", ".join(v["rule"] for v in violations)
                     }
                 )
-                QMessageBox.warning(self, "Error",
-                                    "This course is already scheduled for the selected semester")
+                QMessageBox.warning(self, "Error", format_violations(violations))
                 return
 
-            # If instructor is selected, verify their credit load
-            if instructor_id:
-                cursor.execute("""
-                    SELECT SUM(c.credits)
-                    FROM instructor_courses ic
-                    JOIN courses c ON ic.course_prefix = c.course_prefix 
-                        AND ic.course_number = c.course_number
-                    WHERE ic.instructor_id = ? 
-                    AND ic.semester = ? AND ic.year_taught = ?
-                """, (instructor_id, semester, year))
-
-                current_credits = cursor.fetchone()[0] or 0
-                if current_credits + credits > 12:
-                    self.parent.logger.log_operation(
-                        "error",
-                        "Instructor credit hour limit exceeded",
-                        {
-                            "instructor_id": instructor_id,
-                            "current_credits": current_credits,
-                            "attempted_add": credits
-                        }
-                    )
-                    QMessageBox.warning(self, "Error",
-                                        "Instructor would exceed 12 credit hours for the semester")
-                    return
-
-            # Schedule the course
-            cursor.execute("""
-                INSERT INTO instructor_courses 
-                (course_prefix, course_number, instructor_id, semester, year_taught)
-                VALUES (?, ?, ?, ?, ?)
-            """, (prefix, number, instructor_id, semester, year))
-
-            conn.commit()
-
             self.parent.logger.log_operation(
                 "add",
                 f"Scheduled course {prefix} {number} for {semester} {year}",
@@ -274,7 +232,3 @@ class CourseManagementDialog(QDialog):
                 f"Failed to schedule course: {str(e)}"
             )
             QMessageBox.warning(self, "Error", "Failed to schedule course")
-        finally:
-            if conn:
-                conn.close()
-
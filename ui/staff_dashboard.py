@@ -2,27 +2,45 @@ import sys
 import os
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                                QLabel, QPushButton, QTableWidget, QTableWidgetItem,
-                               QTabWidget, QComboBox, QMessageBox, QLineEdit, QFormLayout, QDialog)
-from PySide6.QtCore import Qt, Signal
+                               QTabWidget, QComboBox, QMessageBox, QLineEdit, QFormLayout, QDialog,
+                               QTimeEdit, QFileDialog)
+from PySide6.QtCore import Qt, Signal, QTime, QTimer
 import sqlite3
 from datetime import datetime
-from ui.common.system_logger import SystemLogger, UserRole, OperationType
+from ui.common.system_logger import SystemLogger, OperationType
 from ui.staff_course_management import CourseManagementDialog
+from ui.common.registration_rules import RegistrationValidator, format_violations
+from ui.common.section_enrollment import ensure_section_enrollment_table
+from ui.common.term_scheduler import TermScheduler
+from ui.common.instructor_load import (InstructorLoadMatrix, refresh_instructor_loads,
+                                       refresh_course_loads)
+from ui.common.meeting_conflicts import (MeetingConflictChecker, ensure_section_meetings_table,
+                                         replace_section_meetings, parse_days, format_meeting)
+from ui.common.catalog_batch import CatalogBatch, read_catalog_file, diff_catalog
+from ui.common.course_identity import rename_course
+from ui.common.student_directory import StudentDirectory, SORT_COLUMNS
+from ui.common.dashboard_prewarm import show_loading
+from ui.common.academic_service import AcademicService, fetch_department_catalog
+from ui.common.export_job import export_table, export_query_results
 
 
 class StaffDashboard(QMainWindow):
     logout_signal = Signal()
 
-    def __init__(self, user_id):
+    def __init__(self, session, prewarm=None):
         super().__init__()
-        self.user_id = user_id
-
-        # Initialize the system logger first
-        self.logger = SystemLogger(self.user_id, UserRole.STAFF)
-
-        # Then get staff_id and department_id
-        self.staff_id = self.get_staff_id()
-        self.department_id = self.get_department_id()
+        # Identity was resolved at login
+        self.session = session
+        # Started at login; the catalog arrives through it
+        self.prewarm = prewarm
+        self.user_id = session.user_id
+        self.staff_id = session.role_id
+        self.department_id = session.department_id
+
+        self.logger = SystemLogger(session)
+        self.service = AcademicService()
+        # The running or last export, kept so it can be cancelled on exit
+        self.export_job = None
 
         print(
             f"Initializing StaffDashboard with user_id: {self.user_id}, "
@@ -36,60 +54,6 @@ class StaffDashboard(QMainWindow):
         # Log the login session
         self.logger.log_session(OperationType.LOGIN)
 
-    def get_staff_id(self):
-        try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-            cursor.execute("SELECT staff_id FROM staff WHERE user_id = ?", (self.user_id,))
-            result = cursor.fetchone()
-
-            # Log the data access
-            if result:
-                self.logger.log_data_access(
-                    "staff",
-                    "retrieved staff ID",
-                    {"user_id": self.user_id, "staff_id": result[0]}
-                )
-            return result[0] if result else None
-
-        except sqlite3.Error as e:
-            self.logger.log_operation(
-                OperationType.ERROR,
-                f"Failed to get staff ID: {str(e)}"
-            )
-            return None
-        finally:
-            if conn:
-                conn.close()
-
-    def get_department_id(self):
-        try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-            cursor.execute("SELECT department_id FROM staff WHERE staff_id = ?", (self.staff_id,))
-            result = cursor.fetchone()
-
-            # Log the data access
-            if result:
-                self.logger.log_data_access(
-                    "staff",
-                    "retrieved department ID",
-                    {"staff_id": self.staff_id, "department_id": result[0]}
-                )
-            return result[0] if result else None
-
-        except sqlite3.Error as e:
-            self.logger.log_operation(
-                OperationType.ERROR,
-                f"Failed to get department ID: {str(e)}"
-            )
-            return None
-        finally:
-            if conn:
-                conn.close()
-
     def setup_ui(self):
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -144,6 +108,18 @@ class StaffDashboard(QMainWindow):
         self.modify_catalog_course_button.clicked.connect(self.modify_course)
         catalog_buttons_layout.addWidget(self.modify_catalog_course_button)
 
+        self.batch_edit_catalog_button = QPushButton("Batch Edit...")
+        self.batch_edit_catalog_button.clicked.connect(self.batch_edit_catalog)
+        catalog_buttons_layout.addWidget(self.batch_edit_catalog_button)
+
+        self.import_catalog_button = QPushButton("Import CSV...")
+        self.import_catalog_button.clicked.connect(self.import_catalog)
+        catalog_buttons_layout.addWidget(self.import_catalog_button)
+
+        self.export_catalog_button = QPushButton("Export...")
+        self.export_catalog_button.clicked.connect(self.export_catalog)
+        catalog_buttons_layout.addWidget(self.export_catalog_button)
+
         catalog_layout.addLayout(catalog_buttons_layout)
         catalog_tab.setLayout(catalog_layout)
         courses_subtabs.addTab(catalog_tab, "Course Catalog")
@@ -167,9 +143,9 @@ class StaffDashboard(QMainWindow):
 
         # Semester courses table
         self.semester_courses_table = QTableWidget()
-        self.semester_courses_table.setColumnCount(4)
+        self.semester_courses_table.setColumnCount(6)
         self.semester_courses_table.setHorizontalHeaderLabels(
-            ["Course", "Credits", "Instructor", "Status"]
+            ["Course", "Credits", "Instructor", "Status", "Enrolled", "Meeting"]
         )
         schedule_layout.addWidget(self.semester_courses_table)
 
@@ -187,6 +163,14 @@ class StaffDashboard(QMainWindow):
         self.modify_schedule_button.clicked.connect(self.modify_schedule)
         schedule_buttons_layout.addWidget(self.modify_schedule_button)
 
+        self.auto_assign_button = QPushButton("Auto-Assign Instructors")
+        self.auto_assign_button.clicked.connect(self.auto_assign_instructors)
+        schedule_buttons_layout.addWidget(self.auto_assign_button)
+
+        self.check_conflicts_button = QPushButton("Check Conflicts")
+        self.check_conflicts_button.clicked.connect(self.check_schedule_conflicts)
+        schedule_buttons_layout.addWidget(self.check_conflicts_button)
+
         schedule_layout.addLayout(schedule_buttons_layout)
         schedule_tab.setLayout(schedule_layout)
         courses_subtabs.addTab(schedule_tab, "Semester Schedule")
@@ -211,11 +195,65 @@ class StaffDashboard(QMainWindow):
         instructors_tab.setLayout(instructors_layout)
         tab_widget.addTab(instructors_tab, "Instructors")
 
+        # Teaching Load Tab
+        teaching_load_tab = QWidget()
+        teaching_load_layout = QVBoxLayout(teaching_load_tab)
+        teaching_load_layout.addWidget(QLabel("Assigned credit hours per instructor (assigned / limit):"))
+        self.teaching_load_table = QTableWidget()
+        self.teaching_load_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        teaching_load_layout.addWidget(self.teaching_load_table)
+        self.export_teaching_load_button = QPushButton("Export...")
+        self.export_teaching_load_button.clicked.connect(self.export_teaching_load)
+        teaching_load_layout.addWidget(self.export_teaching_load_button)
+        teaching_load_tab.setLayout(teaching_load_layout)
+        tab_widget.addTab(teaching_load_tab, "Teaching Load")
+
         # Students Tab
         students_tab = QWidget()
         students_layout = QVBoxLayout(students_tab)
+        student_search_layout = QHBoxLayout()
+        student_search_layout.addWidget(QLabel("Search:"))
+        self.student_search_input = QLineEdit()
+        self.student_search_input.setPlaceholderText("Student ID, major or gender")
+        student_search_layout.addWidget(self.student_search_input)
+        students_layout.addLayout(student_search_layout)
+
+        # Typing restarts the timer, so the directory is queried once the user pauses
+        self.student_search_timer = QTimer(self)
+        self.student_search_timer.setSingleShot(True)
+        self.student_search_timer.setInterval(300)
+        self.student_search_timer.timeout.connect(self.load_students)
+        self.student_search_input.textChanged.connect(self.student_search_timer.start)
+
         self.students_table = QTableWidget()
+        self.students_table.setColumnCount(3)
+        self.students_table.setHorizontalHeaderLabels(["Student ID", "Gender", "Major"])
+        self.students_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.students_table.horizontalHeader().setSortIndicatorShown(True)
+        self.students_table.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+        self.students_table.horizontalHeader().sectionClicked.connect(self.sort_students)
         students_layout.addWidget(self.students_table)
+
+        student_page_layout = QHBoxLayout()
+        self.previous_students_button = QPushButton("Previous")
+        self.previous_students_button.clicked.connect(self.previous_student_page)
+        student_page_layout.addWidget(self.previous_students_button)
+        self.student_page_label = QLabel()
+        student_page_layout.addWidget(self.student_page_label)
+        self.next_students_button = QPushButton("Next")
+        self.next_students_button.clicked.connect(self.next_student_page)
+        student_page_layout.addWidget(self.next_students_button)
+        student_page_layout.addStretch()
+        self.export_students_button = QPushButton("Export...")
+        self.export_students_button.clicked.connect(self.export_students)
+        student_page_layout.addWidget(self.export_students_button)
+        students_layout.addLayout(student_page_layout)
+        self.student_sort = "student_id"
+        self.student_sort_descending = False
+        self.student_page_index = 0
+        self.student_page_rows = []
+        self.student_total = 0
+
         self.modify_student_button = QPushButton("Modify Student")
         self.modify_student_button.clicked.connect(self.modify_student)
         students_layout.addWidget(self.modify_student_button)
@@ -235,41 +273,78 @@ class StaffDashboard(QMainWindow):
         department_tab.setLayout(department_layout)
         tab_widget.addTab(department_tab, "Department Info")
 
-        self.load_staff_data()
+        # Each tab loads its data the first time it is shown (and again after it is invalidated)
+        self.tab_widget = tab_widget
+        self.courses_subtabs = courses_subtabs
+        self.courses_tab = courses_tab
+        self.catalog_tab = catalog_tab
+        self.schedule_tab = schedule_tab
+        self.instructors_tab = instructors_tab
+        self.teaching_load_tab = teaching_load_tab
+        self.students_tab = students_tab
+        self.department_tab = department_tab
+        self.tab_loaders = {
+            catalog_tab: self.load_catalog,
+            schedule_tab: self.load_semester_courses,
+            instructors_tab: self.load_instructors,
+            teaching_load_tab: self.load_teaching_load,
+            students_tab: self.load_students,
+            department_tab: self.load_department_info,
+        }
+        self.loaded_tabs = set()
+        tab_widget.currentChanged.connect(self.load_visible_tab)
+        courses_subtabs.currentChanged.connect(self.load_visible_tab)
+
         self.load_initial_data()
 
     def load_initial_data(self):
-        """Load all initial data for the dashboard"""
-        print("Loading initial dashboard data...")
-        self.load_staff_data()
-        # Load initial semester courses if a semester is selected
-        if self.semester_selector.count() > 0:
-            print(f"Initial semester selected: {self.semester_selector.currentText()}")
-            self.load_semester_courses()
-        else:
-            print("No semesters available in selector")
-
+        """
+        Load the first visible tab once the window has been painted. The
+        catalog is filled from the prewarm fetch when there is one.
+        """
+        if self.prewarm:
+            self.loaded_tabs.add(self.catalog_tab)
+            show_loading(self.catalog_table)
+            self.prewarm.on_ready("catalog", self.load_catalog)
+        QTimer.singleShot(0, self.load_visible_tab)
+
+    def visible_tab(self):
+        """Return the tab page currently shown, looking inside the Courses subtabs"""
+        current = self.tab_widget.currentWidget()
+        if current is self.courses_tab:
+            current = self.courses_subtabs.currentWidget()
+        return current
+
+    def load_visible_tab(self, *_):
+        """Run the loader of the visible tab if its data has not been loaded yet"""
+        tab = self.visible_tab()
+        if tab in self.tab_loaders and tab not in self.loaded_tabs:
+            self.loaded_tabs.add(tab)
+            self.tab_loaders[tab]()
+
+    def refresh_tabs(self, *tabs):
+        """Mark tabs as stale; the visible one is reloaded now, the others when next shown"""
+        for tab in tabs:
+            self.loaded_tabs.discard(tab)
+        self.load_visible_tab()
 
     def load_staff_data(self):
-        try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
+        """Reload the catalog, instructor, student and department tabs after a change"""
+        self.refresh_tabs(self.catalog_tab, self.instructors_tab, self.students_tab, self.department_tab)
 
+    def load_catalog(self, courses=None):
+        """Load the department's course catalog, unless it was prewarmed"""
+        conn = None
+        try:
             # ========== Load Courses Tab ==========
             self.catalog_table.clear()
             self.catalog_table.setRowCount(0)
+            self.catalog_table.setHorizontalHeaderLabels(["Prefix", "Number", "Credits"])
 
-            # Modified query to use department_course_prefixes table
-            cursor.execute("""
-                SELECT DISTINCT c.course_prefix, c.course_number, c.credits
-                FROM courses c
-                JOIN department_course_prefixes dcp ON c.course_prefix = dcp.course_prefix
-                WHERE dcp.department_id = ?
-                ORDER BY c.course_prefix, c.course_number
-            """, (self.department_id,))
-
-            courses = cursor.fetchall()
+            if courses is None:
+                conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                    '..', 'data', 'academic_management.db'))
+                courses = fetch_department_catalog(conn, self.department_id)
             print(f"Found {len(courses)} courses for department {self.department_id}")  # Debug print
 
             # Populate courses table
@@ -282,6 +357,25 @@ class StaffDashboard(QMainWindow):
 
             self.catalog_table.resizeColumnsToContents()
 
+        except sqlite3.Error as e:
+            self.logger.log_operation(
+                OperationType.ERROR,
+                f"Database error while loading staff data: {str(e)}"
+            )
+            QMessageBox.critical(self, "Error", "Failed to load staff data")
+            print(f"Database error: {e}")  # For debugging
+        finally:
+            if conn:
+                conn.close()
+
+    def load_instructors(self):
+        """Load the department's instructors"""
+        conn = None
+        try:
+            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                '..', 'data', 'academic_management.db'))
+            cursor = conn.cursor()
+
             # ========== Load Instructors Tab ==========
             self.instructors_table.clear()
             self.instructors_table.setRowCount(0)
@@ -320,24 +414,86 @@ class StaffDashboard(QMainWindow):
 
             self.instructors_table.resizeColumnsToContents()
 
-            # ========== Load Students Tab ==========
-            self.students_table.clear()
-            self.students_table.setRowCount(0)
+        except sqlite3.Error as e:
+            self.logger.log_operation(
+                OperationType.ERROR,
+                f"Database error while loading staff data: {str(e)}"
+            )
+            QMessageBox.critical(self, "Error", "Failed to load staff data")
+            print(f"Database error: {e}")  # For debugging
+        finally:
+            if conn:
+                conn.close()
+
+    def load_students(self):
+        """Load the first page of the department's students for the current search and sort"""
+        self.load_student_page(page_index=0)
 
-            # Set up students table headers
-            self.students_table.setColumnCount(3)
-            self.students_table.setHorizontalHeaderLabels(["Student ID", "Gender", "Major"])
+    def next_student_page(self):
+        if self.student_page_rows:
+            self.load_student_page(
+                after=StudentDirectory.key(self.student_page_rows[-1], self.student_sort),
+                page_index=self.student_page_index + 1
+            )
 
-            # Get students for the department's majors
-            cursor.execute("""
-                        SELECT DISTINCT s.student_id, s.gender, s.major
-                        FROM students s
-                        JOIN department_majors dm ON s.major = dm.major_name
-                        WHERE dm.department_id = ?
-                        ORDER BY s.student_id
-                    """, (self.department_id,))
+    def previous_student_page(self):
+        if self.student_page_rows and self.student_page_index > 0:
+            self.load_student_page(
+                before=StudentDirectory.key(self.student_page_rows[0], self.student_sort),
+                page_index=self.student_page_index - 1
+            )
+
+    def sort_students(self, column):
+        """Sort the directory by a column, toggling the direction when it is already sorted by it"""
+        sort = list(SORT_COLUMNS)[column]
+        self.student_sort_descending = sort == self.student_sort and not self.student_sort_descending
+        self.student_sort = sort
+        self.students_table.horizontalHeader().setSortIndicator(
+            column, Qt.DescendingOrder if self.student_sort_descending else Qt.AscendingOrder
+        )
+        self.load_students()
 
-            students = cursor.fetchall()
+    def export_students(self):
+        """Export every student matching the search in the current order, not just the page shown"""
+        conn = None
+        try:
+            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                '..', 'data', 'academic_management.db'))
+            sql, params = StudentDirectory(conn, self.department_id).listing(
+                self.student_search_input.text(), self.student_sort, self.student_sort_descending)
+        except sqlite3.Error as e:
+            self.logger.log_operation(OperationType.ERROR, f"Failed to export students: {str(e)}")
+            QMessageBox.critical(self, "Error", "Failed to export students")
+            return
+        finally:
+            if conn:
+                conn.close()
+
+        job = export_query_results(self, "Export Students", f"{self.department_id}_students.csv",
+                                   self.service.connect, sql, headers=["Student ID", "Gender", "Major"],
+                                   params=params)
+        if job:
+            self.logger.log_data_access("students", f"exported student directory to {job.path}",
+                                        {"search": self.student_search_input.text()})
+            self.export_job = job
+
+    def load_student_page(self, after=None, before=None, page_index=0):
+        """Load one page of the student directory; filtering, sorting and paging run in SQL"""
+        search = self.student_search_input.text()
+        conn = None
+        try:
+            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                '..', 'data', 'academic_management.db'))
+            directory = StudentDirectory(conn, self.department_id)
+            if page_index == 0 and before is None:
+                after = None
+                self.student_total = directory.count(search)
+            students = directory.page(search, self.student_sort, self.student_sort_descending,
+                                      after=after, before=before)
+            if not students and page_index > 0:
+                # The page emptied since it was counted (e.g. a student changed major)
+                self.load_students()
+                return
 
             # Log student data access
             self.logger.log_data_access(
@@ -345,73 +501,31 @@ class StaffDashboard(QMainWindow):
                 "retrieved department students",
                 {
                     "department_id": self.department_id,
+                    "search": search,
+                    "page": page_index + 1,
                     "student_count": len(students)
                 }
             )
 
-            # Populate students table
+            self.student_page_rows = students
+            self.student_page_index = page_index
             self.students_table.setRowCount(len(students))
             for row, student in enumerate(students):
                 for col, value in enumerate(student):
                     item = QTableWidgetItem(str(value))
                     item.setTextAlignment(Qt.AlignCenter)
                     self.students_table.setItem(row, col, item)
-
             self.students_table.resizeColumnsToContents()
 
-            # ========== Load Department Info Tab ==========
-            # Get department information
-            cursor.execute("""
-                        SELECT d.department_id, d.building, d.office
-                        FROM departments d
-                        WHERE d.department_id = ?
-                    """, (self.department_id,))
-
-            dept_info = cursor.fetchone()
-
-            if dept_info:
-                self.department_info_label.setText(
-                    f"Department ID: {dept_info[0]}\n"
-                    f"Building: {dept_info[1]}\n"
-                    f"Office: {dept_info[2]}"
+            first = page_index * directory.page_size
+            if students:
+                self.student_page_label.setText(
+                    f"Students {first + 1}-{first + len(students)} of {self.student_total}"
                 )
             else:
-                self.department_info_label.setText("No department information available.")
-
-            # Load department majors
-            self.department_majors_table.clear()
-            self.department_majors_table.setRowCount(0)
-            self.department_majors_table.setColumnCount(2)
-            self.department_majors_table.setHorizontalHeaderLabels(["Major", "Required Hours"])
-
-            cursor.execute("""
-                        SELECT major_name, hours_req
-                        FROM department_majors
-                        WHERE department_id = ?
-                        ORDER BY major_name
-                    """, (self.department_id,))
-
-            majors = cursor.fetchall()
-
-            # Log department data access
-            self.logger.log_data_access(
-                "department_majors",
-                "retrieved department majors",
-                {
-                    "department_id": self.department_id,
-                    "major_count": len(majors)
-                }
-            )
-
-            # Populate majors table
-            self.department_majors_table.setRowCount(len(majors))
-            for row, major in enumerate(majors):
-                for col, value in enumerate(major):
-                    item = QTableWidgetItem(str(value))
-                    item.setTextAlignment(Qt.AlignCenter)
-                    self.department_majors_table.setItem(row, col, item)
-
-            self.department_majors_table.resizeColumnsToContents()
+                self.student_page_label.setText("No students found")
+            self.previous_students_button.setEnabled(page_index > 0)
+            self.next_students_button.setEnabled(first + len(students) < self.student_total)
 
         except sqlite3.Error as e:
             self.logger.log_operation(
@@ -498,92 +612,19 @@ class StaffDashboard(QMainWindow):
                 QMessageBox.warning(self, "Error", "Credits must be a number between 1 and 4")
                 return
 
-            # Validate inputs
-            if not prefix or len(prefix) != 3 or not prefix.isalpha():
-                self.logger.log_operation(
-                    OperationType.ERROR,
-                    "Invalid course prefix format",
-                    {"prefix": prefix, "reason": "Prefix must be exactly 3 uppercase letters"}
-                )
-                QMessageBox.warning(self, "Error", "Course prefix must be exactly 3 letters")
-                return
-
-            if not number or not number.isdigit():
-                self.logger.log_operation(
-                    OperationType.ERROR,
-                    "Invalid course number format",
-                    {"number": number}
-                )
-                QMessageBox.warning(self, "Error", "Course number must be numeric")
-                return
-
-            if credits < 1 or credits > 4:
-                self.logger.log_operation(
-                    OperationType.ERROR,
-                    "Invalid credits value",
-                    {"credits": credits}
-                )
-                QMessageBox.warning(self, "Error", "Credits must be between 1 and 4")
-                return
-
             try:
-                conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                    '..', 'data', 'academic_management.db'))
-                cursor = conn.cursor()
-
-                # Check if the prefix is already assigned to another department
-                cursor.execute("""
-                    SELECT d.department_id 
-                    FROM department_course_prefixes d
-                    WHERE d.course_prefix = ?
-                """, (prefix,))
+                # Validates the inputs, prefix ownership and duplicates
+                violations = self.service.add_course(self.department_id, prefix, number, credits)
 
-                existing_dept = cursor.fetchone()
-
-                if existing_dept and existing_dept[0] != self.department_id:
-                    self.logger.log_operation(
-                        OperationType.ERROR,
-                        "Attempted to add course with prefix belonging to another department",
-                        {"prefix": prefix, "owning_department": existing_dept[0]}
-                    )
-                    QMessageBox.warning(self, "Error",
-                                        "This course prefix belongs to another department")
-                    return
-
-                # Check for duplicate course
-                cursor.execute("""
-                    SELECT COUNT(*) FROM courses
-                    WHERE course_prefix = ? AND course_number = ?
-                """, (prefix, number))
-
-                if cursor.fetchone()[0] > 0:
+                if violations:
                     self.logger.log_operation(
                         OperationType.ERROR,
-                        "Attempted to add duplicate course",
-                        {"prefix": prefix, "number": number}
+                        "Course addition rejected by validation",
+                        {"prefix": prefix, "number": number, "rules": ", ".join(v["rule"] for v in violations)}
                     )
-                    QMessageBox.warning(self, "Error", "This course already exists")
+                    QMessageBox.warning(self, "Error", format_violations(violations))
                     return
 
-                # Begin transaction
-                cursor.execute("BEGIN TRANSACTION")
-
-                # If this is a new prefix, add it to department_course_prefixes
-                if not existing_dept:
-                    cursor.execute("""
-                        INSERT INTO department_course_prefixes 
-                        (department_id, course_prefix, is_primary, added_date)
-                        VALUES (?, ?, 0, datetime('now'))
-                    """, (self.department_id, prefix))
-
-                # Add the course
-                cursor.execute("""
-                    INSERT INTO courses (course_prefix, course_number, credits)
-                    VALUES (?, ?, ?)
-                """, (prefix, number, credits))
-
-                cursor.execute("COMMIT")
-
                 self.logger.log_operation(
                     OperationType.ADD,
                     "Successfully added new course",
@@ -594,16 +635,11 @@ class StaffDashboard(QMainWindow):
                 QMessageBox.information(self, "Success", "Course added successfully")
 
             except sqlite3.Error as e:
-                if conn:
-                    cursor.execute("ROLLBACK")
                 self.logger.log_operation(
                     OperationType.ERROR,
                     f"Database error while adding course: {str(e)}"
                 )
                 QMessageBox.warning(self, "Error", "Failed to add course")
-            finally:
-                if conn:
-                    conn.close()
 
     def on_prefix_selection_changed(index):
         if prefix_combo.currentText() == "New Prefix...":
@@ -721,56 +757,190 @@ class StaffDashboard(QMainWindow):
         number = self.catalog_table.item(row, 1).text()
 
         try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-
-            # Check for existing enrollments
-            cursor.execute("""
-                SELECT COUNT(*) FROM student_courses
-                WHERE course_prefix = ? AND course_number = ?
-            """, (prefix, number))
+            # Refused while the course has enrollments, checked before asking
+            # and again when removing, in case a student enrolled meanwhile
+            violations = self.service.can_remove_course(prefix, number)
+            if not violations:
+                reply = QMessageBox.question(
+                    self,
+                    "Confirm Removal",
+                    f"Are you sure you want to remove {prefix} {number}?",
+                    QMessageBox.Yes | QMessageBox.No,
+                    QMessageBox.No
+                )
+                if reply != QMessageBox.Yes:
+                    return
+                violations = self.service.remove_course(prefix, number)
 
-            if cursor.fetchone()[0] > 0:
+            if violations:
                 self.logger.log_operation(
                     OperationType.ERROR,
                     "Attempted to remove course with existing enrollments",
                     {"course": f"{prefix} {number}"}
                 )
-                QMessageBox.warning(self, "Error", "Cannot remove course with existing enrollments")
+                QMessageBox.warning(self, "Error", format_violations(violations))
                 return
 
-            reply = QMessageBox.question(
-                self,
-                "Confirm Removal",
-                f"Are you sure you want to remove {prefix} {number}?",
-                QMessageBox.Yes | QMessageBox.No,
-                QMessageBox.No
+            self.logger.log_operation(
+                OperationType.DELETE,
+                "Successfully removed course",
+                {"course": f"{prefix} {number}"}
             )
 
-            if reply == QMessageBox.Yes:
-                cursor.execute("""
-                    DELETE FROM courses
-                    WHERE course_prefix = ? AND course_number = ?
-                """, (prefix, number))
+            self.load_staff_data()
+            self.refresh_tabs(self.teaching_load_tab)
+            QMessageBox.information(self, "Success", "Course removed successfully")
 
-                conn.commit()
+        except sqlite3.Error as e:
+            self.logger.log_operation(
+                OperationType.ERROR,
+                f"Database error while removing course: {str(e)}"
+            )
+            QMessageBox.warning(self, "Error", "Failed to remove course")
+
+    def batch_edit_catalog(self):
+        """Edit several catalog courses at once and apply them as one change set"""
+        original = [
+            (self.catalog_table.item(row, 0).text(), self.catalog_table.item(row, 1).text(),
+             self.catalog_table.item(row, 2).text())
+            for row in range(self.catalog_table.rowCount())
+        ]
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Batch Edit Catalog")
+        dialog.resize(450, 500)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel("Edit prefixes, numbers or credits in place. Renamed courses keep "
+                                "their schedule and enrollment history."))
+
+        table = QTableWidget(len(original), 3)
+        table.setHorizontalHeaderLabels(["Prefix", "Number", "Credits"])
+        for row, (prefix, number, credits) in enumerate(original):
+            for col, value in enumerate((prefix, number, credits)):
+                item = QTableWidgetItem(str(value))
+                if col == 0:
+                    # Remember the course this row started as, so edits become renames
+                    item.setData(Qt.UserRole, (prefix, number))
+                table.setItem(row, col, item)
+        layout.addWidget(table)
+
+        row_buttons = QHBoxLayout()
+        add_row_button = QPushButton("Add Row")
+        remove_rows_button = QPushButton("Remove Selected")
+        row_buttons.addWidget(add_row_button)
+        row_buttons.addWidget(remove_rows_button)
+        layout.addLayout(row_buttons)
+
+        def add_row():
+            table.insertRow(table.rowCount())
+            for col in range(3):
+                table.setItem(table.rowCount() - 1, col, QTableWidgetItem(""))
+            table.scrollToBottom()
+
+        def remove_rows():
+            for row in sorted({index.row() for index in table.selectedIndexes()}, reverse=True):
+                table.removeRow(row)
+
+        add_row_button.clicked.connect(add_row)
+        remove_rows_button.clicked.connect(remove_rows)
+
+        buttons = QHBoxLayout()
+        apply_button = QPushButton("Apply")
+        cancel_button = QPushButton("Cancel")
+        buttons.addWidget(apply_button)
+        buttons.addWidget(cancel_button)
+        layout.addLayout(buttons)
+        apply_button.clicked.connect(dialog.accept)
+        cancel_button.clicked.connect(dialog.reject)
 
+        # Re-open the dialog with the edits intact until the change set is valid or cancelled
+        while dialog.exec_():
+            edited = []
+            for row in range(table.rowCount()):
+                values = [table.item(row, col).text().strip() if table.item(row, col) else ""
+                          for col in range(3)]
+                if table.item(row, 0) is None or not any(values):
+                    continue
+                edited.append((table.item(row, 0).data(Qt.UserRole), values[0].upper(), values[1], values[2]))
+
+            changes = diff_catalog(original, edited)
+            if not changes:
+                QMessageBox.information(self, "Batch Edit", "No changes to apply.")
+                return
+            if self.apply_catalog_changes(changes, "batch edit"):
+                return
+
+    def import_catalog(self):
+        """Import catalog additions, changes and removals from a CSV file"""
+        path, _ = QFileDialog.getOpenFileName(self, "Import Catalog", "", "CSV Files (*.csv);;All Files (*)")
+        if not path:
+            return
+
+        try:
+            changes = read_catalog_file(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Import Failed", str(e))
+            return
+
+        if not changes:
+            QMessageBox.information(self, "Import Catalog", "The file contains no changes.")
+            return
+
+        actions = {}
+        for change in changes:
+            actions[change["action"]] = actions.get(change["action"], 0) + 1
+        summary = ", ".join(f"{count} {action}" for action, count in sorted(actions.items()))
+        reply = QMessageBox.question(
+            self,
+            "Confirm Import",
+            f"Apply {len(changes)} catalog change(s) from {os.path.basename(path)} ({summary})?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            self.apply_catalog_changes(changes, f"import of {os.path.basename(path)}")
+
+    def apply_catalog_changes(self, changes, source):
+        """Validate and apply a catalog change set atomically; return True if it was applied"""
+        conn = None
+        try:
+            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                '..', 'data', 'academic_management.db'))
+            counts, violations = CatalogBatch(conn, self.department_id).apply(changes)
+
+            if violations:
                 self.logger.log_operation(
-                    OperationType.DELETE,
-                    "Successfully removed course",
-                    {"course": f"{prefix} {number}"}
+                    OperationType.ERROR,
+                    f"Catalog {source} rejected by validation",
+                    {"rules": ", ".join(sorted({v["rule"] for v in violations})), "errors": len(violations)}
                 )
+                messages = [v["message"] for v in violations[:20]]
+                if len(violations) > len(messages):
+                    messages.append(f"... and {len(violations) - len(messages)} more")
+                QMessageBox.warning(self, "Error", "No changes were applied:\n" + "\n".join(messages))
+                return False
 
-                self.load_staff_data()
-                QMessageBox.information(self, "Success", "Course removed successfully")
+            self.logger.log_operation(
+                OperationType.MODIFY,
+                f"Applied catalog {source}",
+                counts
+            )
+            self.load_staff_data()
+            self.refresh_tabs(self.schedule_tab, self.teaching_load_tab)
+            QMessageBox.information(
+                self, "Success",
+                f"Catalog updated: {counts['added']} added, {counts['modified']} modified "
+                f"({counts['renamed']} renamed), {counts['removed']} removed."
+            )
+            return True
 
         except sqlite3.Error as e:
             self.logger.log_operation(
                 OperationType.ERROR,
-                f"Database error while removing course: {str(e)}"
+                f"Database error while applying catalog {source}: {str(e)}"
             )
-            QMessageBox.warning(self, "Error", "Failed to remove course")
+            QMessageBox.warning(self, "Error", "Failed to update the catalog")
+            return False
         finally:
             if conn:
                 conn.close()
@@ -781,6 +951,7 @@ class StaffDashboard(QMainWindow):
             conn = sqlite3.connect(db_path)
             cursor = conn.cursor()
             cursor.execute("DELETE FROM courses WHERE course_prefix = ? AND course_number = ?", (prefix, number))
+            refresh_course_loads(conn, prefix, number)
             conn.commit()
             QMessageBox.information(self, "Success", "Course removed successfully.")
         except sqlite3.Error as e:
@@ -817,14 +988,12 @@ class StaffDashboard(QMainWindow):
         dialog.setWindowTitle("Modify Course")
         layout = QFormLayout(dialog)
 
-        # Course prefix (read-only)
+        # Course prefix and number; a change renames the course everywhere it is referenced
         prefix_input = QLineEdit(prefix)
-        prefix_input.setReadOnly(True)
+        prefix_input.setMaxLength(3)
         layout.addRow("Course Prefix:", prefix_input)
 
-        # Course number (read-only as well to prevent inconsistencies)
         number_input = QLineEdit(number)
-        number_input.setReadOnly(True)
         layout.addRow("Course Number:", number_input)
 
         # Credits can be modified
@@ -842,6 +1011,7 @@ class StaffDashboard(QMainWindow):
         cancel_button.clicked.connect(dialog.reject)
 
         if dialog.exec_():
+            conn = None
             try:
                 new_credits = int(credits_input.text().strip())
                 if new_credits < 1 or new_credits > 4:
@@ -853,6 +1023,12 @@ class StaffDashboard(QMainWindow):
                     QMessageBox.warning(self, "Error", "Credits must be between 1 and 4")
                     return
 
+                new_prefix = prefix_input.text().strip().upper()
+                new_number = number_input.text().strip()
+                if (new_prefix, new_number) != (prefix, number):
+                    self.rename_catalog_course((prefix, number), (new_prefix, new_number), new_credits)
+                    return
+
                 conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
                                                     '..', 'data', 'academic_management.db'))
                 cursor = conn.cursor()
@@ -872,9 +1048,11 @@ class StaffDashboard(QMainWindow):
                     SET credits = ?
                     WHERE course_prefix = ? AND course_number = ?
                 """, (new_credits, prefix, number))
+                refresh_course_loads(conn, prefix, number)
 
                 conn.commit()
                 self.load_staff_data()
+                self.refresh_tabs(self.teaching_load_tab)
                 QMessageBox.information(self, "Success", "Course updated successfully")
 
             except ValueError:
@@ -895,19 +1073,64 @@ class StaffDashboard(QMainWindow):
                     conn.close()
 
 
+    def rename_catalog_course(self, old_key, new_key, new_credits):
+        """Show the impact of a course rename/renumber and apply it to every referencing table"""
+        conn = None
+        try:
+            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                '..', 'data', 'academic_management.db'))
+            impact = rename_course(conn, old_key, new_key, dry_run=True)
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", str(e))
+            return
+        except sqlite3.Error as e:
+            self.logger.log_operation(
+                OperationType.ERROR,
+                f"Database error while checking course rename: {str(e)}"
+            )
+            QMessageBox.warning(self, "Error", "Failed to check the course rename")
+            return
+        finally:
+            if conn:
+                conn.close()
+
+        affected = "\n".join(f"  {table}: {count} row(s)" for table, count in impact.items() if count)
+        reply = QMessageBox.question(
+            self,
+            "Confirm Rename",
+            f"Rename {old_key[0]} {old_key[1]} to {new_key[0]} {new_key[1]}?\n\n"
+            f"The following records will be updated:\n{affected}",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            self.apply_catalog_changes(
+                [{"action": "modify", "prefix": old_key[0], "number": old_key[1], "credits": new_credits,
+                  "new_prefix": new_key[0], "new_number": new_key[1]}],
+                f"rename of {old_key[0]} {old_key[1]} to {new_key[0]} {new_key[1]}"
+            )
+
     def update_course(self, old_prefix, old_number, new_prefix, new_number, new_credits):
         db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'academic_management.db')
+        conn = None
         try:
             conn = sqlite3.connect(db_path)
             cursor = conn.cursor()
+            # The rename and the credit change succeed or fail together
+            cursor.execute("BEGIN TRANSACTION")
+            if (new_prefix, new_number) != (old_prefix, old_number):
+                rename_course(conn, (old_prefix, old_number), (new_prefix, new_number), commit=False)
             cursor.execute("""
                 UPDATE courses 
-                SET course_prefix = ?, course_number = ?, credits = ?
+                SET credits = ?
                 WHERE course_prefix = ? AND course_number = ?
-            """, (new_prefix, new_number, new_credits, old_prefix, old_number))
+            """, (new_credits, new_prefix, new_number))
+            refresh_course_loads(conn, new_prefix, new_number)
             conn.commit()
             QMessageBox.information(self, "Success", "Course updated successfully.")
-        except sqlite3.Error as e:
+        except (sqlite3.Error, ValueError) as e:
+            if conn:
+                conn.rollback()
             print(f"Database error: {e}")
             QMessageBox.warning(self, "Error", "Failed to update course.")
         finally:
@@ -997,37 +1220,36 @@ class StaffDashboard(QMainWindow):
                                                     '..', 'data', 'academic_management.db'))
                 cursor = conn.cursor()
 
-                # Check instructor credit hours
+                semester_data = self.semester_selector.currentData()
+                if not semester_data:
+                    QMessageBox.warning(self, "Error", "Please select a semester on the schedule tab.")
+                    return
+                semester, year = semester_data
+
+                # Check instructor credit hours for the selected semester
                 self.logger.log_data_access(
                     "instructor_courses",
                     "checking instructor credit load",
-                    {"instructor_id": instructor_id}
+                    {"instructor_id": instructor_id, "semester": f"{semester} {year}"}
                 )
 
-                cursor.execute("""
-                    SELECT SUM(c.credits)
-                    FROM instructor_courses ic
-                    JOIN courses c ON ic.course_prefix = c.course_prefix 
-                        AND ic.course_number = c.course_number
-                    WHERE ic.instructor_id = ?
-                """, (instructor_id,))
-
-                current_credits = cursor.fetchone()[0] or 0
-                new_course_credits = int(self.courses_table.item(
-                    course_combo.currentIndex(), 2).text())
-
-                if current_credits + new_course_credits > 12:
+                validator = RegistrationValidator(conn)
+                violations = validator.validate_term_sections(
+                    [{"prefix": course_prefix, "number": course_number, "instructor_id": instructor_id}],
+                    semester, year
+                )
+
+                if violations:
                     self.logger.log_operation(
                         OperationType.ERROR,
-                        "Instructor credit hour limit exceeded",
+                        "Instructor assignment rejected by validation",
                         {
                             "instructor_id": instructor_id,
-                            "current_credits": current_credits,
-                            "attempted_add_credits": new_course_credits
+                            "course": f"{course_prefix} {course_number}",
+                            "rules": ", ".join(v["rule"] for v in violations)
                         }
                     )
-                    QMessageBox.warning(self, "Error",
-                                        "Instructor cannot exceed 12 credit hours per semester.")
+                    QMessageBox.warning(self, "Error", format_violations(violations))
                     return
 
                 # Log the assignment attempt
@@ -1041,11 +1263,14 @@ class StaffDashboard(QMainWindow):
                 )
 
                 cursor.execute("""
-                    INSERT INTO instructor_courses (instructor_id, course_prefix, course_number)
-                    VALUES (?, ?, ?)
-                """, (instructor_id, course_prefix, course_number))
+                    INSERT INTO instructor_courses
+                    (instructor_id, course_prefix, course_number, semester, year_taught)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (instructor_id, course_prefix, course_number, semester, year))
+                refresh_instructor_loads(conn, [(semester, year)])
 
                 conn.commit()
+                self.refresh_tabs(self.schedule_tab, self.teaching_load_tab)
 
                 self.logger.log_operation(
                     OperationType.ADD,
@@ -1611,6 +1836,7 @@ class StaffDashboard(QMainWindow):
             )
 
             # Modified query to correctly join with department_course_prefixes
+            ensure_section_enrollment_table(conn)
             cursor.execute("""
                 SELECT 
                     c.course_prefix || ' ' || c.course_number as course,
@@ -1619,12 +1845,17 @@ class StaffDashboard(QMainWindow):
                     CASE 
                         WHEN ic.instructor_id IS NULL THEN 'Unassigned'
                         ELSE 'Assigned'
-                    END as status
+                    END as status,
+                    COALESCE(se.enrolled, 0) as enrolled
                 FROM instructor_courses ic
                 JOIN courses c ON ic.course_prefix = c.course_prefix 
                     AND ic.course_number = c.course_number
                 JOIN department_course_prefixes dcp ON c.course_prefix = dcp.course_prefix
                 LEFT JOIN instructors i ON ic.instructor_id = i.instructor_id
+                LEFT JOIN section_enrollment se ON se.course_prefix = ic.course_prefix
+                    AND se.course_number = ic.course_number
+                    AND se.semester = ic.semester
+                    AND se.year = ic.year_taught
                 WHERE dcp.department_id = ?
                     AND ic.semester = ? 
                     AND ic.year_taught = ?
@@ -1636,9 +1867,13 @@ class StaffDashboard(QMainWindow):
             # Debug print
             print(f"Found {len(courses)} courses for {semester} {year} in department {self.department_id}")
 
+            meetings = MeetingConflictChecker(conn, semester, year).meetings
+
             self.semester_courses_table.setRowCount(len(courses))
             for row, course in enumerate(courses):
-                for col, value in enumerate(course):
+                course_meetings = meetings.get(tuple(course[0].split()), [])
+                meeting_text = "; ".join(format_meeting(meeting) for meeting in course_meetings) or "TBA"
+                for col, value in enumerate(course + (meeting_text,)):
                     item = QTableWidgetItem(str(value))
                     item.setTextAlignment(Qt.AlignCenter)
                     self.semester_courses_table.setItem(row, col, item)
@@ -1657,6 +1892,64 @@ class StaffDashboard(QMainWindow):
             if conn:
                 conn.close()
 
+    def load_teaching_load(self):
+        """Show every department instructor's credit load across the current and future semesters"""
+        conn = None
+        try:
+            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                '..', 'data', 'academic_management.db'))
+            cursor = conn.cursor()
+
+            self.logger.log_data_access(
+                "instructor_load",
+                "retrieving instructor teaching loads",
+                {"department": self.department_id}
+            )
+
+            cursor.execute("""
+                SELECT instructor_id
+                FROM instructors
+                WHERE department_id = ?
+                ORDER BY instructor_id
+            """, (self.department_id,))
+            instructor_ids = [row[0] for row in cursor.fetchall()]
+
+            _, terms = self.get_current_and_future_semesters()
+            matrix = InstructorLoadMatrix(conn, terms, instructor_ids)
+
+            self.teaching_load_table.clear()
+            self.teaching_load_table.setRowCount(len(instructor_ids))
+            self.teaching_load_table.setColumnCount(len(terms) + 1)
+            semester_names = {'F': 'Fall', 'S': 'Spring', 'U': 'Summer'}
+            self.teaching_load_table.setHorizontalHeaderLabels(
+                ["Instructor ID"] + [f"{semester_names[sem]} {year}" for sem, year in terms]
+            )
+
+            for row, instructor_id in enumerate(instructor_ids):
+                self.teaching_load_table.setItem(row, 0, QTableWidgetItem(str(instructor_id)))
+                for col, (sem, year) in enumerate(terms, start=1):
+                    load = matrix.load(instructor_id, sem, year)
+                    limit = matrix.limit(instructor_id, sem, year)
+                    sections = matrix.section_count(instructor_id, sem, year)
+                    item = QTableWidgetItem(f"{load} / {limit} ({sections} section{'s' if sections != 1 else ''})")
+                    item.setTextAlignment(Qt.AlignCenter)
+                    if load > limit:
+                        item.setBackground(Qt.red)
+                    elif load == limit:
+                        item.setBackground(Qt.yellow)
+                    self.teaching_load_table.setItem(row, col, item)
+
+            self.teaching_load_table.resizeColumnsToContents()
+
+        except sqlite3.Error as e:
+            error_msg = f"Failed to load teaching loads: {str(e)}"
+            self.logger.log_operation("error", error_msg)
+            print(error_msg)
+            QMessageBox.warning(self, "Error", "Failed to load teaching loads")
+        finally:
+            if conn:
+                conn.close()
+
     def add_to_schedule(self):
         """Add a course to the semester schedule"""
         # Create the dialog with a reference to the current semester
@@ -1664,6 +1957,7 @@ class StaffDashboard(QMainWindow):
         dialog = CourseManagementDialog(self, current_semester_data)
         # Connect the signal before showing the dialog
         dialog.course_scheduled.connect(self.load_semester_courses)
+        dialog.course_scheduled.connect(self.load_teaching_load)
         dialog.exec_()
 
     def remove_from_schedule(self):
@@ -1693,26 +1987,14 @@ class StaffDashboard(QMainWindow):
         if reply == QMessageBox.Yes:
             try:
                 course_prefix, course_number = course.split()
-                conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                    '..', 'data', 'academic_management.db'))
-                cursor = conn.cursor()
-
-                cursor.execute("""
-                    DELETE FROM instructor_courses 
-                    WHERE course_prefix = ? 
-                    AND course_number = ? 
-                    AND semester = ? 
-                    AND year_taught = ?
-                """, (course_prefix, course_number, semester, year))
-
-                conn.commit()
+                self.service.unschedule_section(course_prefix, course_number, semester, year)
 
                 self.logger.log_operation(
                     "delete",
                     f"Removed course {course} from schedule ({semester} {year})"
                 )
 
-                self.load_semester_courses()
+                self.refresh_tabs(self.schedule_tab, self.teaching_load_tab)
                 QMessageBox.information(self, "Success", "Course removed from schedule successfully.")
 
             except sqlite3.Error as e:
@@ -1721,9 +2003,6 @@ class StaffDashboard(QMainWindow):
                     f"Failed to remove course from schedule: {str(e)}"
                 )
                 QMessageBox.warning(self, "Error", "Failed to remove course from schedule")
-            finally:
-                if conn:
-                    conn.close()
 
     def modify_schedule(self):
         """Modify a scheduled course (e.g., change instructor)"""
@@ -1744,6 +2023,7 @@ class StaffDashboard(QMainWindow):
         # Create instructor selection combo box
         instructor_combo = QComboBox()
         instructor_combo.addItem("TBA", None)
+        current_meetings = []
 
         try:
             conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
@@ -1758,10 +2038,37 @@ class StaffDashboard(QMainWindow):
             """, (self.department_id,))
 
             instructors = cursor.fetchall()
+
+            # Show each instructor's load and disable those without room for the course
+            semester_data = self.semester_selector.currentData()
+            credits_text = self.semester_courses_table.item(row, 1).text()
+            credits = int(credits_text) if credits_text.isdigit() else 0
+            matrix = InstructorLoadMatrix(conn, [semester_data] if semester_data else [],
+                                          [instructor[0] for instructor in instructors])
             for instructor in instructors:
-                instructor_combo.addItem(str(instructor[0]), instructor[0])
-                if str(instructor[0]) == current_instructor:
-                    instructor_combo.setCurrentText(current_instructor)
+                instructor_id = instructor[0]
+                if semester_data:
+                    load = matrix.load(instructor_id, *semester_data)
+                    limit = matrix.limit(instructor_id, *semester_data)
+                    instructor_combo.addItem(f"{instructor_id} ({load}/{limit} credits)", instructor_id)
+                else:
+                    instructor_combo.addItem(str(instructor_id), instructor_id)
+                if str(instructor_id) == current_instructor:
+                    instructor_combo.setCurrentIndex(instructor_combo.count() - 1)
+                elif semester_data and not matrix.can_assign(instructor_id, *semester_data, credits):
+                    instructor_combo.model().item(instructor_combo.count() - 1).setEnabled(False)
+
+            # Every meeting pattern of the section (e.g. lecture and lab)
+            if semester_data:
+                ensure_section_meetings_table(conn)
+                cursor.execute("""
+                    SELECT days, start_time, end_time, room
+                    FROM section_meetings
+                    WHERE course_prefix = ? AND course_number = ? AND semester = ? AND year = ?
+                    ORDER BY id
+                """, (*course.split(), *semester_data))
+                current_meetings = [{"days": days, "start": start, "end": end, "room": room}
+                                    for days, start, end, room in cursor.fetchall()]
 
         except sqlite3.Error as e:
             self.logger.log_operation(
@@ -1775,6 +2082,22 @@ class StaffDashboard(QMainWindow):
         layout.addRow("Course:", QLabel(course))
         layout.addRow("Instructor:", instructor_combo)
 
+        # All meeting patterns; a pattern whose days are left empty is removed
+        meetings_table = QTableWidget(0, 4)
+        meetings_table.setHorizontalHeaderLabels(["Days", "Start", "End", "Room"])
+        for current in current_meetings:
+            self.add_meeting_row(meetings_table, current)
+        pattern_buttons = QHBoxLayout()
+        add_pattern_button = QPushButton("Add Pattern")
+        add_pattern_button.clicked.connect(lambda: self.add_meeting_row(meetings_table))
+        remove_pattern_button = QPushButton("Remove Pattern")
+        remove_pattern_button.clicked.connect(
+            lambda: meetings_table.removeRow(meetings_table.currentRow()) if meetings_table.currentRow() >= 0 else None)
+        pattern_buttons.addWidget(add_pattern_button)
+        pattern_buttons.addWidget(remove_pattern_button)
+        layout.addRow("Meetings:", meetings_table)
+        layout.addRow(pattern_buttons)
+
         buttons = QHBoxLayout()
         save_button = QPushButton("Save")
         cancel_button = QPushButton("Cancel")
@@ -1795,10 +2118,41 @@ class StaffDashboard(QMainWindow):
                 semester, year = semester_data
                 new_instructor = instructor_combo.currentData()
 
+                try:
+                    edited_meetings = self.read_meeting_rows(meetings_table)
+                except ValueError as e:
+                    QMessageBox.warning(self, "Error", str(e))
+                    return
+                # Only rewrite the section's meetings when a pattern was edited
+                new_meetings = None if edited_meetings == current_meetings else edited_meetings
+
                 conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
                                                     '..', 'data', 'academic_management.db'))
                 cursor = conn.cursor()
 
+                validator = RegistrationValidator(conn)
+                violations = validator.validate_term_sections(
+                    [{
+                        "prefix": course_prefix,
+                        "number": course_number,
+                        "instructor_id": new_instructor,
+                        "replaces_existing": True
+                    }],
+                    semester, year
+                )
+                violations.extend(MeetingConflictChecker(conn, semester, year).section_conflicts(
+                    (course_prefix, course_number), new_instructor, new_meetings
+                ))
+
+                if violations:
+                    self.logger.log_operation(
+                        "error",
+                        f"Schedule change for {course} rejected by validation",
+                        {"rules": ", ".join(v["rule"] for v in violations)}
+                    )
+                    QMessageBox.warning(self, "Error", format_violations(violations))
+                    return
+
                 cursor.execute("""
                     UPDATE instructor_courses 
                     SET instructor_id = ?
@@ -1807,15 +2161,19 @@ class StaffDashboard(QMainWindow):
                     AND semester = ? 
                     AND year_taught = ?
                 """, (new_instructor, course_prefix, course_number, semester, year))
+                refresh_instructor_loads(conn, [(semester, year)])
+                if new_meetings is not None:
+                    replace_section_meetings(conn, course_prefix, course_number, semester, year, new_meetings)
 
                 conn.commit()
 
                 self.logger.log_operation(
                     "modify",
-                    f"Updated instructor for {course} to {new_instructor or 'TBA'}"
+                    f"Updated instructor for {course} to {new_instructor or 'TBA'}",
+                    {"meetings": "; ".join(format_meeting(m) for m in edited_meetings) or "none"}
                 )
 
-                self.load_semester_courses()
+                self.refresh_tabs(self.schedule_tab, self.teaching_load_tab)
                 QMessageBox.information(self, "Success", "Schedule updated successfully.")
 
             except sqlite3.Error as e:
@@ -1828,6 +2186,197 @@ class StaffDashboard(QMainWindow):
                 if conn:
                     conn.close()
 
+    def add_meeting_row(self, table, meeting=None):
+        """Append an editable meeting pattern row (days, start, end, room) to a table"""
+        row = table.rowCount()
+        table.insertRow(row)
+        days_input = QLineEdit(meeting["days"] if meeting else "")
+        days_input.setPlaceholderText("e.g. MWF or TR")
+        start_input = QTimeEdit(QTime(9, 0))
+        end_input = QTimeEdit(QTime(9, 50))
+        if meeting:
+            start_input.setTime(QTime(meeting["start"] // 60, meeting["start"] % 60))
+            end_input.setTime(QTime(meeting["end"] // 60, meeting["end"] % 60))
+        start_input.setDisplayFormat("HH:mm")
+        end_input.setDisplayFormat("HH:mm")
+        room_input = QLineEdit((meeting["room"] or "") if meeting else "")
+        for col, widget in enumerate((days_input, start_input, end_input, room_input)):
+            table.setCellWidget(row, col, widget)
+
+    def read_meeting_rows(self, table):
+        """
+        Return the meeting patterns entered in a table, skipping rows without days.
+
+        Raises:
+            ValueError: If a row has unknown day codes or ends before it starts
+        """
+        meetings = []
+        for row in range(table.rowCount()):
+            days = parse_days(table.cellWidget(row, 0).text())
+            if not days:
+                continue
+            start_time = table.cellWidget(row, 1).time()
+            end_time = table.cellWidget(row, 2).time()
+            start = start_time.hour() * 60 + start_time.minute()
+            end = end_time.hour() * 60 + end_time.minute()
+            if start >= end:
+                raise ValueError(f"The end time of the {days} meeting must be after its start time.")
+            meetings.append({"days": days, "start": start, "end": end,
+                             "room": table.cellWidget(row, 3).text().strip() or None})
+        return meetings
+
+    def check_schedule_conflicts(self):
+        """Scan the selected semester for room, instructor and student time conflicts"""
+        semester_data = self.semester_selector.currentData()
+        if not semester_data:
+            return
+
+        semester, year = semester_data
+        conn = None
+        try:
+            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                '..', 'data', 'academic_management.db'))
+            conflicts = MeetingConflictChecker(conn, semester, year).scan_term()
+
+            self.logger.log_operation(
+                "view",
+                f"Checked schedule conflicts for {semester} {year}",
+                {"conflicts": len(conflicts)}
+            )
+
+            if not conflicts:
+                QMessageBox.information(self, "Schedule Conflicts", "No conflicts found in this semester.")
+                return
+
+            # Student conflicts can be numerous; summarize them per course pair
+            lines = [conflict["message"] for conflict in conflicts if conflict["kind"] != "student"]
+            student_pairs = {}
+            for conflict in conflicts:
+                if conflict["kind"] == "student":
+                    student_pairs[conflict["courses"]] = student_pairs.get(conflict["courses"], 0) + 1
+            lines.extend(f"{count} student(s) registered for both {first} and {second}"
+                         for (first, second), count in sorted(student_pairs.items()))
+            shown = lines[:25]
+            if len(lines) > len(shown):
+                shown.append(f"... and {len(lines) - len(shown)} more")
+            QMessageBox.warning(self, "Schedule Conflicts",
+                                f"Found {len(conflicts)} conflict(s):\n" + "\n".join(shown))
+
+        except sqlite3.Error as e:
+            self.logger.log_operation(
+                "error",
+                f"Failed to check schedule conflicts: {str(e)}"
+            )
+            QMessageBox.warning(self, "Error", "Failed to check schedule conflicts")
+        finally:
+            if conn:
+                conn.close()
+
+    def auto_assign_instructors(self):
+        """Preview and apply instructor assignments for every TBA section of the term"""
+        semester_data = self.semester_selector.currentData()
+        if not semester_data:
+            return
+
+        semester, year = semester_data
+        conn = None
+        try:
+            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                '..', 'data', 'academic_management.db'))
+            scheduler = TermScheduler(conn, self.department_id, semester, year)
+            plan = scheduler.plan()
+
+            if not plan["assignments"] and not plan["unassigned"]:
+                QMessageBox.information(self, "Auto-Assign", "There are no TBA sections in this semester.")
+                return
+
+            if not self.preview_schedule_plan(plan):
+                self.logger.log_operation("modify", "Automatic instructor assignment cancelled")
+                return
+
+            violations = scheduler.apply(plan)
+            if violations:
+                self.logger.log_operation(
+                    "error",
+                    "Automatic instructor assignment rejected by validation",
+                    {"rules": ", ".join(v["rule"] for v in violations)}
+                )
+                QMessageBox.warning(self, "Error", format_violations(violations))
+                return
+
+            self.logger.log_operation(
+                "modify",
+                f"Automatically assigned instructors to {len(plan['assignments'])} section(s) "
+                f"for {semester} {year}",
+                {"assignments": ", ".join(f"{s['prefix']} {s['number']}: {s['instructor_id']}"
+                                          for s in plan["assignments"])}
+            )
+            self.refresh_tabs(self.schedule_tab, self.teaching_load_tab)
+            QMessageBox.information(self, "Success",
+                                    f"Assigned instructors to {len(plan['assignments'])} section(s).")
+
+        except sqlite3.Error as e:
+            self.logger.log_operation(
+                "error",
+                f"Failed to assign instructors automatically: {str(e)}"
+            )
+            QMessageBox.warning(self, "Error", "Failed to assign instructors")
+        finally:
+            if conn:
+                conn.close()
+
+    def preview_schedule_plan(self, plan):
+        """Show a dry run of an automatic assignment; return True if the user applies it"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Auto-Assign Preview")
+        dialog.resize(500, 400)
+        layout = QVBoxLayout(dialog)
+
+        sections = plan["assignments"] + plan["unassigned"]
+        table = QTableWidget(len(sections), 3)
+        table.setHorizontalHeaderLabels(["Course", "Credits", "Proposed Instructor"])
+        for row, section in enumerate(sections):
+            values = [f"{section['prefix']} {section['number']}", section["credits"],
+                      section.get("instructor_id") or "Unassigned (no capacity)"]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+                table.setItem(row, col, item)
+        table.resizeColumnsToContents()
+        layout.addWidget(table)
+
+        loads = ", ".join(f"{instructor_id}: {load}" for instructor_id, load in sorted(plan["loads"].items()))
+        loads_label = QLabel(f"Resulting credit loads: {loads}")
+        loads_label.setWordWrap(True)
+        layout.addWidget(loads_label)
+
+        buttons = QHBoxLayout()
+        apply_button = QPushButton("Apply")
+        apply_button.setEnabled(bool(plan["assignments"]))
+        cancel_button = QPushButton("Cancel")
+        buttons.addWidget(apply_button)
+        buttons.addWidget(cancel_button)
+        layout.addLayout(buttons)
+
+        apply_button.clicked.connect(dialog.accept)
+        cancel_button.clicked.connect(dialog.reject)
+        return bool(dialog.exec_())
+
+    def export_catalog(self):
+        """Export the department's course catalog as shown"""
+        job = export_table(self, self.catalog_table, "Export Course Catalog", f"{self.department_id}_catalog.csv")
+        if job:
+            self.logger.log_data_access("courses", f"exported course catalog to {job.path}")
+            self.export_job = job
+
+    def export_teaching_load(self):
+        """Export the teaching load table as shown"""
+        job = export_table(self, self.teaching_load_table, "Export Teaching Load",
+                           f"{self.department_id}_teaching_load.csv")
+        if job:
+            self.logger.log_data_access("instructor_load", f"exported teaching load to {job.path}")
+            self.export_job = job
+
     def logout(self):
         """Handle staff logout"""
         self.logger.log_session(OperationType.LOGOUT)
@@ -1841,4 +2390,8 @@ class StaffDashboard(QMainWindow):
             "Staff member exited the system",
             include_role_prefix=False
         )
+        if self.export_job:
+            # Lets an unfinished export remove its partial file before exit
+            self.export_job.cancel()
+            self.export_job.wait(5)
         event.accept()
\ No newline at end of file
@@ -1,25 +1,35 @@
 import sys
 import os
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
-                               QTableWidgetItem, QTabWidget, QSizePolicy, QSpacerItem)
+                               QTableWidgetItem, QTabWidget, QSizePolicy, QSpacerItem, QMessageBox,
+                               QFileDialog)
 from PySide6.QtCore import Qt, Signal
 import sqlite3
 from datetime import datetime
 from ui.common.what_if_analysis import StudentWhatIfAnalysis
-from ui.common.system_logger import SystemLogger, UserRole, OperationType
+from ui.common.system_logger import SystemLogger, OperationType
+from ui.common.dashboard_prewarm import show_loading
+from ui.common.academic_service import fetch_student_record, calculate_gpa, compute_transcript
+from ui.common.transcript_pdf import render_transcript_pdf
 
 
 class StudentDashboard(QMainWindow):
     logout_signal = Signal()
 
-    def __init__(self, student_id):
+    def __init__(self, session, prewarm=None):
         super().__init__()
-        self.student_id = student_id
-        self.user_id = self.get_user_id()
+        # Identity was resolved at login
+        self.session = session
+        # Started at login; the student record arrives through it
+        self.prewarm = prewarm
+        self.student_id = session.role_id
+        self.user_id = session.user_id
         print(f"Initializing StudentDashboard with student_id: {self.student_id}, user_id: {self.user_id}")
 
         # Initialize the logger
-        self.logger = SystemLogger(self.user_id, UserRole.STUDENT)
+        self.logger = SystemLogger(session)
+        # Computed transcript, set once the record has loaded
+        self.transcript = None
 
         self.setWindowTitle("Student Dashboard")
         self.setGeometry(100, 100, 800, 600)
@@ -105,6 +115,9 @@ class StudentDashboard(QMainWindow):
         self.gpa_label.setStyleSheet("font-size: 14px; font-weight: bold;")
         header_layout.addWidget(self.gpa_label)
         header_layout.addStretch()
+        self.save_transcript_button = QPushButton("Save as PDF...")
+        self.save_transcript_button.clicked.connect(self.save_transcript_pdf)
+        header_layout.addWidget(self.save_transcript_button)
         gpa_layout.addLayout(header_layout)
 
         spacer = QSpacerItem(20, 20, QSizePolicy.Minimum, QSizePolicy.Fixed)
@@ -122,28 +135,13 @@ class StudentDashboard(QMainWindow):
         what_if_layout.addWidget(what_if_analysis)
         tab_widget.addTab(what_if_tab, "What-If Analysis")
 
-        self.load_student_data()
-
-    def get_user_id(self):
-        """Get the user_id from the users table based on the student_id"""
-        db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'academic_management.db')
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT u.id 
-                FROM users u 
-                JOIN students s ON u.username = s.student_id 
-                WHERE s.student_id = ?
-            """, (self.student_id,))
-            result = cursor.fetchone()
-            return str(result[0]) if result else None
-        except sqlite3.Error as e:
-            print(f"Database error while getting user_id: {e}")
-            return None
-        finally:
-            if conn:
-                conn.close()
+        if self.prewarm:
+            for table in (self.personal_info_table, self.courses_table, self.transcript_table):
+                show_loading(table)
+            self.gpa_label.setText("Current GPA: ...")
+            self.prewarm.on_ready("student_record", self.load_student_data)
+        else:
+            self.load_student_data()
 
     def log_operation(self, operation_type, details):
         if not self.user_id:
@@ -178,12 +176,13 @@ class StudentDashboard(QMainWindow):
         else:
             return 'Fall', current_date.year
 
-    def load_transcript_data(self):
+    def load_transcript_data(self, record=None):
+        """
+        Fill the transcript from a student record (see fetch_student_record()),
+        fetching it first when none is given.
+        """
+        conn = None
         try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                                '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
-
             # Log transcript view with the new logger
             self.logger.log_data_access(
                 "transcript",
@@ -191,74 +190,14 @@ class StudentDashboard(QMainWindow):
                 {"student_id": self.student_id}
             )
 
-            cursor.execute("""
-                SELECT DISTINCT semester, year_taken
-                FROM student_courses
-                WHERE student_id = ?
-                ORDER BY year_taken ASC, 
-                    CASE semester 
-                        WHEN 'S' THEN 1
-                        WHEN 'U' THEN 2
-                        WHEN 'F' THEN 3
-                    END
-            """, (self.student_id,))
-
-            semesters = cursor.fetchall()
-
-            semester_data = []
-            cumulative_points = 0
-            cumulative_credits = 0
-
-            for semester, year in semesters:
-                cursor.execute("""
-                    SELECT c.course_prefix, c.course_number, c.credits, sc.grade
-                    FROM student_courses sc
-                    JOIN courses c ON sc.course_prefix = c.course_prefix 
-                        AND sc.course_number = c.course_number
-                    WHERE sc.student_id = ? AND sc.semester = ? AND sc.year_taken = ?
-                    ORDER BY c.course_prefix, c.course_number
-                """, (self.student_id, semester, year))
-
-                courses = cursor.fetchall()
-
-                semester_points = 0
-                semester_credits = 0
-                semester_courses = []
-
-                for course in courses:
-                    prefix, number, credits, grade = course
-                    semester_courses.append({
-                        'prefix': prefix,
-                        'number': number,
-                        'credits': credits,
-                        'grade': grade
-                    })
-
-                    if grade in ['A', 'B', 'C', 'D', 'F']:
-                        grade_points = {'A': 4, 'B': 3, 'C': 2, 'D': 1, 'F': 0}[grade]
-                        points = grade_points * credits
-                        semester_points += points
-                        semester_credits += credits
-
-                if semester_credits > 0:
-                    semester_gpa = semester_points / semester_credits
-                    cumulative_points += semester_points
-                    cumulative_credits += semester_credits
-                    cumulative_gpa = cumulative_points / cumulative_credits
-                else:
-                    semester_gpa = 0.0
-                    cumulative_gpa = cumulative_points / cumulative_credits if cumulative_credits > 0 else 0.0
-
-                semester_data.append({
-                    'term': {'F': 'Fall', 'S': 'Spring', 'U': 'Summer'}[semester],
-                    'year': year,
-                    'courses': semester_courses,
-                    'semester_credits': semester_credits,
-                    'semester_gpa': semester_gpa,
-                    'cumulative_gpa': cumulative_gpa
-                })
-
-            semester_data.reverse()
+            if record is None:
+                conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                    '..', 'data', 'academic_management.db'))
+                record = fetch_student_record(conn, self.student_id)
+
+            self.transcript = compute_transcript(record)
+            # Newest term first on screen
+            semester_data = list(reversed(self.transcript['semesters']))
 
             all_rows = []
 
@@ -308,12 +247,39 @@ class StudentDashboard(QMainWindow):
             if conn:
                 conn.close()
 
-    def load_student_data(self):
+    def save_transcript_pdf(self):
+        """Save the transcript shown on the GPA tab as a PDF file"""
+        if self.transcript is None:
+            QMessageBox.warning(self, "Warning", "The transcript has not been loaded yet")
+            return
+
+        path, _ = QFileDialog.getSaveFileName(self, "Save Transcript", f"transcript_{self.student_id}.pdf",
+                                              "PDF Files (*.pdf)")
+        if not path:
+            return
+
         try:
-            conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
-                                              '..', 'data', 'academic_management.db'))
-            cursor = conn.cursor()
+            with open(path, 'wb') as pdf_file:
+                pdf_file.write(render_transcript_pdf(self.transcript))
+        except OSError as e:
+            print(f"Failed to save transcript: {e}")
+            QMessageBox.warning(self, "Save Failed", str(e))
+            return
+
+        self.logger.log_data_access(
+            "transcript",
+            f"saved as PDF to {path}",
+            {"student_id": self.student_id}
+        )
 
+    def load_student_data(self, record=None):
+        """
+        Fill personal information, current courses, GPA and the transcript
+        from a student record, fetching it first when none is given (e.g.
+        when the prewarm fetch failed).
+        """
+        conn = None
+        try:
             # Log the data access
             self.logger.log_data_access(
                 "student_info",
@@ -321,12 +287,12 @@ class StudentDashboard(QMainWindow):
                 {"student_id": self.student_id}
             )
 
-            cursor.execute("""
-                SELECT student_id, gender, major
-                FROM students
-                WHERE student_id = ?
-            """, (self.student_id,))
-            student_info = cursor.fetchone()
+            if record is None:
+                conn = sqlite3.connect(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                  '..', 'data', 'academic_management.db'))
+                record = fetch_student_record(conn, self.student_id)
+
+            student_info = record['info']
 
             if student_info:
                 self.personal_info_table.setColumnCount(3)
@@ -337,14 +303,9 @@ class StudentDashboard(QMainWindow):
 
             current_semester, current_year = self.get_current_semester()
 
-            cursor.execute("""
-                SELECT c.course_prefix, c.course_number, c.credits, sc.grade
-                FROM student_courses sc
-                JOIN courses c ON sc.course_prefix = c.course_prefix AND sc.course_number = c.course_number
-                WHERE sc.student_id = ? AND sc.semester = ? AND sc.year_taken = ?
-            """, (self.student_id, current_semester[0], current_year))
-
-            current_courses = cursor.fetchall()
+            current_courses = [(prefix, number, credits, grade)
+                               for semester, year, prefix, number, credits, grade in record['courses']
+                               if semester == current_semester[0] and year == current_year]
 
             if current_courses:
                 self.courses_table.show()
@@ -365,29 +326,10 @@ class StudentDashboard(QMainWindow):
                 self.courses_table.hide()
                 self.no_courses_label.show()
 
-            cursor.execute("""
-                SELECT c.credits, sc.grade
-                FROM student_courses sc
-                JOIN courses c ON sc.course_prefix = c.course_prefix AND sc.course_number = c.course_number
-                WHERE sc.student_id = ? AND sc.grade IS NOT NULL
-            """, (self.student_id,))
-
-            all_courses = cursor.fetchall()
-
-            total_points = 0
-            total_credits = 0
-            grade_points = {'A': 4, 'B': 3, 'C': 2, 'D': 1, 'F': 0}
-
-            for course in all_courses:
-                credits, grade = course
-                if grade in grade_points:
-                    total_points += grade_points[grade] * credits
-                    total_credits += credits
-
-            gpa = total_points / total_credits if total_credits > 0 else 0
+            gpa = calculate_gpa((credits, grade) for _, _, _, _, credits, grade in record['courses'])
             self.gpa_label.setText(f"Current GPA: {gpa:.2f}")
 
-            self.load_transcript_data()
+            self.load_transcript_data(record)
 
 
         except sqlite3.Error as e:
@@ -403,16 +345,7 @@ class StudentDashboard(QMainWindow):
     def calculate_gpa(self, courses):
         """Calculate GPA from course data"""
         try:
-            total_points = 0
-            total_credits = 0
-            grade_points = {'A': 4, 'B': 3, 'C': 2, 'D': 1, 'F': 0}
-
-            for credits, grade in courses:
-                if grade in grade_points:
-                    total_points += grade_points[grade] * credits
-                    total_credits += credits
-
-            gpa = total_points / total_credits if total_credits > 0 else 0
+            gpa = calculate_gpa(courses)
 
             # Log GPA calculation
             self.logger.log_operation(